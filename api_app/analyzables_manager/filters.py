@@ -10,6 +10,17 @@ class CharInFilter(filters.BaseInFilter, filters.CharFilter):
 
 class AnalyzableFilter(filters.FilterSet):
     name = CharInFilter(widget=QueryArrayWidget)
+    search = filters.CharFilter(method="filter_search")
+    md5 = filters.CharFilter(method="filter_md5")
+    mimetype = filters.CharFilter(field_name="mimetype", lookup_expr="icontains")
+
+    @staticmethod
+    def filter_search(queryset, value, search, *args, **kwargs):
+        return queryset & Analyzable.objects.search(search)
+
+    @staticmethod
+    def filter_md5(queryset, value, md5, *args, **kwargs):
+        return queryset & Analyzable.objects.filter_contains("md5", md5)
 
     class Meta:
         model = Analyzable
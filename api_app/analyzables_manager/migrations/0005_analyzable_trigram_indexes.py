@@ -0,0 +1,47 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # the indexes are built without locking the table for writes
+    atomic = False
+
+    dependencies = [
+        ("analyzables_manager", "0004_analyzable_name_field_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="analyzable",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="analyzables_name_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="analyzable",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("md5"),
+                    name="gin_trgm_ops",
+                ),
+                name="analyzables_md5_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="analyzable",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("mimetype"),
+                    name="gin_trgm_ops",
+                ),
+                name="analyzables_mimetype_trgm_idx",
+            ),
+        ),
+    ]
@@ -1,9 +1,11 @@
 import logging
 from typing import Type, Union
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils.timezone import now
 
 from api_app.analyzables_manager.queryset import AnalyzableQuerySet
@@ -11,7 +13,12 @@ from api_app.choices import Classification
 from api_app.data_model_manager.models import BaseDataModel
 from api_app.data_model_manager.queryset import BaseDataModelQuerySet
 from api_app.defaults import file_directory_path
-from api_app.helpers import calculate_md5, calculate_sha1, calculate_sha256
+from api_app.helpers import (
+    calculate_hashes,
+    calculate_md5,
+    calculate_sha1,
+    calculate_sha256,
+)
 from certego_saas.models import User
 
 logger = logging.getLogger(__name__)
@@ -36,6 +43,20 @@ class Analyzable(models.Model):
             models.Index(fields=["name"]),
             models.Index(fields=["classification"]),
             models.Index(fields=["mimetype"]),
+            # icontains is executed as UPPER(field) LIKE UPPER('%value%'):
+            # trigram indexes on the same expression avoid the sequential scans
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="analyzables_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("md5"), name="gin_trgm_ops"),
+                name="analyzables_md5_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("mimetype"), name="gin_trgm_ops"),
+                name="analyzables_mimetype_trgm_idx",
+            ),
         ]
 
     def __str__(self):
@@ -106,16 +127,19 @@ class Analyzable(models.Model):
 
             if not self.file:
                 raise ValidationError("File must be set for samples")
-            content = self.read()
             if not self.mimetype:
-                self.mimetype = MimeTypes.calculate(content, self.name)
+                self.mimetype = MimeTypes.calculate_from_file(self.file, self.name)
+            if not (self.md5 and self.sha1 and self.sha256):
+                # the file is hashed in chunks, without loading it in memory
+                for name, value in calculate_hashes(self.file.chunks()).items():
+                    if not getattr(self, name):
+                        setattr(self, name, value)
         else:
             if self.mimetype or self.file:
                 raise ValidationError(
                     "Mimetype and file must not be set for observables"
                 )
-            content = self.name
-        self._set_hashes(content)
+            self._set_hashes(self.name)
 
     def read(self) -> bytes:
         if self.classification == Classification.FILE.value:
@@ -1,11 +1,21 @@
 import logging
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
+from django.db import transaction
 from django.db.models import QuerySet
+from django.db.models.signals import post_save
+
+if TYPE_CHECKING:
+    from api_app.analyzables_manager.models import Analyzable
 
 logger = logging.getLogger(__name__)
 
 
 class AnalyzableQuerySet(QuerySet):
+    # hash fields with a unique index, by length of the hex digest
+    HASH_FIELDS = {32: "md5", 40: "sha1", 64: "sha256"}
+    HEX_REGEX = re.compile(r"^[0-9a-fA-F]+$")
 
     def visible_for_user(self, user):
 
@@ -36,3 +46,140 @@ class AnalyzableQuerySet(QuerySet):
             raise e
         obj.save(force_insert=True, using=self.db)
         return obj
+
+    def get_or_create_many(
+        self, objs: Iterable["Analyzable"]
+    ) -> Dict[str, "Analyzable"]:
+        """
+        Returns the analyzables with the md5 of the given unsaved objects,
+        creating the missing ones with a single insert.
+        The post_save signal is sent for the created analyzables,
+        like with ``create()``.
+
+        Args:
+            objs (Iterable[Analyzable]): Unsaved analyzables, with ``md5`` set.
+
+        Returns:
+            Dict[str, Analyzable]: The analyzables by md5.
+        """
+        objs = {obj.md5: obj for obj in objs}
+        analyzables = self.in_bulk(list(objs), field_name="md5")
+        missing = [obj for md5, obj in objs.items() if md5 not in analyzables]
+        if missing:
+            for obj in missing:
+                obj.full_clean(validate_unique=False)
+            # the analyzables created in the meantime by another request are kept
+            self.bulk_create(missing, ignore_conflicts=True)
+            created = self.in_bulk([obj.md5 for obj in missing], field_name="md5")
+            for obj in created.values():
+                post_save.send(
+                    sender=self.model,
+                    instance=obj,
+                    created=True,
+                    update_fields=None,
+                    raw=False,
+                    using=self.db,
+                )
+            analyzables.update(created)
+        return analyzables
+
+    def delete_unused(self) -> int:
+        """
+        Deletes the files of the analyzables without jobs,
+        and the analyzables that are not referenced
+        by jobs, user events or comments anymore.
+        The files are deleted from the storage only after the commit.
+
+        Returns:
+            int: The number of deleted analyzables.
+        """
+        with transaction.atomic():
+            # the analyzables referenced by a job that is being created
+            # are locked by the check of its foreign key, so they are skipped,
+            # while the locked ones cannot be referenced until the deletion ends
+            pks = list(
+                self.filter(jobs__isnull=True)
+                .select_for_update(skip_locked=True, of=("self",))
+                .values_list("pk", flat=True)
+            )
+            # the jobs created before the lock are seen by the next queries
+            without_jobs = self.model.objects.filter(pk__in=pks, jobs__isnull=True)
+            with_file = without_jobs.filter(file__isnull=False).exclude(file="")
+            files = [analyzable.file for analyzable in with_file.only("pk", "file")]
+            _, deleted = without_jobs.filter(
+                user_events__isnull=True, comments__isnull=True
+            ).delete()
+            # the ones that are still referenced are kept without their file
+            with_file.update(file=None)
+        if files:
+            logger.info(f"Deleting {len(files)} files")
+            transaction.on_commit(
+                lambda: [file.storage.delete(file.name) for file in files]
+            )
+        return deleted.get(self.model._meta.label, 0)
+
+    @classmethod
+    def get_hash_field(cls, value: str) -> Optional[str]:
+        """
+        Returns the hash field matching a full hex digest, if any.
+
+        Args:
+            value (str): The searched value.
+
+        Returns:
+            Optional[str]: ``md5``, ``sha1``, ``sha256`` or None.
+        """
+        value = value.strip()
+        if len(value) in cls.HASH_FIELDS and cls.HEX_REGEX.match(value):
+            return cls.HASH_FIELDS[len(value)]
+        return None
+
+    def filter_hash(self, value: str) -> "AnalyzableQuerySet":
+        """
+        Filters the analyzables with a full md5, sha1 or sha256 digest,
+        with an exact lookup on the unique index of the hash.
+
+        Args:
+            value (str): The hex digest.
+
+        Returns:
+            AnalyzableQuerySet: The filtered queryset,
+            empty if the value is not a full digest.
+        """
+        field = self.get_hash_field(value)
+        if not field:
+            return self.none()
+        return self.filter(**{field: value.strip().lower()})
+
+    def filter_contains(self, field: str, value: str) -> "AnalyzableQuerySet":
+        """
+        Filters the analyzables with a field containing the value, ignoring case.
+        The case-insensitive search is served by the trigram indexes,
+        while a full digest searched on ``md5`` goes to the hash unique indexes.
+
+        Args:
+            field (str): One of ``name``, ``md5`` or ``mimetype``.
+            value (str): The searched value.
+
+        Returns:
+            AnalyzableQuerySet: The filtered queryset.
+        """
+        if field == "md5" and self.get_hash_field(value):
+            return self.filter_hash(value)
+        return self.filter(**{f"{field}__icontains": value})
+
+    def search(self, value: str) -> "AnalyzableQuerySet":
+        """
+        Filters the analyzables with a name containing the value
+        or, if the value is a full digest, with that hash.
+
+        Args:
+            value (str): The searched value.
+
+        Returns:
+            AnalyzableQuerySet: The filtered queryset.
+        """
+        queryset = self.filter_contains("name", value)
+        if self.get_hash_field(value):
+            queryset |= self.filter_hash(value)
+        return queryset
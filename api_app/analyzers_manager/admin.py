@@ -17,6 +17,13 @@ class AnalyzerConfigAdminView(PythonConfigAdminView):
         "type",
         "docker_based",
         "maximum_tlp",
+        "result_cache_ttl",
+        "get_result_cache_stats",
     )
     list_filter = ["type", "maximum_tlp"] + PythonConfigAdminView.list_filter
     exclude = ["update_task"]
+
+    @admin.display(description="Result cache hits/misses")
+    def get_result_cache_stats(self, instance: AnalyzerConfig):
+        stats = instance.result_cache_stats
+        return f"{stats['hits']}/{stats['misses']}"
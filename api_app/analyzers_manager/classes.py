@@ -1,19 +1,22 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
 
+import hashlib
 import json
 import logging
 import time
 from abc import ABCMeta
 from pathlib import PosixPath
 from typing import Dict, Tuple
+from urllib.parse import urlparse
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 
 from certego_saas.apps.user.models import User
 
-from ..choices import Classification, PythonModuleBasePaths
+from ..choices import TLP, Classification, PythonModuleBasePaths
 from ..classes import Plugin
 from ..data_model_manager.enums import DataModelEvaluations
 from ..models import PythonConfig
@@ -60,11 +63,18 @@ class BaseAnalyzerMixin(Plugin, metaclass=ABCMeta):
     def create_data_model(self):
         self.report: AnalyzerReport
         if self._do_create_data_model():
-            data_model = self.report.create_data_model()
-            if data_model:
-                self._update_data_model(data_model)
-                data_model.save()
-            return data_model
+            content = None
+            if (
+                self.__class__._create_data_model_mtm
+                != BaseAnalyzerMixin._create_data_model_mtm
+                or self.__class__._update_data_model
+                != BaseAnalyzerMixin._update_data_model
+            ):
+                # the data model is customized by the analyzer from the whole report
+                content = {"analyzer": self._config.name, "report": self.report.report}
+            return self.report.create_data_model(
+                content=content, update=self._update_data_model
+            )
         return None
 
     @classmethod
@@ -188,6 +198,46 @@ class ObservableAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
     def python_base_path(cls):
         return PythonModuleBasePaths.ObservableAnalyzer.value
 
+    @property
+    def _result_cache_key(self) -> str:
+        # secrets are not in the parameters of the report
+        parameters = json.dumps(self.report.parameters, sort_keys=True, default=str)
+        digest = hashlib.sha256(
+            f"{self.observable_classification}|{self.observable_name}|{parameters}".encode()
+        ).hexdigest()
+        return f"analyzer_result_{self._config.name}_{digest}"
+
+    def get_cached_result(self):
+        self._config: AnalyzerConfig
+        if not self._config.result_cache_ttl:
+            return None
+        # the cache never changes the outcome of the analysis
+        try:
+            result = cache.get(self._result_cache_key)
+            self._config.count_result_cache(hit=result is not None)
+        except Exception as e:
+            logger.warning(
+                f"Unable to read the cached result <- {self.__repr__()}: {e}"
+            )
+            return None
+        if result is not None:
+            logger.info(f"Using the cached result <- {self.__repr__()}")
+        return result
+
+    def cache_result(self, content):
+        self._config: AnalyzerConfig
+        # the observables of the jobs that can not be shared are not disclosed
+        if (
+            not self._config.result_cache_ttl
+            or content is None
+            or self._job.tlp not in [TLP.CLEAR.value, TLP.GREEN.value]
+        ):
+            return
+        try:
+            cache.set(self._result_cache_key, content, self._config.result_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Unable to cache the result <- {self.__repr__()}: {e}")
+
     def before_run(self):
         super().before_run()
         logger.info(
@@ -227,8 +277,8 @@ class FileAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         self.md5 = self._job.analyzable.md5
         self.filename = self._job.analyzable.name
         # this is updated in the filepath property, like a cache decorator.
-        # if the filepath is requested, it means that the analyzer downloads...
-        # ...the file from AWS because it requires a path and it needs to be deleted
+        # if the filepath is requested, it means that the analyzer retrieves...
+        # ...the file from the sample cache, and it needs to be released
         self.__filepath = None
         self.file_mimetype = self._job.analyzable.mimetype
 
@@ -238,7 +288,11 @@ class FileAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         return PythonModuleBasePaths[FileAnalyzer.__name__].value
 
     def read_file_bytes(self) -> bytes:
-        return self._job.analyzable.read()
+        if settings.LOCAL_STORAGE:
+            return self._job.analyzable.read()
+        # served by the local sample cache instead of downloading it again
+        with open(self.filepath, "rb") as f:
+            return f.read()
 
     @property
     def filepath(self) -> str:
@@ -249,7 +303,7 @@ class FileAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         """
         if not self.__filepath:
             self.__filepath = self._job.analyzable.file.storage.retrieve(
-                file=self._job.analyzable.file, analyzer=self.analyzer_name
+                file=self._job.analyzable.file, sha256=self._job.analyzable.sha256
             )
         return self.__filepath
 
@@ -262,16 +316,10 @@ class FileAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
 
     def after_run(self):
         super().after_run()
-        # We delete the file only if we have single copy for analyzer
-        # and the file has been saved locally.
-        # Otherwise we would remove the single file that we have on the server
-        if not settings.LOCAL_STORAGE and self.filepath is not None:
-            import os
-
-            try:
-                os.remove(self.filepath)
-            except OSError:
-                logger.warning(f"Filepath {self.filepath} does not exists")
+        # The sample is shared with the other analyzers of the node:
+        # we only release it, the sample cache evicts it when needed
+        if not settings.LOCAL_STORAGE and self.__filepath is not None:
+            self._job.analyzable.file.storage.release(self._job.analyzable.sha256)
 
         logger.info(
             f"FINISHED analyzer: {self.__repr__()} -> "
@@ -291,9 +339,11 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         The name of the analyzer service as defined in compose file
         and log directory
     :param max_tries: int
-        maximum no. of tries when HTTP polling for result.
+        the result is awaited for at most max_tries * poll_distance seconds.
     :param poll_distance: int
-        interval between HTTP polling.
+        maximum seconds every HTTP poll waits for the result.
+        The Flask-Shell2HTTP integrations answer as soon as the result is ready;
+        the others are polled with an interval growing up to poll_distance.
     """
 
     name: str
@@ -301,6 +351,26 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
     max_tries: int
     poll_distance: int
     key_not_found_max_retries: int = 10
+    # first interval between the polls of the integrations without long polling
+    min_poll_distance: int = 1
+    # maximum seconds the integrations keep a poll open, waiting for the result
+    long_poll_timeout: int = 25
+    # seconds waited for a connection to the integration
+    connect_timeout: int = 10
+
+    # one pool of keep-alive connections for every integration
+    _sessions: Dict[str, requests.Session] = {}
+
+    @property
+    def session(self) -> requests.Session:
+        netloc = urlparse(self.url).netloc
+        if netloc not in self._sessions:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=10)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[netloc] = session
+        return self._sessions[netloc]
 
     @staticmethod
     def __raise_in_case_bad_request(name, resp, params_to_check=None) -> bool:
@@ -335,60 +405,65 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
 
         return True
 
-    @staticmethod
-    def __query_for_result(url: str, key: str) -> Tuple[int, dict]:
+    def __query_for_result(self, key: str, wait: float) -> Tuple[int, dict]:
+        # the integration keeps the request open until the result is ready,
+        # for at most ``wait`` seconds (long polling)
         headers = {"Accept": "application/json"}
-        resp = requests.get(f"{url}?key={key}", headers=headers)
+        resp = self.session.get(
+            self.url,
+            params={"key": key, "wait_timeout": wait},
+            headers=headers,
+            timeout=(self.connect_timeout, wait + self.connect_timeout),
+        )
         return resp.status_code, resp.json()
 
-    def __polling(self, req_key: str, chance: int, re_poll_try: int = 0):
-        try:
-            status_code, json_data = self.__query_for_result(self.url, req_key)
-        except (requests.RequestException, json.JSONDecodeError) as e:
-            raise AnalyzerRunException(e)
-        if status_code == 404:
-            # This happens when they key does not exist.
-            # This is possible in case IntelOwl is deployed as a Swarm.
-            # The previous POST request that created the analysis ...
-            # ...could have been sent to a different container in another machine.
-            # so we need to try again and find the server with the key
+    def __poll_for_result(self, req_key: str) -> dict:
+        deadline = time.monotonic() + self.max_tries * self.poll_distance
+        poll_distance = self.min_poll_distance
+        chance = 0
+        not_found_tries = 0
+        while time.monotonic() < deadline:
+            wait = min(
+                self.poll_distance, self.long_poll_timeout, deadline - time.monotonic()
+            )
             logger.info(
-                "Polling again because received a 404."
-                f" Try #{chance + 1}. Re-Poll try {re_poll_try}. Starting the query..."
+                f"Result Polling. Try #{chance + 1}. Starting the query..."
                 f"<-- {self.__repr__()}"
             )
-            if self.key_not_found_max_retries == re_poll_try:
-                raise AnalyzerRunException(
-                    f"not found key {req_key} in any server after maximum retries"
-                )
-            return self.__polling(req_key, chance, re_poll_try=re_poll_try + 1)
-        else:
-            status = json_data.get("status", None)
-            if status and status == self._job.STATUSES.RUNNING.value:
+            start = time.monotonic()
+            try:
+                status_code, json_data = self.__query_for_result(req_key, wait)
+            except (requests.RequestException, json.JSONDecodeError) as e:
+                raise AnalyzerRunException(e)
+            chance += 1
+            if status_code == 404:
+                # This happens when they key does not exist.
+                # This is possible in case IntelOwl is deployed as a Swarm.
+                # The previous POST request that created the analysis ...
+                # ...could have been sent to a different container in another machine.
+                # so we need to try again and find the server with the key
                 logger.info(
-                    f"Poll number #{chance + 1}, "
-                    f"status: 'running' <-- {self.__repr__()}"
+                    "Polling again because received a 404."
+                    f" Re-Poll try {not_found_tries}. <-- {self.__repr__()}"
                 )
-            else:
-                return True, json_data
-        return False, json_data
-
-    def __poll_for_result(self, req_key: str) -> dict:
-        got_result = False
-        json_data = {}
-        for chance in range(self.max_tries):
-            time.sleep(self.poll_distance)
+                if self.key_not_found_max_retries == not_found_tries:
+                    raise AnalyzerRunException(
+                        f"not found key {req_key} in any server after maximum retries"
+                    )
+                not_found_tries += 1
+                continue
+            status = json_data.get("status", None)
+            if not status or status != self._job.STATUSES.RUNNING.value:
+                return json_data
             logger.info(
-                f"Result Polling. Try #{chance + 1}. Starting the query..."
-                f"<-- {self.__repr__()}"
+                f"Poll number #{chance}, status: 'running' <-- {self.__repr__()}"
             )
-            got_result, json_data = self.__polling(req_key, chance)
-            if got_result:
-                break
-
-        if not got_result:
-            raise AnalyzerRunException("max polls tried without getting any result.")
-        return json_data
+            if time.monotonic() - start < wait:
+                # the integration does not support long polling:
+                # the interval between the polls grows up to poll_distance
+                time.sleep(max(0, min(poll_distance, deadline - time.monotonic())))
+                poll_distance = min(poll_distance * 1.5, self.poll_distance)
+        raise AnalyzerRunException("max polls tried without getting any result.")
 
     def _raise_container_not_running(self) -> None:
         raise AnalyzerConfigurationException(
@@ -429,9 +504,9 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         try:
             if req_files:
                 form_data = {"request_json": json.dumps(req_data)}
-                resp1 = requests.post(self.url, files=req_files, data=form_data)
+                resp1 = self.session.post(self.url, files=req_files, data=form_data)
             else:
-                resp1 = requests.post(self.url, json=req_data)
+                resp1 = self.session.post(self.url, json=req_data)
         except requests.exceptions.ConnectionError:
             self._raise_container_not_running()
 
@@ -477,7 +552,7 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
 
         # step #1: request new analysis
         try:
-            resp = requests.get(url=self.url)
+            resp = self.session.get(url=self.url)
         except requests.exceptions.ConnectionError:
             self._raise_container_not_running()
 
@@ -491,7 +566,7 @@ class DockerBasedAnalyzer(BaseAnalyzerMixin, metaclass=ABCMeta):
         basic health check: if instance is up or not (timeout - 10s)
         """
         try:
-            requests.head(self.url, timeout=10)
+            self.session.head(self.url, timeout=10)
         except requests.exceptions.RequestException:
             health_status = False
         else:
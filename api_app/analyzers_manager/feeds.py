@@ -0,0 +1,326 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+"""
+In-process store for the feed files that observable analyzers download
+into MEDIA_ROOT with their ``update()`` classmethod.
+
+Every feed is parsed once per worker process into a hashed index
+and reused until the file on disk changes (mtime or size),
+so ``run()`` costs a single ``os.stat`` plus an O(1) lookup
+instead of re-reading the whole file.
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import struct
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CIDRIndex:
+    """
+    Index of IPv4 and IPv6 networks.
+
+    Networks are grouped by ip version and prefix length into hash tables
+    keyed by the network prefix, so a lookup costs at most one hash
+    probe per prefix length present in the index (33 for IPv4, 129 for IPv6)
+    whatever the number of networks. Overlapping networks are supported.
+
+    Every network is stored with the positions of the feed entries
+    it comes from, so the caller can retrieve the matching entries.
+    """
+
+    MAGIC = b"IOCIDR1\n"
+    _BITS = {4: 32, 6: 128}
+    _TABLE_HEADER = struct.Struct(">BBI")
+    _COUNT = struct.Struct(">I")
+
+    def __init__(self):
+        # (version, prefix length) -> {network prefix -> [positions]}
+        self._tables: Dict[Tuple[int, int], Dict[int, List[int]]] = {}
+        # version -> prefix lengths in the index, most specific first
+        self._prefixes: Dict[int, List[int]] = {4: [], 6: []}
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self._tables.values())
+
+    def __contains__(self, ip) -> bool:
+        return bool(self.lookup(ip))
+
+    def _table(self, version: int, prefixlen: int) -> Dict[int, List[int]]:
+        key = (version, prefixlen)
+        if key not in self._tables:
+            self._tables[key] = {}
+            self._prefixes[version] = sorted(
+                self._prefixes[version] + [prefixlen], reverse=True
+            )
+        return self._tables[key]
+
+    def add(
+        self,
+        network: Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network],
+        position: int,
+    ) -> None:
+        if isinstance(network, str):
+            network = ipaddress.ip_network(network, strict=False)
+        bits = self._BITS[network.version]
+        prefix = int(network.network_address) >> (bits - network.prefixlen)
+        self._table(network.version, network.prefixlen).setdefault(prefix, []).append(
+            position
+        )
+
+    @classmethod
+    def build(cls, networks: Iterable[Tuple[int, str]]) -> "CIDRIndex":
+        """
+        Builds the index from (position, network) pairs.
+        Entries that are not valid networks are skipped.
+        """
+        index = cls()
+        for position, network in networks:
+            try:
+                index.add(network, position)
+            except ValueError:
+                logger.warning(f"Skipping {network}: not a valid network")
+        return index
+
+    def lookup(
+        self, ip: Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+    ) -> List[int]:
+        """
+        Returns the sorted positions of every network containing ``ip``.
+
+        Raises:
+            ValueError: if ``ip`` is not a valid ip address
+        """
+        if isinstance(ip, str):
+            ip = ipaddress.ip_address(ip)
+        value = int(ip)
+        bits = self._BITS[ip.version]
+        positions = []
+        for prefixlen in self._prefixes[ip.version]:
+            positions.extend(
+                self._tables[(ip.version, prefixlen)].get(
+                    value >> (bits - prefixlen), []
+                )
+            )
+        return sorted(positions)
+
+    def lookup_many(self, ips: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        Batched version of ``lookup``.
+        """
+        return {ip: self.lookup(ip) for ip in ips}
+
+    def dump(self, path: str) -> None:
+        """
+        Persists the index in a compact binary form.
+        The file is replaced atomically so concurrent readers
+        never see a partially written index.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self._COUNT.pack(len(self._tables)))
+            for (version, prefixlen), table in self._tables.items():
+                size = (prefixlen + 7) // 8
+                f.write(self._TABLE_HEADER.pack(version, prefixlen, len(table)))
+                for prefix, positions in table.items():
+                    f.write(prefix.to_bytes(size, "big"))
+                    f.write(self._COUNT.pack(len(positions)))
+                    f.write(struct.pack(f">{len(positions)}I", *positions))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CIDRIndex":
+        """
+        Loads an index persisted with ``dump``.
+
+        Raises:
+            ValueError: if the file is not a valid index
+        """
+        with open(path, "rb") as f:
+            data = memoryview(f.read())
+        if bytes(data[: len(cls.MAGIC)]) != cls.MAGIC:
+            raise ValueError(f"{path} is not a valid cidr index")
+        offset = len(cls.MAGIC)
+        index = cls()
+        try:
+            (tables,) = cls._COUNT.unpack_from(data, offset)
+            offset += cls._COUNT.size
+            for _ in range(tables):
+                version, prefixlen, entries = cls._TABLE_HEADER.unpack_from(
+                    data, offset
+                )
+                offset += cls._TABLE_HEADER.size
+                size = (prefixlen + 7) // 8
+                table = index._table(version, prefixlen)
+                for _ in range(entries):
+                    end = offset + size
+                    prefix = int.from_bytes(data[offset:end], "big")
+                    offset = end
+                    (count,) = cls._COUNT.unpack_from(data, offset)
+                    offset += cls._COUNT.size
+                    table[prefix] = list(struct.unpack_from(f">{count}I", data, offset))
+                    offset += count * cls._COUNT.size
+        except (struct.error, KeyError) as e:
+            raise ValueError(f"{path} is not a valid cidr index: {e}")
+        return index
+
+
+def netset_networks(path: str) -> Iterable[Tuple[int, str]]:
+    """
+    Yields (line number, network) for every ip or network of a netset/ipset file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield lineno, line
+
+
+class FeedStore:
+    # (path, index kind) -> (file signature, parsed index)
+    _indexes: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def get(cls, path: str, kind: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Returns the index built by ``loader`` for ``path``,
+        parsing the file again only if it changed on disk.
+
+        Args:
+            path (str): location of the feed file
+            kind (str): name of the index, used to keep
+                different indexes of the same file apart
+            loader (Callable): function that parses the file into the index
+        """
+        key = (path, kind)
+        signature = cls._signature(path)
+        with cls._lock:
+            cached = cls._indexes.get(key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            return cached[1]
+        logger.info(f"Loading feed {path} into {kind} index")
+        index = loader(path)
+        # if we are not able to stat the file we can't know when it changes
+        if signature is not None:
+            with cls._lock:
+                cls._indexes[key] = (signature, index)
+        return index
+
+    @classmethod
+    def invalidate(cls, path: str) -> None:
+        """
+        Drops every index built for ``path``.
+        To be called after the feed has been downloaded again.
+        """
+        with cls._lock:
+            for key in [key for key in cls._indexes if key[0] == path]:
+                del cls._indexes[key]
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._indexes.clear()
+
+    @classmethod
+    def lines(cls, path: str) -> FrozenSet[str]:
+        """
+        Returns the set of lines of a plain text feed.
+        """
+
+        def loader(location: str) -> FrozenSet[str]:
+            with open(location, "r", encoding="utf-8") as f:
+                return frozenset(f.read().split("\n"))
+
+        return cls.get(path, "lines", loader)
+
+    @classmethod
+    def json_feed(cls, path: str) -> Any:
+        """
+        Returns the parsed content of a json feed.
+        """
+
+        def loader(location: str) -> Any:
+            with open(location, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        return cls.get(path, "json", loader)
+
+    @classmethod
+    def cidr_index(
+        cls,
+        path: str,
+        parser: Callable[[str], Iterable[Tuple[int, str]]] = netset_networks,
+    ) -> CIDRIndex:
+        """
+        Returns the CIDRIndex of the networks that ``parser`` extracts from ``path``.
+
+        The index is persisted next to the feed, in ``<path>.idx``,
+        and it is built again only when the feed is newer than it,
+        so that every worker process can load it without parsing the feed.
+        """
+
+        def loader(location: str) -> CIDRIndex:
+            index_location = f"{location}.idx"
+            if (
+                os.path.exists(index_location)
+                and os.stat(index_location).st_mtime_ns >= os.stat(location).st_mtime_ns
+            ):
+                try:
+                    return CIDRIndex.load(index_location)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Rebuilding cidr index {index_location}: {e}")
+            index = CIDRIndex.build(parser(location))
+            try:
+                index.dump(index_location)
+            except OSError as e:
+                logger.warning(f"Unable to persist cidr index {index_location}: {e}")
+            return index
+
+        return cls.get(path, "cidr", loader)
+
+    @classmethod
+    def json_index(cls, path: str, field: str) -> Dict[Any, List[Dict]]:
+        """
+        Returns the items of a json list feed grouped by the value of ``field``,
+        keeping the order in which they appear in the feed.
+
+        Raises:
+            KeyError: if an item does not contain ``field``
+            json.JSONDecodeError: if the feed is not valid json
+        """
+
+        def loader(location: str) -> Dict[Any, List[Dict]]:
+            with open(location, "r", encoding="utf-8") as f:
+                db = json.load(f)
+            index = {}
+            for item in db:
+                index.setdefault(item[field], []).append(item)
+            return index
+
+        return cls.get(path, f"json:{field}", loader)
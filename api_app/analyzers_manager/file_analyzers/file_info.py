@@ -13,7 +13,6 @@ from django.utils.functional import cached_property
 from exiftool import ExifTool
 
 from api_app.analyzers_manager.classes import FileAnalyzer
-from api_app.helpers import calculate_md5, calculate_sha1, calculate_sha256
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +35,12 @@ class FileInfo(FileAnalyzer):
         results["magic"] = magic.from_file(self.filepath)
         results["mimetype"] = magic.from_file(self.filepath, mime=True)
 
-        binary = self.read_file_bytes()
-        results["md5"] = calculate_md5(binary)
-        results["sha1"] = calculate_sha1(binary)
-        results["sha256"] = calculate_sha256(binary)
+        # the digests are calculated when the sample is uploaded
+        results["md5"] = self.md5
+        results["sha1"] = self._job.analyzable.sha1
+        results["sha256"] = self._job.analyzable.sha256
         results["ssdeep"] = pydeep.hash_file(self.filepath).decode()
-        results["tlsh"] = tlsh.hash(binary)
+        results["tlsh"] = tlsh.hash(self.read_file_bytes())
 
         if self.exiftool_path:
             with ExifTool(self.exiftool_path) as et:
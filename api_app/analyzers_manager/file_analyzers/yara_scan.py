@@ -1,13 +1,18 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
 import dataclasses
+import hashlib
 import io
+import json
 import logging
 import math
 import os
+import re
+import threading
 import zipfile
+from collections import OrderedDict
 from pathlib import PosixPath
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import git
@@ -38,7 +43,68 @@ class YaraMatchMock:
         return self.match
 
 
+class YaraRulesCache:
+    """
+    Compiled rules loaded by this worker, shared by the jobs it executes.
+
+    The rules are identified by their compiled file and by the digest
+    of their sources, so that they are loaded again only after a change.
+    The least recently used rules are evicted when the size
+    of their compiled files exceeds the budget.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._rules: "OrderedDict[Tuple[str, str], Tuple[yara.Rules, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self._rules.values())
+
+    def get(
+        self, compiled_path: PosixPath, digest: str, load: Callable[[], yara.Rules]
+    ) -> yara.Rules:
+        """
+        Returns the rules of the compiled file, loading them if necessary.
+
+        Args:
+            compiled_path (PosixPath): The compiled file.
+            digest (str): The digest of the sources of the compiled file.
+            load (Callable[[], yara.Rules]): Returns the rules when they are missing.
+
+        Returns:
+            yara.Rules: The compiled rules.
+        """
+        key = (str(compiled_path), digest)
+        with self._lock:
+            if key in self._rules:
+                self._rules.move_to_end(key)
+                return self._rules[key][0]
+        rules = load()
+        with self._lock:
+            # the previous versions of the same file won't be requested anymore
+            for previous in [k for k in self._rules if k[0] == key[0]]:
+                del self._rules[previous]
+            self._rules[key] = (rules, compiled_path.stat().st_size)
+            while self.size > self.max_size and len(self._rules) > 1:
+                evicted, _ = self._rules.popitem(last=False)
+                logger.info(f"Evicting yara rules {evicted[0]} from memory")
+        return rules
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rules.clear()
+
+
+rules_cache = YaraRulesCache(settings.YARA_RULES_CACHE_MAX_SIZE)
+
+
 class YaraRepo:
+    INCLUDE_REGEX = re.compile(rb'^\s*include\s+"([^"]+)"', re.MULTILINE)
+
     def __init__(
         self,
         url: str,
@@ -168,6 +234,53 @@ class YaraRepo:
     def compiled_file_name(self):
         return "intel_owl_compiled.yas"
 
+    @property
+    def manifest_file_name(self):
+        return "intel_owl_compiled.json"
+
+    def _read_manifest(self, directory: PosixPath) -> Dict:
+        # content hash and validity of the rule files of the last compilation
+        try:
+            with open(directory / self.manifest_file_name, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"files": {}}
+
+    def _write_manifest(self, directory: PosixPath, manifest: Dict) -> None:
+        with open(directory / self.manifest_file_name, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def _hash_rule(cls, rule: PosixPath, hashes: Dict[PosixPath, str]) -> str:
+        """
+        Returns the sha256 of a rule file together with the files it includes,
+        recursively, so that the rule is validated again
+        when an included file changes or a missing one is created.
+
+        Args:
+            rule (PosixPath): The rule file.
+            hashes (Dict[PosixPath, str]): The hashes already computed.
+
+        Returns:
+            str: The hex digest, empty if the file does not exist.
+        """
+        if rule in hashes:
+            return hashes[rule]
+        # against include cycles
+        hashes[rule] = ""
+        try:
+            with open(rule, "rb") as f:
+                content = f.read()
+        except OSError:
+            return ""
+        sha256 = hashlib.sha256(content)
+        for include in cls.INCLUDE_REGEX.findall(content):
+            # includes are relative to the including file
+            path = (rule.parent / include.decode(errors="replace")).resolve()
+            sha256.update(f"{path}:{cls._hash_rule(path, hashes)}".encode())
+        hashes[rule] = sha256.hexdigest()
+        return hashes[rule]
+
     @cached_property
     def first_level_directories(self) -> List[PosixPath]:
         paths = []
@@ -197,8 +310,15 @@ class YaraRepo:
             if not self.directory.exists():
                 self.update()
             for compiled_path in self.compiled_paths:
-                if compiled_path.exists():
-                    self._rules.append(yara.load(str(compiled_path)))
+                digest = self._read_manifest(compiled_path.parent).get("digest")
+                if compiled_path.exists() and digest:
+                    self._rules.append(
+                        rules_cache.get(
+                            compiled_path,
+                            digest,
+                            lambda path=compiled_path: yara.load(str(path)),
+                        )
+                    )
                 else:
                     self._rules = self.compile()
                     break
@@ -217,6 +337,14 @@ class YaraRepo:
         return None
 
     def compile(self) -> List[yara.Rules]:
+        """
+        Compiles the rules of every directory of the repository.
+        Only the rule files changed since the last compilation are validated again,
+        and a directory whose valid rules did not change is not compiled again.
+
+        Returns:
+            List[yara.Rules]: The compiled rules of every directory.
+        """
         logger.info(f"Starting compile for {self}")
         compiled_rules = []
 
@@ -227,26 +355,58 @@ class YaraRepo:
             else:
                 # not recursive
                 rules = directory.glob("*")
-            valid_rules_path = []
+            manifest = self._read_manifest(directory)
+            files = {}
+            index_files = {}
+            hashes = {}
             for rule in rules:
+                if rule.suffix not in [".yara", ".yar", ".rule"]:
+                    continue
+                sha256 = self._hash_rule(rule, hashes)
                 if rule.stem.endswith("index") or rule.stem.startswith("index"):
+                    # not compiled, but still part of the rules of the directory
+                    index_files[str(rule)] = sha256
                     continue
-                if rule.suffix in [".yara", ".yar", ".rule"]:
+                previous = manifest["files"].get(str(rule), {})
+                if previous.get("sha256") == sha256:
+                    valid = previous["valid"]
+                else:
                     try:
                         yara.compile(str(rule))
                     except yara.SyntaxError:
-                        continue
+                        valid = False
                     else:
-                        valid_rules_path.append(str(rule))
-            logger.info(
-                f"Compiling {len(valid_rules_path)} rules for {self} at {directory}"
+                        valid = True
+                files[str(rule)] = {"sha256": sha256, "valid": valid}
+            valid_rules_path = sorted(
+                path for path, file in files.items() if file["valid"]
             )
-            compiled_rule = yara.compile(
-                filepaths={str(path): str(path) for path in valid_rules_path}
-            )
-            compiled_rule.save(str(directory / self.compiled_file_name))
+            digest = hashlib.sha256(
+                json.dumps(
+                    [
+                        [[path, files[path]["sha256"]] for path in valid_rules_path],
+                        sorted(index_files.items()),
+                    ]
+                ).encode()
+            ).hexdigest()
+            compiled_path = directory / self.compiled_file_name
+            if digest == manifest.get("digest") and compiled_path.exists():
+                logger.info(f"Rules {self} at {directory} did not change")
+                compiled_rule = rules_cache.get(
+                    compiled_path, digest, lambda: yara.load(str(compiled_path))
+                )
+            else:
+                logger.info(
+                    f"Compiling {len(valid_rules_path)} rules for {self} at {directory}"
+                )
+                compiled_rule = yara.compile(
+                    filepaths={path: path for path in valid_rules_path}
+                )
+                compiled_rule.save(str(compiled_path))
+                logger.info(f"Rules {self} saved on file")
+                rules_cache.get(compiled_path, digest, lambda: compiled_rule)
+            self._write_manifest(directory, {"files": files, "digest": digest})
             compiled_rules.append(compiled_rule)
-            logger.info(f"Rules {self} saved on file")
         return compiled_rules
 
     def analyze(self, file_path: str, filename: str) -> List[Dict]:
@@ -324,9 +484,8 @@ class YaraStorage:
         errors = []
         for repo in self.repos:
             try:
+                # the rules are kept in memory by the rules cache of the worker
                 result[str(repo.directory.name)] = repo.analyze(file_path, filename)
-                # free some memory
-                repo._rules = []
             except Exception as e:
                 logger.warning(
                     f"{filename} rules analysis failed: {e}", stack_info=True
@@ -450,7 +609,7 @@ class YaraScan(FileAnalyzer):
         for yara_signatures in self.report.report.values():
             for yara_signature in yara_signatures:
                 url = yara_signature.pop("rule_url", None)
-                sign = Signature.objects.create(
+                sign = Signature.get_or_create_shared(
                     provider=Signature.PROVIDERS.YARA.value,
                     signature=yara_signature,
                     url=url if url else "",
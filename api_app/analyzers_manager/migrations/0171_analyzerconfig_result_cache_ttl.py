@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analyzers_manager", "0170_update_yaraify_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analyzerconfig",
+            name="result_cache_ttl",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Seconds the result of an observable is reused by the"
+                " other jobs with the same parameters. 0 disables the cache",
+            ),
+        ),
+    ]
@@ -2,12 +2,14 @@
 # See the file 'LICENSE' for copying permission.
 import json
 from logging import getLogger
-from typing import Dict, Optional, Type, Union
+from typing import Callable, Dict, Optional, Type, Union
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.files import File
+from django.db import models, transaction
 
 from api_app.analyzers_manager.constants import HashChoices, TypeChoices
 from api_app.analyzers_manager.exceptions import AnalyzerConfigurationException
@@ -23,6 +25,7 @@ logger = getLogger(__name__)
 
 class AnalyzerReport(AbstractReport):
     objects = AnalyzerReportQuerySet.as_manager()
+    counted_in_job_stats = True
     config = models.ForeignKey(
         "AnalyzerConfig", related_name="reports", null=False, on_delete=models.CASCADE
     )
@@ -122,19 +125,67 @@ class AnalyzerReport(AbstractReport):
                 result[data_model_key] = value
         return result
 
-    def create_data_model(self) -> Optional[BaseDataModel]:
-        # TODO we don't need to actually crate a new object every time.
-        #  if the report is the same of the previous one, we can just link it
+    def _get_data_model_owner_key(self) -> str:
+        # data models are visible to the organization of the owner,
+        # so they are shared only inside the same organization
+        user = self.user
+        if not user:
+            return ""
+        if user.has_membership():
+            return f"organization-{user.membership.organization_id}"
+        return f"user-{user.pk}"
+
+    def create_data_model(
+        self,
+        content: Dict = None,
+        update: Callable[[BaseDataModel], None] = None,
+    ) -> Optional[BaseDataModel]:
+        """
+        Links the report to the data model created from its mapped dictionary.
+
+        Data models are content addressed: if a data model with the same content
+        was already created, it is reused instead of creating a new row.
+
+        Args:
+            content (Dict, optional): Additional content that the data model
+                depends on, when it is not created only from the mapping.
+            update (Callable, optional): Called to complete a new data model
+                before it is saved.
+
+        Returns:
+            Optional[BaseDataModel]: The data model, if it has to be created.
+        """
         if not self._validation_before_data_model():
             return None
         dictionary = self._create_data_model_dictionary()
-
-        self.data_model: BaseDataModel = self.data_model_class.objects.create()
-        self.data_model.merge(dictionary)
+        content_hash = self.data_model_class.get_content_hash(
+            {
+                "owner": self._get_data_model_owner_key(),
+                "dictionary": dictionary,
+                **(content or {}),
+            }
+        )
+        data_model = self.data_model_class.objects.filter(
+            content_hash=content_hash
+        ).first()
+        if data_model is None:
+            with transaction.atomic():
+                data_model = self.data_model_class.objects.create()
+                data_model.merge(dictionary, save=False)
+                if update:
+                    update(data_model)
+                data_model.content_hash = content_hash
+                data_model.save()
+        self.data_model: BaseDataModel = data_model
         self.save()
         return self.data_model
 
 
+# bytes read to detect the mimetype of a file:
+# libmagic signatures are at the beginning of the formats
+MIMETYPE_HEADER_SIZE = 64 * 1024
+
+
 class MimeTypes(models.TextChoices):
     # IMPORTANT! in case you update this Enum remember to update also the frontend
     WSCRIPT = "application/w-script-file"
@@ -223,6 +274,24 @@ class MimeTypes(models.TextChoices):
             return None
         return mimetype
 
+    @classmethod
+    def calculate_from_file(cls, file: File, file_name: str) -> str:
+        """
+        Calculates the mimetype reading only the beginning of the file,
+        where libmagic looks for the signatures of the formats.
+
+        Args:
+            file (File): The file, left at its beginning.
+            file_name (str): The name of the file.
+
+        Returns:
+            str: The mimetype.
+        """
+        file.seek(0)
+        header = file.read(MIMETYPE_HEADER_SIZE)
+        file.seek(0)
+        return cls.calculate(header, file_name)
+
     @classmethod
     def calculate(cls, buffer: Union[bytes, str], file_name: str) -> str:
         from magic import from_buffer as magic_from_buffer
@@ -299,6 +368,11 @@ class AnalyzerConfig(PythonConfig):
         help_text="Mapping analyzer_report_key: data_model_key. Keys preceded by the symbol $ will be considered as constants.",
         blank=True,
     )
+    result_cache_ttl = models.PositiveIntegerField(
+        default=0,
+        help_text="Seconds the result of an observable is reused by the other jobs"
+        " with the same parameters. 0 disables the cache",
+    )
 
     @classmethod
     @property
@@ -341,6 +415,30 @@ class AnalyzerConfig(PythonConfig):
         self.clean_observable_supported()
         self.clean_filetypes()
 
+    def _result_cache_stats_key(self, stat: str) -> str:
+        return f"analyzer_cache_stats_{stat}_{self.name}"
+
+    def count_result_cache(self, hit: bool) -> None:
+        """
+        Counts a hit or a miss of the result cache of the analyzer.
+        """
+        key = self._result_cache_stats_key("hits" if hit else "misses")
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # expired in the meantime
+                cache.add(key, 1, timeout=None)
+
+    @property
+    def result_cache_stats(self) -> Dict[str, int]:
+        """
+        Returns the hits and the misses of the result cache of the analyzer.
+        """
+        keys = {stat: self._result_cache_stats_key(stat) for stat in ["hits", "misses"]}
+        values = cache.get_many(keys.values())
+        return {stat: values.get(key, 0) for stat, key in keys.items()}
+
     @classmethod
     @property
     def plugin_type(cls) -> str:
@@ -11,6 +11,7 @@ from django.conf import settings
 
 from api_app.analyzers_manager import classes
 from api_app.analyzers_manager.exceptions import AnalyzerRunException
+from api_app.analyzers_manager.feeds import FeedStore
 from api_app.mixins import AbuseCHMixin
 from api_app.models import PluginConfig
 
@@ -51,13 +52,10 @@ class Feodo_Tracker(AbuseCHMixin, classes.ObservableAnalyzer):
         if self.update_on_run or not os.path.exists(db_location) and not self.update():
             raise AnalyzerRunException("Unable to update database")
         try:
-            with open(db_location, "r", encoding="utf-8") as f:
-                db = json.load(f)
-            # db is a list of dictionaries
-            for ip in db:
-                if ip["ip_address"] == self.observable_name:
-                    result["found"] = True
-                    break
+            # db is a list of dictionaries, indexed by ip address
+            db = FeedStore.json_index(db_location, "ip_address")
+            if self.observable_name in db:
+                result["found"] = True
         except json.JSONDecodeError as e:
             raise AnalyzerRunException(f"Decode JSON in run: {e}")
         except FileNotFoundError as e:
@@ -100,5 +98,6 @@ class Feodo_Tracker(AbuseCHMixin, classes.ObservableAnalyzer):
                     json.dump(r.json(), f)
                 except json.JSONDecodeError:
                     return False
+                FeedStore.invalidate(db_location)
                 logger.info(f"ended download of db from Feodo Tracker at {db_location}")
         return True
@@ -7,7 +7,6 @@ import os
 import traceback
 from datetime import datetime
 
-import requests
 from django.conf import settings
 
 from api_app.analyzers_manager import classes
@@ -15,6 +14,8 @@ from api_app.analyzers_manager.exceptions import (
     AnalyzerConfigurationException,
     AnalyzerRunException,
 )
+from api_app.analyzers_manager.feeds import FeedStore
+from api_app.http_client import HTTPClient
 
 logger = logging.getLogger(__name__)
 
@@ -33,22 +34,11 @@ class FireHol_IPList(classes.ObservableAnalyzer):
                 "list_names is empty in custom analyzer config, add an iplist"
             )
 
+        ip = ipaddress.ip_address(ip)
         for list_name in self.list_names:
-            result[list_name] = False
-
             self.check_iplist_status(list_name)
-
-            with open(f"{db_path}/{list_name}", "r", encoding="utf-8") as f:
-                db = f.read()
-
-            db_list = db.split("\n")
-
-            for ip_or_subnet in db_list:
-                if ip_or_subnet and ipaddress.ip_address(ip) in ipaddress.ip_network(
-                    ip_or_subnet
-                ):
-                    result[list_name] = True
-                    break
+            index = FeedStore.cidr_index(f"{db_path}/{list_name}")
+            result[list_name] = ip in index
 
         return result
 
@@ -65,7 +55,7 @@ class FireHol_IPList(classes.ObservableAnalyzer):
 
             logger.info(f"starting download of {list_name} from firehol iplist")
             url = f"https://iplists.firehol.org/files/{list_name}"
-            r = requests.get(url)
+            r = HTTPClient("firehol").get(url)
             r.raise_for_status()
 
             data_extracted = r.content.decode()
@@ -79,6 +69,9 @@ class FireHol_IPList(classes.ObservableAnalyzer):
 
             if not os.path.exists(iplist_location):
                 raise AnalyzerRunException(f"failed extraction of {list_name} iplist")
+            # the lookup index is built once, when the list changes
+            FeedStore.invalidate(iplist_location)
+            FeedStore.cidr_index(iplist_location)
 
             logger.info(f"ended download of {list_name} from firehol iplist")
 
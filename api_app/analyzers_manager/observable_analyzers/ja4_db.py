@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 import os
@@ -6,6 +7,7 @@ import requests
 from django.conf import settings
 
 from api_app.analyzers_manager import classes
+from api_app.analyzers_manager.feeds import FeedStore
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +71,7 @@ class Ja4DB(classes.ObservableAnalyzer):
 
         with open(database_location, "w", encoding="utf-8") as f:
             json.dump(data, f)
+        FeedStore.invalidate(database_location)
         logger.info(f"Database updated at {database_location}")
 
     def run(self):
@@ -82,9 +85,8 @@ class Ja4DB(classes.ObservableAnalyzer):
                 f"Database does not exist in {database_location}, initialising..."
             )
             self.update()
-        with open(database_location, "r") as f:
-            db = json.load(f)
-        for application in db:
-            if application["ja4_fingerprint"] == self.observable_name:
-                return application
+        db = FeedStore.json_index(database_location, "ja4_fingerprint")
+        if self.observable_name in db:
+            # the index is shared inside the worker: never return its items directly
+            return copy.deepcopy(db[self.observable_name][0])
         return {"found": False}
@@ -1,14 +1,16 @@
-import bisect
+import copy
 import ipaddress
 import json
 import logging
 import os
+from typing import Iterable, Tuple
 
 import requests
 from django.conf import settings
 
 from api_app.analyzers_manager import classes
 from api_app.analyzers_manager.exceptions import AnalyzerRunException
+from api_app.analyzers_manager.feeds import FeedStore
 from api_app.choices import Classification
 
 logger = logging.getLogger(__name__)
@@ -59,28 +61,20 @@ class SpamhausDropV4(classes.ObservableAnalyzer):
                 f"Database does not exist in {database_location}, initialising..."
             )
             self.update()
-        with open(database_location, "r") as f:
-            db = json.load(f)
+        db = FeedStore.json_feed(database_location)
 
         matches = []
 
         if data_type in ["ipv4", "ipv6"]:
             # IP Matching
-            insertion = bisect.bisect_left(
-                db, ip, key=lambda x: ipaddress.ip_network(x["cidr"]).network_address
-            )
-
-            for i in range(insertion, len(db)):
-                network = ipaddress.ip_network(db[i]["cidr"])
-                if ip in network:
-                    matches.append(db[i])
-                elif network.network_address > ip:
-                    break
+            index = FeedStore.cidr_index(database_location, self.cidr_networks)
+            # the feed is shared inside the worker: never return its items directly
+            matches = [copy.deepcopy(db[position]) for position in index.lookup(ip)]
         elif data_type == "asn":
             # ASN Matching
             for entry in db[:-1]:
                 if int(entry["asn"]) == asn:
-                    matches.append(entry)
+                    matches.append(copy.deepcopy(entry))
         else:
             raise AnalyzerRunException(f"Invalid data_type: {data_type}")
 
@@ -112,8 +106,23 @@ class SpamhausDropV4(classes.ObservableAnalyzer):
             database_location = cls.location(data_type)
             with open(database_location, "w", encoding="utf-8") as f:
                 json.dump(data, f)
+            FeedStore.invalidate(database_location)
+            if data_type in ["ipv4", "ipv6"]:
+                # the lookup index is built once, when the list changes
+                FeedStore.cidr_index(database_location, cls.cidr_networks)
             logger.info(f"Database updated at {database_location}")
 
+    @staticmethod
+    def cidr_networks(database_location: str) -> Iterable[Tuple[int, str]]:
+        """
+        Yields (position, cidr) for every network of a drop list
+        """
+        with open(database_location, "r", encoding="utf-8") as f:
+            db = json.load(f)
+        for position, entry in enumerate(db):
+            if "cidr" in entry:
+                yield position, entry["cidr"]
+
     @staticmethod
     def convert_to_json(input_string) -> dict:
         lines = input_string.strip().split("\n")
@@ -9,6 +9,7 @@ from django.conf import settings
 
 from api_app.analyzers_manager import classes
 from api_app.analyzers_manager.exceptions import AnalyzerRunException
+from api_app.analyzers_manager.feeds import FeedStore
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +28,8 @@ class Talos(classes.ObservableAnalyzer):
                 f"database location {database_location} does not exist"
             )
 
-        with open(database_location, "r", encoding="utf-8") as f:
-            db = f.read()
-
-        db_list = db.split("\n")
-        if self.observable_name in db_list:
+        db = FeedStore.lines(database_location)
+        if self.observable_name in db:
             result["found"] = True
 
         return result
@@ -49,6 +47,7 @@ class Talos(classes.ObservableAnalyzer):
 
             if not os.path.exists(database_location):
                 return False
+            FeedStore.invalidate(database_location)
             logger.info("ended download of db from talos")
             return True
         except Exception as e:
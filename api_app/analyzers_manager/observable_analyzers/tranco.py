@@ -3,10 +3,9 @@
 
 from urllib.parse import urlparse
 
-import requests
-
 from api_app.analyzers_manager import classes
 from api_app.choices import Classification
+from api_app.http_client import HTTPClient
 
 
 class Tranco(classes.ObservableAnalyzer):
@@ -22,7 +21,7 @@ class Tranco(classes.ObservableAnalyzer):
             observable_to_analyze = urlparse(self.observable_name).hostname
 
         url = self.url + observable_to_analyze
-        response = requests.get(url)
+        response = HTTPClient("tranco").get(url)
         response.raise_for_status()
 
         return response.json()
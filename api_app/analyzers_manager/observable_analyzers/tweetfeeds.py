@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 import os
@@ -8,6 +9,7 @@ from django.conf import settings
 
 from api_app.analyzers_manager.classes import ObservableAnalyzer
 from api_app.analyzers_manager.exceptions import AnalyzerRunException
+from api_app.analyzers_manager.feeds import FeedStore
 
 logger = logging.getLogger(__name__)
 
@@ -49,20 +51,19 @@ class TweetFeeds(ObservableAnalyzer):
                 f"Could not find or update db at {default_db} using {default_url}"
             )
 
-        with open(default_db, "r", encoding="utf-8") as f:
-            logger.info(f"TweetFeeds running with {default_db}")
-            db = json.load(f)
-            for tweet in db:
-                if tweet["value"] == self.observable_name:
-                    if self.filter1 and (
-                        self.filter1 in tweet["tags"] or self.filter1 == tweet["user"]
-                    ):
-                        # this checks if our user has demanded for a
-                        # specific filter and return data based on the
-                        # filter in default db
-                        return tweet
-                    elif not self.filter1:
-                        return tweet
+        logger.info(f"TweetFeeds running with {default_db}")
+        db = FeedStore.json_index(default_db, "value")
+        # the index is shared inside the worker: never return its items directly
+        for tweet in db.get(self.observable_name, []):
+            if self.filter1 and (
+                self.filter1 in tweet["tags"] or self.filter1 == tweet["user"]
+            ):
+                # this checks if our user has demanded for a
+                # specific filter and return data based on the
+                # filter in default db
+                return copy.deepcopy(tweet)
+            elif not self.filter1:
+                return copy.deepcopy(tweet)
 
         if self.time == "year":
             # we already have the updated data for the month
@@ -104,5 +105,6 @@ class TweetFeeds(ObservableAnalyzer):
             except json.JSONDecodeError as e:
                 logger.error(f"TweetFeeds failed to update {db_url}: {e}")
                 return False
+            FeedStore.invalidate(db_location)
             logger.info(f"TweetFeeds updated {db_url}")
         return True
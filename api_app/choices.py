@@ -1,5 +1,6 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
+import _operator
 import enum
 import ipaddress
 import logging
@@ -7,7 +8,6 @@ import re
 import typing
 from pathlib import PosixPath
 
-import _operator
 from django.db import models
 
 logger = logging.getLogger(__name__)
@@ -104,6 +104,22 @@ class Status(models.TextChoices):
         ]
 
 
+# compiled once, because they are matched against every submitted observable
+URL_REGEX = re.compile(
+    r"^.+://[a-z\d-]{1,200}"
+    r"(?:\.[a-zA-Z\d\u2044\u2215!#$&(-;=?-\[\]_~]{1,200})+"
+    r"(?::\d{2,6})?"
+    r"(?:/[a-zA-Z\d\u2044\u2215!#$&(-;=?-\[\]_~]{1,200})*"
+    r"(?:\.\w+)?"
+)
+DOMAIN_REGEX = re.compile(
+    r"^([\[\\]?\.[\]\\]?)?[a-z\d\-_]{1,63}" r"(([\[\\]?\.[\]\\]?)[a-z\d\-_]{1,63})+$",
+    re.IGNORECASE,
+)
+# md5, sha1 and sha256
+HASH_REGEX = re.compile(r"^(?:[a-f\d]{32}|[a-f\d]{40}|[a-f\d]{64})$", re.IGNORECASE)
+
+
 class Classification(models.TextChoices):
     IP = "ip"
     URL = "url"
@@ -127,27 +143,11 @@ class Classification(models.TextChoices):
         try:
             ipaddress.ip_address(value)
         except ValueError:
-            if re.match(
-                r"^.+://[a-z\d-]{1,200}"
-                r"(?:\.[a-zA-Z\d\u2044\u2215!#$&(-;=?-\[\]_~]{1,200})+"
-                r"(?::\d{2,6})?"
-                r"(?:/[a-zA-Z\d\u2044\u2215!#$&(-;=?-\[\]_~]{1,200})*"
-                r"(?:\.\w+)?",
-                value,
-            ):
+            if URL_REGEX.match(value):
                 classification = cls.URL
-            elif re.match(
-                r"^([\[\\]?\.[\]\\]?)?[a-z\d\-_]{1,63}"
-                r"(([\[\\]?\.[\]\\]?)[a-z\d\-_]{1,63})+$",
-                value,
-                re.IGNORECASE,
-            ):
+            elif DOMAIN_REGEX.match(value):
                 classification = cls.DOMAIN
-            elif (
-                re.match(r"^[a-f\d]{32}$", value, re.IGNORECASE)
-                or re.match(r"^[a-f\d]{40}$", value, re.IGNORECASE)
-                or re.match(r"^[a-f\d]{64}$", value, re.IGNORECASE)
-            ):
+            elif HASH_REGEX.match(value):
                 classification = cls.HASH
             else:
                 classification = cls.GENERIC
@@ -147,17 +147,17 @@ class Plugin(metaclass=ABCMeta):
         Args:
             runtime_configuration (dict): Runtime configuration parameters.
         """
-        self.__parameters = self._config.read_configured_params(
+        self.__parameters = self._config.get_configured_params(
             self._user, runtime_configuration
         )
         for parameter in self.__parameters:
             attribute_name = (
-                f"_{parameter.name}" if parameter.is_secret else parameter.name
+                f"_{parameter['name']}" if parameter["is_secret"] else parameter["name"]
             )
-            setattr(self, attribute_name, parameter.value)
+            setattr(self, attribute_name, parameter["value"])
             logger.debug(
                 f"Adding to {self.__class__.__name__} "
-                f"param {attribute_name} with value {parameter.value} "
+                f"param {attribute_name} with value {parameter['value']} "
             )
 
     def before_run(self):
@@ -175,6 +175,23 @@ class Plugin(metaclass=ABCMeta):
             dict: Report generated by the plugin.
         """
 
+    def get_cached_result(self) -> typing.Any:
+        """
+        Returns the result of a previous run to use instead of calling run.
+
+        Returns:
+            Any: The cached result, None if run has to be called.
+        """
+        return None
+
+    def cache_result(self, content: typing.Any) -> None:
+        """
+        Stores the result of run, to be returned by *get_cached_result*.
+
+        Args:
+            content (Any): Content generated by the plugin.
+        """
+
     def after_run(self):
         """
         Function called after the run function.
@@ -294,7 +311,10 @@ class Plugin(metaclass=ABCMeta):
         try:
             self.config(runtime_configuration)
             self.before_run()
-            _result = self.run()
+            _result = self.get_cached_result()
+            if _result is None:
+                _result = self.run()
+                self.cache_result(_result)
         except Exception as e:
             self.after_run_failed(e)
         else:
@@ -420,15 +440,23 @@ class Plugin(metaclass=ABCMeta):
                 self._user.membership.organization
             )
             if org_configuration.rate_limit_timeout is not None:
-                api_key_parameter = self.__parameters.filter(
-                    name__contains="api_key"
-                ).first()
+                api_key_parameter = next(
+                    (
+                        parameter
+                        for parameter in self.__parameters
+                        if "api_key" in parameter["name"]
+                    ),
+                    None,
+                )
                 # if we do not have api keys OR the api key was org based
                 # OR if the api key is not actually required and we do not have it set
                 if (
                     not api_key_parameter
-                    or api_key_parameter.is_from_org
-                    or (not api_key_parameter.required and not api_key_parameter.value)
+                    or api_key_parameter["is_from_org"]
+                    or (
+                        not api_key_parameter["required"]
+                        and not api_key_parameter["value"]
+                    )
                 ):
                     org_configuration.disable_for_rate_limit()
                 else:
@@ -11,6 +11,7 @@ from api_app.models import AbstractReport, PythonConfig, PythonModule
 
 class ConnectorReport(AbstractReport):
     objects = ConnectorReportQuerySet.as_manager()
+    counted_in_job_stats = True
     config = models.ForeignKey(
         "ConnectorConfig", related_name="reports", null=False, on_delete=models.CASCADE
     )
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("data_model_manager", "0011_data_model_date_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="domaindatamodel",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default=None, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="filedatamodel",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default=None, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="ipdatamodel",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default=None, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="domaindatamodel",
+            index=models.Index(
+                fields=["content_hash"], name="data_model__content_efc84f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="filedatamodel",
+            index=models.Index(
+                fields=["content_hash"], name="data_model__content_faf083_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ipdatamodel",
+            index=models.Index(
+                fields=["content_hash"], name="data_model__content_0982e9_idx"
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from typing import Dict, Type, Union
@@ -59,6 +60,17 @@ class Signature(models.Model):
     def __str__(self):
         return f"{self.provider}: {json.dumps(self.signature)}"
 
+    @classmethod
+    def get_or_create_shared(cls, **kwargs) -> "Signature":
+        """
+        Returns the signature with the same values, creating it if it does not exist,
+        so that the data models with the same signature share the same row.
+        """
+        obj = cls.objects.filter(**kwargs).first()
+        if obj is None:
+            obj = cls.objects.create(**kwargs)
+        return obj
+
 
 class BaseDataModel(models.Model):
     objects = BaseDataModelQuerySet.as_manager()
@@ -97,6 +109,11 @@ class BaseDataModel(models.Model):
         default=dict
     )  # field for additional information related to a specific analyzer
     date = models.DateTimeField(default=now)
+    # set on the data models of the analyzers, that are never modified after creation,
+    # so that analyses with the same result share the same row
+    content_hash = models.CharField(
+        max_length=64, null=True, blank=True, default=None, editable=False
+    )
     analyzers_report = GenericRelation(
         to="analyzers_manager.AnalyzerReport",
         object_id_field="data_model_object_id",
@@ -122,6 +139,7 @@ class BaseDataModel(models.Model):
         abstract = True
         indexes = [
             models.Index(fields=["date"]),
+            models.Index(fields=["content_hash"]),
         ]
 
     @property
@@ -131,8 +149,21 @@ class BaseDataModel(models.Model):
         elif self.jobs.exists():
             return self.jobs.first().user
 
+    @classmethod
+    def get_content_hash(cls, content: Dict) -> str:
+        """
+        Returns the hash of the content used to create a data model,
+        with the keys of the dictionaries sorted.
+        """
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
     def merge(
-        self, other: Union["BaseDataModel", Dict], append: bool = True
+        self,
+        other: Union["BaseDataModel", Dict],
+        append: bool = True,
+        save: bool = True,
     ) -> "BaseDataModel":
         if not self.pk:
             raise ValueError("Unable to merge a model that was not saved.")
@@ -181,7 +212,8 @@ class BaseDataModel(models.Model):
             else:
                 result_attr = other_attr
             setattr(self, field_name, result_attr)
-        self.save()
+        if save:
+            self.save()
         return self
 
     def __sub__(self, other: "BaseDataModel") -> "BaseDataModel":
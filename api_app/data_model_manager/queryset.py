@@ -16,7 +16,9 @@ class BaseDataModelQuerySet(QuerySet):
         """
         result_obj: BaseDataModel = self.model.objects.create()
         for obj in self:
-            result_obj.merge(obj, append=append)
+            # the result is written once, after all the merges
+            result_obj.merge(obj, append=append, save=False)
+        result_obj.save()
         return result_obj
 
     def serialize(self) -> List[Dict]:
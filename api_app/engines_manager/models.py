@@ -48,7 +48,7 @@ class EngineConfig(SingletonModel):
         if job.data_model:
             job.data_model.delete()
         job.data_model = data_model_result
-        job.save()
+        job.save(update_fields=["data_model_content_type", "data_model_object_id"])
 
         runner = group(list(self.get_modules_signatures(job)))
         runner.apply_async(
@@ -5,12 +5,16 @@ from intel_owl.tasks import FailureLoggedTask
 
 
 @shared_task(base=FailureLoggedTask, soft_time_limit=300)
-def execute_engine(job_pk: int):
+def execute_engine(job_pk: int, job_stage: str = None):
     from api_app.engines_manager.models import EngineConfig
-    from api_app.models import Job
+    from api_app.models import Job, JobStage
 
-    job = Job.objects.get(pk=job_pk)
-    EngineConfig.objects.first().run(job)
+    try:
+        job = Job.objects.get(pk=job_pk)
+        EngineConfig.objects.first().run(job)
+    finally:
+        if job_stage:
+            JobStage.objects.task_completed(job_pk, job_stage)
 
 
 @shared_task(base=FailureLoggedTask, soft_time_limit=300)
@@ -5,6 +5,7 @@ import logging
 
 import rest_framework_filters as filters
 
+from .analyzables_manager.models import Analyzable
 from .choices import Classification
 from .models import Job
 
@@ -22,7 +23,8 @@ class JobFilter(filters.FilterSet):
 
     Attributes:
         is_sample (BooleanFilter): Filter by whether the job is a sample.
-        md5 (CharFilter): Filter by MD5 hash, case-insensitive contains.
+        md5 (CharFilter): Filter by MD5 hash, case-insensitive contains,
+            or by exact MD5, SHA1 or SHA256 hash if the value is a full digest.
         observable_name (CharFilter): Filter by observable name, case-insensitive contains.
         file_name (CharFilter): Filter by file name, case-insensitive contains.
         file_mimetype (CharFilter): Filter by file MIME type, case-insensitive contains.
@@ -35,7 +37,7 @@ class JobFilter(filters.FilterSet):
     """
 
     is_sample = filters.BooleanFilter(method="filter_is_sample")
-    md5 = filters.CharFilter(field_name="analyzable__md5", lookup_expr="icontains")
+    md5 = filters.CharFilter(method="filter_for_md5")
     observable_name = filters.CharFilter(
         field_name="analyzable__name", lookup_expr="icontains"
     )
@@ -63,6 +65,23 @@ class JobFilter(filters.FilterSet):
             return queryset.filter(analyzable__classification=Classification.FILE)
         return queryset.exclude(analyzable__classification=Classification.FILE)
 
+    @staticmethod
+    def filter_for_md5(queryset, value, md5, *args, **kwargs):
+        """
+        Filters the queryset by analyzable hash.
+
+        Args:
+            queryset (QuerySet): The queryset to filter.
+            value (str): The filter value.
+            md5 (str): The hash, or part of the MD5 hash, to filter by.
+
+        Returns:
+            QuerySet: The filtered queryset.
+        """
+        return queryset.filter(
+            analyzable__in=Analyzable.objects.filter_contains("md5", md5)
+        )
+
     @staticmethod
     def filter_for_user(queryset, value, user, *args, **kwargs):
         """
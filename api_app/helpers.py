@@ -9,7 +9,10 @@ import logging
 import random
 import re
 import warnings
+from contextlib import contextmanager
+from typing import Dict, Iterable
 
+from django.db import connection
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -41,6 +44,28 @@ def calculate_sha256(value: bytes) -> str:
     return hashlib.sha256(value).hexdigest()  # skipcq BAN-B324
 
 
+def calculate_hashes(chunks: Iterable[bytes]) -> Dict[str, str]:
+    """
+    Calculates md5, sha1 and sha256 with a single pass over the chunks,
+    so that a file can be hashed without being loaded in memory.
+
+    Args:
+        chunks (Iterable[bytes]): The content, like ``File.chunks()``.
+
+    Returns:
+        Dict[str, str]: The hex digests, by ``md5``, ``sha1`` and ``sha256``.
+    """
+    hashes = {
+        "md5": hashlib.md5(),  # skipcq BAN-B324
+        "sha1": hashlib.sha1(),  # skipcq BAN-B324
+        "sha256": hashlib.sha256(),
+    }
+    for chunk in chunks:
+        for hash_ in hashes.values():
+            hash_.update(chunk)
+    return {name: hash_.hexdigest() for name, hash_ in hashes.items()}
+
+
 def get_ip_version(ip_value):
     """
     Returns ip version
@@ -84,3 +109,28 @@ def deprecated(message: str):
         return wrapper
 
     return decorator
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on the default database connection.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """
+    Context manager that yields a QueryCounter of the queries
+    executed inside the block. Unlike `CaptureQueriesContext`
+    it does not require DEBUG and it does not store the queries.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
@@ -0,0 +1,213 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+# HTTP client used by the plugins to talk to the third party services
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import redis
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """
+    The request would have waited more than the maximum wait
+    for the rate limit of the service
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter, implemented as a generic cell rate algorithm:
+    a token is added every ``interval`` seconds, up to ``burst`` tokens.
+
+    Every request reserves the next free token and waits for it,
+    so that the requests exceeding the rate are delayed instead of failed.
+    The state is kept in redis and shared by every worker;
+    if redis is not reachable it is kept in the process.
+    """
+
+    # KEYS[1]: bucket; ARGV: interval, burst, max wait.
+    # The value of the bucket is the time the next token is free
+    SCRIPT = """
+local now = redis.call("TIME")
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call("GET", KEYS[1]) or now), now)
+local wait = math.max(tat - now - (burst - 1) * interval, 0)
+if wait > max_wait then
+    return tostring(-wait)
+end
+tat = tat + interval
+redis.call("SET", KEYS[1], tostring(tat), "PX", math.ceil((tat - now) * 1000))
+return tostring(wait)
+"""
+
+    def __init__(self, requests_number: float, seconds: float, burst: int = 1):
+        self.interval = seconds / requests_number
+        self.burst = burst
+        self._local: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve_local(self, key: str, max_wait: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._local.get(key, now), now)
+            wait = max(tat - now - (self.burst - 1) * self.interval, 0)
+            if wait > max_wait:
+                return -wait
+            self._local[key] = tat + self.interval
+            return wait
+
+    def reserve(self, key: str, max_wait: float) -> float:
+        """
+        Reserves a token of the bucket.
+
+        Returns:
+            float: the seconds to wait for the token,
+            negative if the token was not reserved because of the max wait
+        """
+        client = _redis_client()
+        if client is not None:
+            try:
+                return float(
+                    client.eval(
+                        self.SCRIPT, 1, key, self.interval, self.burst, max_wait
+                    )
+                )
+            except redis.RedisError as e:
+                logger.warning(f"rate limit of {key} kept in the process: {e}")
+        return self._reserve_local(key, max_wait)
+
+    def acquire(self, key: str, max_wait: float) -> float:
+        """
+        Waits for a token of the bucket.
+
+        Returns:
+            float: the seconds waited
+
+        Raises:
+            RateLimitExceeded: if the token would be free after max_wait seconds
+        """
+        wait = self.reserve(key, max_wait)
+        if wait < 0:
+            raise RateLimitExceeded(
+                f"rate limit of {key} exceeded: next request in {-wait:.1f}s"
+            )
+        if wait:
+            logger.info(f"rate limit of {key}: waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+
+_redis: Dict[str, Optional[redis.Redis]] = {}
+
+
+def _redis_client() -> Optional[redis.Redis]:
+    url = settings.HTTP_RATE_LIMIT_REDIS_URL
+    if url not in _redis:
+        _redis[url] = (
+            redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+            if url
+            else None
+        )
+    return _redis[url]
+
+
+class HTTPClient:
+    """
+    Client of a third party service.
+
+    The keep-alive connections are shared by every client of the same
+    service in the process, so that the plugins do not open a new
+    TCP/TLS connection for every request.
+    If a rate limit of the service is configured in HTTP_RATE_LIMITS,
+    the requests of every API key are delayed to respect it
+    and the responses 429 are retried after the time required by the service.
+
+    Usage:
+        client = HTTPClient("virustotal", api_key)
+        response = client.get(url, headers=headers)
+    """
+
+    # the service is asked to wait at most these times when answering 429
+    max_rate_limit_retries: int = 3
+
+    # every service has its own connections, bounded to pool_maxsize per host
+    _sessions: Dict[str, requests.Session] = {}
+    _buckets: Dict[str, TokenBucket] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, service: str, api_key: str = ""):
+        self.service = service
+        # the key is not stored in redis
+        self.bucket_key = (
+            f"ratelimit:{service}:"
+            f"{hashlib.sha256(str(api_key).encode()).hexdigest()[:16]}"
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self.service not in self._sessions:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_maxsize=settings.HTTP_POOL_MAXSIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[self.service] = session
+            return self._sessions[self.service]
+
+    @property
+    def bucket(self) -> Optional[TokenBucket]:
+        rate: Optional[Tuple[float, float]] = settings.HTTP_RATE_LIMITS.get(
+            self.service
+        )
+        if rate is None:
+            return None
+        with self._lock:
+            if self.service not in self._buckets:
+                self._buckets[self.service] = TokenBucket(*rate)
+            return self._buckets[self.service]
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        max_wait = settings.HTTP_RATE_LIMIT_MAX_WAIT
+        bucket = self.bucket
+        for _ in range(self.max_rate_limit_retries + 1):
+            if bucket is not None:
+                bucket.acquire(self.bucket_key, max_wait)
+            response = getattr(self.session, method.lower())(url, **kwargs)
+            if response.status_code != 429:
+                break
+            retry_after = self._retry_after(response)
+            if retry_after is None or retry_after > max_wait:
+                break
+            logger.info(f"{self.service} answered 429: retrying in {retry_after}s")
+            time.sleep(retry_after)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
@@ -1,15 +1,21 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
 import abc
+import hashlib
 import logging
 import typing
 from collections import deque
+from itertools import chain, islice
 from typing import Any, Type
 
+from django.core.files import File
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 
 from ..choices import TLP, PythonModuleBasePaths
 from ..classes import Plugin
+from ..helpers import calculate_hashes
+from ..investigations_manager.models import Investigation
 from .exceptions import IngestorConfigurationException, IngestorRunException
 from .models import IngestorConfig, IngestorReport
 
@@ -68,25 +74,67 @@ class Ingestor(Plugin, metaclass=abc.ABCMeta):
         self._config: IngestorConfig
         return self._config.playbooks_choice.first()
 
-    def after_run_success(self, content):
-        # exhaust generator
-        if isinstance(content, typing.Generator):
-            content = list(content)
+    @staticmethod
+    def _reference(item: Any) -> Any:
+        # samples are referenced by their hash, to keep the report small
+        if isinstance(item, File):
+            return calculate_hashes(item.chunks())["sha256"]
+        if isinstance(item, bytes):
+            return hashlib.sha256(item).hexdigest()
+        return item
 
-        super().after_run_success(content)
+    def after_run_success(self, content):
         self._config: IngestorConfig
-        logger.info(f"creating {len(content)} jobs from ingestor {self.__repr__()}")
-        deque(
-            self._config.create_jobs(
-                # every job created from an ingestor
-                content,
-                TLP.CLEAR.value,
-                self._user,
-                delay=self._config.delay,
-                playbook_to_execute=self.get_playbook_to_execute(),
-            ),
-            maxlen=0,
-        )
+        if not isinstance(content, (list, typing.Generator)):
+            content = [content]
+        content = iter(content)
+        playbook_to_execute = self.get_playbook_to_execute()
+        references = []
+        # multiple jobs are grouped in a single investigation, whatever their batch
+        head = list(islice(content, 2))
+        content = chain(head, content)
+        investigation = None
+        if len(head) > 1:
+            investigation = Investigation.objects.create(
+                name=f"Custom investigation: {self._config.name}",
+                owner=self._user,
+                for_organization=True,
+                status=Investigation.STATUSES.RUNNING.value,
+                start_time=now(),
+            )
+        try:
+            # the items are turned into jobs while they are ingested,
+            # so that only a batch of them is kept in memory
+            while batch := list(islice(content, self._config.jobs_batch_size)):
+                logger.info(
+                    f"creating {len(batch)} jobs from ingestor {self.__repr__()}"
+                )
+                deque(
+                    self._config.create_jobs(
+                        # every job created from an ingestor
+                        batch,
+                        TLP.CLEAR.value,
+                        self._user,
+                        delay=self._config.delay,
+                        playbook_to_execute=playbook_to_execute,
+                        # the jobs keep being spaced by the delay across batches
+                        offset=len(references),
+                        investigation=investigation,
+                    ),
+                    maxlen=0,
+                )
+                references.extend(self._reference(item) for item in batch)
+        except Exception as e:
+            # the jobs already created are kept
+            self.report.report = references
+            self.report.save(update_fields=["report"])
+            self.after_run_failed(e)
+        else:
+            super().after_run_success(references)
+        finally:
+            if investigation:
+                investigation.name = f"Custom investigation: {len(references)} jobs"
+                investigation.save(update_fields=["name"])
 
     def execute_pivots(self) -> None:
         # we do not have a job, meaning that we have no pivots
@@ -60,7 +60,7 @@ class VirusTotal(Ingestor, VirusTotalv3BaseMixin):
             if_mock_connections(
                 # first search query
                 patch(
-                    "requests.get",
+                    "requests.Session.get",
                     side_effect=[
                         # for intelligence search
                         MockUpResponse(
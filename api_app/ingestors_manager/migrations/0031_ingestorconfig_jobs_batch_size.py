@@ -0,0 +1,20 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ingestors_manager", "0030_alter_ingestor_config_required_api_key_abuse_ch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestorconfig",
+            name="jobs_batch_size",
+            field=models.PositiveIntegerField(
+                default=10,
+                help_text="Number of ingested items turned into jobs together",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -4,6 +4,7 @@ import logging
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import QuerySet
 from django_celery_beat.models import CrontabSchedule, PeriodicTask
@@ -87,6 +88,8 @@ class IngestorConfig(PythonConfig, CreateJobsFromPlaybookInterface):
         periodic_task (OneToOneField): One-to-one relationship with PeriodicTask.
         maximum_jobs (IntegerField): Maximum number of jobs.
         delay (DurationField): Delay between jobs.
+        jobs_batch_size (PositiveIntegerField): Number of ingested items
+            turned into jobs together.
         org_configuration (None): Placeholder for organization configuration.
     """
 
@@ -116,6 +119,11 @@ class IngestorConfig(PythonConfig, CreateJobsFromPlaybookInterface):
     delay = models.DurationField(
         default=timedelta, help_text="Expects data in the format 'DD HH:MM:SS'"
     )
+    jobs_batch_size = models.PositiveIntegerField(
+        default=10,
+        validators=[MinValueValidator(1)],
+        help_text="Number of ingested items turned into jobs together",
+    )
 
     org_configuration = None
 
@@ -153,5 +161,11 @@ class IngestorConfig(PythonConfig, CreateJobsFromPlaybookInterface):
             parameters=self._get_params(self.user, {}),
         )
 
+    @classmethod
+    def generate_empty_reports(cls, job: Job, configs, task_ids, status, parameters):
+        # the parameters of the ingestors are the ones of their user
+        for config in configs:
+            config.generate_empty_report(job, task_ids[config.pk], status)
+
     def get_or_create_org_configuration(self):
         return None
@@ -13,6 +13,7 @@ from certego_saas.apps.organization.organization import Organization
 
 if TYPE_CHECKING:
     from api_app.playbooks_manager.models import PlaybookConfig
+    from api_app.investigations_manager.models import Investigation
     from api_app.models import Job
 
 from django.core.files import File
@@ -72,6 +73,7 @@ class CreateJobsFromPlaybookInterface:
         user: User,
         delay: datetime.timedelta,
         playbook_to_execute: "PlaybookConfig",
+        offset: int = 0,
     ):
         """
         Gets the appropriate serializer based on the playbook type.
@@ -82,6 +84,8 @@ class CreateJobsFromPlaybookInterface:
             user (User): The user executing the playbook.
             delay (datetime.timedelta): The delay before the job is executed.
             playbook_to_execute (PlaybookConfig): The playbook to execute.
+            offset (int): The position of the first value
+                among the values whose jobs are spaced by the delay.
 
         Returns:
             Serializer: The appropriate serializer instance.
@@ -89,11 +93,21 @@ class CreateJobsFromPlaybookInterface:
         values = value if isinstance(value, (list, Generator)) else [value]
         if playbook_to_execute.is_sample():
             return self._get_file_serializer(
-                values, tlp, user, delay=delay, playbook_to_execute=playbook_to_execute
+                values,
+                tlp,
+                user,
+                delay=delay,
+                playbook_to_execute=playbook_to_execute,
+                offset=offset,
             )
         else:
             return self._get_observable_serializer(
-                values, tlp, user, playbook_to_execute=playbook_to_execute, delay=delay
+                values,
+                tlp,
+                user,
+                playbook_to_execute=playbook_to_execute,
+                delay=delay,
+                offset=offset,
             )
 
     @staticmethod
@@ -103,6 +117,7 @@ class CreateJobsFromPlaybookInterface:
         user: User,
         playbook_to_execute: "PlaybookConfig",
         delay: datetime.timedelta = datetime.timedelta(),
+        offset: int = 0,
     ):
         """
         Gets the serializer for observable analysis.
@@ -113,6 +128,8 @@ class CreateJobsFromPlaybookInterface:
             user (User): The user executing the playbook.
             playbook_to_execute (PlaybookConfig): The playbook to execute.
             delay (datetime.timedelta): The delay before the job is executed.
+            offset (int): The position of the first value
+                among the values whose jobs are spaced by the delay.
 
         Returns:
             ObservableAnalysisSerializer: The serializer instance for observable analysis.
@@ -131,7 +148,7 @@ class CreateJobsFromPlaybookInterface:
                 "tlp": tlp,
                 "delay": int(delay.total_seconds()),  # datetime.timedelta serialization
             },
-            context={"request": MockUpRequest(user=user)},
+            context={"request": MockUpRequest(user=user), "index_offset": offset},
             many=True,
         )
 
@@ -142,6 +159,7 @@ class CreateJobsFromPlaybookInterface:
         user: User,
         playbook_to_execute: "PlaybookConfig",
         delay: datetime.timedelta = datetime.timedelta(),
+        offset: int = 0,
     ):
         """
         Gets the serializer for file analysis.
@@ -152,6 +170,8 @@ class CreateJobsFromPlaybookInterface:
             user (User): The user executing the playbook.
             playbook_to_execute (PlaybookConfig): The playbook to execute.
             delay (datetime.timedelta): The delay before the job is executed.
+            offset (int): The position of the first value
+                among the values whose jobs are spaced by the delay.
 
         Returns:
             FileJobSerializer: The serializer instance for file analysis.
@@ -165,7 +185,7 @@ class CreateJobsFromPlaybookInterface:
                 if isinstance(data, File)
                 else File(io.BytesIO(data), name=f"{self.name}.{i}")
             )
-            for i, data in enumerate(values)
+            for i, data in enumerate(values, start=offset)
         ]
         query_dict = QueryDict(mutable=True)
         data = {
@@ -177,7 +197,7 @@ class CreateJobsFromPlaybookInterface:
         query_dict.setlist("files", files)
         return FileJobSerializer(
             data=query_dict,
-            context={"request": MockUpRequest(user=user)},
+            context={"request": MockUpRequest(user=user), "index_offset": offset},
             many=True,
         )
 
@@ -190,6 +210,8 @@ class CreateJobsFromPlaybookInterface:
         delay: datetime.timedelta = datetime.timedelta(),
         send_task: bool = True,
         parent_job=None,
+        offset: int = 0,
+        investigation: "Investigation" = None,
     ) -> Generator["Job", None, None]:
         """
         Creates jobs from the given playbook configuration.
@@ -202,6 +224,10 @@ class CreateJobsFromPlaybookInterface:
             delay (datetime.timedelta): The delay before the job is executed.
             send_task (bool): Whether to send the task.
             parent_job (Optional[Job]): The parent job, if any.
+            offset (int): The position of the first value
+                among the values whose jobs are spaced by the delay.
+            investigation (Optional[Investigation]): The investigation
+                the jobs are added to, if any.
 
         Yields:
             Job: The created job instances.
@@ -211,14 +237,21 @@ class CreateJobsFromPlaybookInterface:
         """
         try:
             serializer = self._get_serializer(
-                value, tlp, user, delay, playbook_to_execute=playbook_to_execute
+                value,
+                tlp,
+                user,
+                delay,
+                playbook_to_execute=playbook_to_execute,
+                offset=offset,
             )
         except ValueError as e:
             logger.exception(e)
             raise
         else:
             serializer.is_valid(raise_exception=True)
-            yield from serializer.save(send_task=send_task, parent=parent_job)
+            yield from serializer.save(
+                send_task=send_task, parent=parent_job, investigation=investigation
+            )
 
 
 class OwnershipAbstractModel(models.Model):
@@ -4,7 +4,8 @@ from typing import List
 
 from django.conf import settings
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import Count, Max, QuerySet
+from django.db.models.functions import Substr
 from django.utils.timezone import now
 
 from api_app.choices import TLP
@@ -66,35 +67,31 @@ class Investigation(OwnershipAbstractModel, ListCachable):
     def set_correct_status(self, save: bool = True):
 
         logger.info(f"Setting status for investigation {self.pk}")
+        stats = self.jobs.aggregate(
+            jobs=Count("pk"), end_time=Max("finished_analysis_time")
+        )
         # if I have some jobs
-        if self.jobs.exists():
+        if stats["jobs"]:
+            # the running jobs are few and indexed by status:
+            # we look for the ones in our trees instead of walking every tree
+            running_jobs_list = list(
+                Job.objects.exclude(status__in=Job.STATUSES.final_statuses())
+                .annotate(root_path=Substr("path", 1, Job.steplen))
+                .filter(root_path__in=self.jobs.values("path"))
+                .values_list("pk", flat=True)
+            )
             # and at least one is running
-            for job in self.jobs.all():
-                job: Job
-                jobs = job.get_tree(job)
-                running_jobs_list = jobs.exclude(
-                    status__in=Job.STATUSES.final_statuses()
-                ).values_list("pk", flat=True)
-                running_jobs_count = len(running_jobs_list)
+            if running_jobs_list:
                 logger.info(
-                    f"{running_jobs_count} out of {self.jobs.count()} jobs are still running for investigation {self.pk}"
+                    f"Jobs {running_jobs_list} are still running for investigation {self.pk}"
                 )
-                if running_jobs_count > 0:
-                    logger.info(
-                        f"Jobs {running_jobs_list} are still running for investigation {self.pk}"
-                    )
-                    self.status = self.STATUSES.RUNNING.value
-                    self.end_time = None
-                    break
+                self.status = self.STATUSES.RUNNING.value
+                self.end_time = None
             # and they are all completed
             else:
                 logger.info(f"Setting investigation {self.pk} to concluded")
                 self.status = self.STATUSES.CONCLUDED.value
-                self.end_time = (
-                    self.jobs.order_by("-finished_analysis_time")
-                    .first()
-                    .finished_analysis_time
-                )
+                self.end_time = stats["end_time"]
         else:
             logger.info(f"Setting investigation {self.pk} to created")
             self.status = self.STATUSES.CREATED.value
@@ -64,7 +64,7 @@ class InvestigationViewSet(ModelWithOwnershipViewSet, ModelViewSet):
             raise PermissionDenied("You can add to an investigation only primary jobs")
         if job.investigation is None:
             job.investigation = investigation
-            job.save()
+            job.save(update_fields=["investigation"])
             # we are possibly changing the status of the investigation
             job.investigation.set_correct_status(save=True)
 
@@ -98,7 +98,7 @@ class InvestigationViewSet(ModelWithOwnershipViewSet, ModelViewSet):
                 data={"error": f"You can't remove job {job.id} from investigation"},
             )
         job.investigation = None
-        job.save()
+        job.save(update_fields=["investigation"])
         investigation.refresh_from_db()
         # we are possibly changing the status of the investigation
         investigation.set_correct_status(save=True)
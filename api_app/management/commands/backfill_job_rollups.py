@@ -0,0 +1,32 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import datetime
+
+from django.core.management import BaseCommand
+from django.utils.timezone import now
+
+from api_app.models import JobRollup
+
+
+class Command(BaseCommand):
+    help = "Compute again the hourly counters of the finished jobs"
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Compute only the counters of the last days (default: all)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        since = None
+        if options["days"] is not None:
+            since = now() - datetime.timedelta(days=options["days"])
+        created = JobRollup.objects.backfill(
+            since=since, batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Created {created} job rollups"))
@@ -0,0 +1,125 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import timeit
+
+from django.core.cache.backends.base import BaseCache
+from django.core.management import BaseCommand
+from django.utils.module_loading import import_string
+
+from intel_owl.settings.cache import CACHE_L1_TIMEOUT, CACHE_REDIS_URL
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the database cache against the local memory and redis caches"
+        " on reads, writes and prefix invalidations"
+    )
+
+    BACKENDS = {
+        "database": {
+            "BACKEND": "intel_owl.settings.cache.DatabaseCacheExtended",
+            "LOCATION": "intelowl_cache",
+        },
+        "locmem": {
+            "BACKEND": "intel_owl.settings.cache.LocMemCacheExtended",
+            "LOCATION": "benchmark_cache",
+        },
+        "redis": {
+            "BACKEND": "intel_owl.settings.cache.TieredCache",
+            "LOCATION": "benchmark_cache",
+            "L1_TIMEOUT": CACHE_L1_TIMEOUT,
+            "L2": {
+                "BACKEND": "intel_owl.settings.cache.RedisCacheExtended",
+                "LOCATION": CACHE_REDIS_URL,
+                "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+            },
+        },
+    }
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--keys", type=int, default=1000, help="Number of keys to write"
+        )
+        parser.add_argument(
+            "--users", type=int, default=50, help="Number of users owning the keys"
+        )
+        parser.add_argument(
+            "--backends",
+            nargs="+",
+            default=list(Command.BACKENDS),
+            choices=list(Command.BACKENDS),
+        )
+
+    def _benchmark(self, cache: BaseCache, keys: list, users: int) -> dict:
+        value = {"name": "plugin", "params": {str(i): i for i in range(20)}}
+
+        def write():
+            for key in keys:
+                cache.set(key, value, timeout=60)
+
+        def read():
+            for key in keys:
+                cache.get(key)
+
+        def invalidate():
+            for user in range(users):
+                cache.delete_where(f"list_BenchmarkConfig_user{user}")
+
+        return {
+            "write": timeit.timeit(write, number=1),
+            "read": timeit.timeit(read, number=1),
+            "invalidate": timeit.timeit(invalidate, number=1),
+        }
+
+    def handle(self, *args, **options):
+        users = options["users"]
+        keys = [
+            f"list_BenchmarkConfig_user{i % users}_{i}_10"
+            for i in range(options["keys"])
+        ]
+        results = {}
+        for name in options["backends"]:
+            params = {
+                "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+                **self.BACKENDS[name],
+            }
+            cache = import_string(params["BACKEND"])(params["LOCATION"], params)
+            try:
+                results[name] = self._benchmark(cache, keys, users)
+                cache.delete_where("list_BenchmarkConfig_")
+            except Exception as e:
+                # ie redis is not reachable
+                self.stdout.write(self.style.WARNING(f"{name}: skipped ({e})"))
+
+        self.stdout.write(f"{len(keys)} keys, {users} users")
+        for name, timings in results.items():
+            self.stdout.write(
+                f"{name}: "
+                + ", ".join(
+                    (
+                        f"{operation} {timing / len(keys) * 1000:.3f}ms/key"
+                        if operation != "invalidate"
+                        else f"{operation} {timing / users * 1000:.3f}ms/prefix"
+                    )
+                    for operation, timing in timings.items()
+                )
+            )
+        if "database" in results:
+            for name, timings in results.items():
+                if name == "database":
+                    continue
+                speedup = {
+                    operation: results["database"][operation] / timing
+                    for operation, timing in timings.items()
+                }
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{name} speedup: "
+                        + ", ".join(
+                            f"{operation} {value:.1f}x"
+                            for operation, value in speedup.items()
+                        )
+                    )
+                )
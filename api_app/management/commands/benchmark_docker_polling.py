@@ -0,0 +1,143 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import json
+import secrets
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management import BaseCommand
+
+from api_app.analyzers_manager.classes import DockerBasedAnalyzer, ObservableAnalyzer
+from api_app.choices import Status
+
+
+class _StubIntegration(ThreadingHTTPServer):
+    """
+    Answers like a Flask-Shell2HTTP integration,
+    running every command for ``duration`` seconds
+    """
+
+    daemon_threads = True
+
+    def __init__(self, duration: float, long_polling: bool):
+        self.duration = duration
+        self.long_polling = long_polling
+        self.started = {}
+        self.polls = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/run"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _answer(self, data: dict, status: int = 200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        key = secrets.token_hex(8)
+        self.server.started[key] = time.monotonic()
+        self._answer({"key": key, "status": "running"}, 202)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        key = query["key"][0]
+        with self.server.lock:
+            self.server.polls += 1
+        ready_at = self.server.started[key] + self.server.duration
+        if self.server.long_polling and "wait_timeout" in query:
+            wait = float(query["wait_timeout"][0])
+            time.sleep(max(0, min(ready_at - time.monotonic(), wait)))
+        if time.monotonic() < ready_at:
+            self._answer({"key": key, "status": "running"})
+        else:
+            self._answer({"key": key, "status": "success", "report": {"ok": True}})
+
+
+class _BenchmarkAnalyzer(ObservableAnalyzer, DockerBasedAnalyzer):
+    name = "benchmark"
+    max_tries = 60
+    poll_distance = 5
+    _job = types.SimpleNamespace(STATUSES=Status)
+
+    def run(self):
+        return self._docker_run({"args": []})
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the polling of the docker based analyzers against a stub"
+        " integration running in process: polls sent for every job and seconds"
+        " waited after the result was ready, polling every poll_distance seconds"
+        " like before, with an interval growing up to poll_distance"
+        " and with long polling"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--jobs", type=int, default=20, help="Number of concurrent jobs"
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=3.5,
+            help="Seconds every analysis takes in the integration",
+        )
+        parser.add_argument(
+            "--poll-distance",
+            type=int,
+            default=5,
+            help="poll_distance of the analyzer",
+        )
+
+    @staticmethod
+    def _run(jobs: int, duration: float, poll_distance: int, mode: str):
+        server = _StubIntegration(duration, long_polling=mode == "long polling")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        analyzer = _BenchmarkAnalyzer(None)
+        analyzer.url = server.url
+        analyzer.poll_distance = poll_distance
+        if mode == "fixed interval":
+            analyzer.min_poll_distance = poll_distance
+
+        def run(_):
+            start = time.perf_counter()
+            analyzer.run()
+            return time.perf_counter() - start
+
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                elapsed = list(pool.map(run, range(jobs)))
+        finally:
+            server.shutdown()
+            server.server_close()
+        return server.polls / jobs, sum(elapsed) / jobs - duration
+
+    def handle(self, *args, **options):
+        for mode in ["fixed interval", "growing interval", "long polling"]:
+            polls, latency = self._run(
+                options["jobs"], options["duration"], options["poll_distance"], mode
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{mode}: {polls:.1f} polls/job,"
+                    f" {latency:.2f}s waited after the result was ready"
+                )
+            )
@@ -0,0 +1,68 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import ipaddress
+import os
+import random
+import tempfile
+import timeit
+
+from django.core.management import BaseCommand
+
+from api_app.analyzers_manager.feeds import FeedStore
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the lookups of the FeedStore against"
+        " the read and scan of the whole feed on every run"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--entries", type=int, default=200_000, help="Number of lines of the feed"
+        )
+        parser.add_argument(
+            "--lookups", type=int, default=200, help="Number of lookups to execute"
+        )
+
+    def handle(self, *args, **options):
+        entries = options["entries"]
+        lookups = options["lookups"]
+        ips = [
+            str(ipaddress.IPv4Address(random.getrandbits(32))) for _ in range(entries)
+        ]
+        observables = random.choices(ips, k=lookups // 2) + [
+            str(ipaddress.IPv4Address(random.getrandbits(32)))
+            for _ in range(lookups - lookups // 2)
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "feed.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(ips))
+
+            def file_scan():
+                for observable in observables:
+                    with open(path, "r", encoding="utf-8") as f:
+                        db = f.read()
+                    _ = observable in db.split("\n")
+
+            def feed_store():
+                for observable in observables:
+                    _ = observable in FeedStore.lines(path)
+
+            FeedStore.invalidate(path)
+            scan_time = timeit.timeit(file_scan, number=1)
+            store_time = timeit.timeit(feed_store, number=1)
+            FeedStore.invalidate(path)
+
+        self.stdout.write(f"{entries} entries, {lookups} lookups")
+        self.stdout.write(
+            f"file scan: {scan_time:.4f}s ({scan_time / lookups * 1000:.3f}ms/lookup)"
+        )
+        self.stdout.write(
+            f"feed store: {store_time:.4f}s ({store_time / lookups * 1000:.3f}ms/lookup)"
+        )
+        self.stdout.write(self.style.SUCCESS(f"speedup: {scan_time / store_time:.1f}x"))
@@ -0,0 +1,131 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management import BaseCommand
+from django.test import override_settings
+
+from api_app.http_client import HTTPClient
+
+
+class _StubService(ThreadingHTTPServer):
+    """
+    Third party service answering every request after ``latency`` seconds,
+    counting the connections opened by the clients
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # keep-alive
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = b'{"data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the requests of the plugins against a stub service running"
+        " in process: a new connection for every request like before,"
+        " the keep-alive connections of the HTTP client"
+        " and the HTTP client with a rate limit"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Number of requests"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=8, help="Number of concurrent plugins"
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds every answer takes"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=50,
+            help="Requests per second allowed by the rate limit",
+        )
+        parser.add_argument(
+            "--redis",
+            type=str,
+            default="",
+            help="Redis URL of the rate limit, kept in the process if empty",
+        )
+
+    @staticmethod
+    def _run(requests_number: int, concurrency: int, latency: float, get):
+        server = _StubService(latency)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                for response in pool.map(
+                    lambda _: get(server.url), range(requests_number)
+                ):
+                    response.raise_for_status()
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+        return elapsed, server.connections
+
+    def handle(self, *args, **options):
+        number = options["requests"]
+        rate_limits = {"benchmark_limited": (options["rate"], 1.0)}
+        with override_settings(
+            HTTP_RATE_LIMITS=rate_limits,
+            HTTP_RATE_LIMIT_REDIS_URL=options["redis"],
+            HTTP_RATE_LIMIT_MAX_WAIT=number / options["rate"] + 1,
+        ):
+            for name, get in [
+                ("new connections", requests.get),
+                ("keep-alive", HTTPClient("benchmark").get),
+                (
+                    f"keep-alive, {options['rate']:.0f} requests/s",
+                    HTTPClient("benchmark_limited", f"{time.time()}").get,
+                ),
+            ]:
+                elapsed, connections = self._run(
+                    number, options["concurrency"], options["latency"], get
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{name}: {number} requests in {elapsed:.2f}s"
+                        f" ({number / elapsed:.0f} requests/s),"
+                        f" {connections} connections"
+                    )
+                )
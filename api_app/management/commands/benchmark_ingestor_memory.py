@@ -0,0 +1,85 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import base64
+import os
+import tracemalloc
+from collections import deque
+from unittest.mock import patch
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from api_app.choices import TLP
+from api_app.ingestors_manager.models import IngestorConfig
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the peak memory of an ingestor run fed by a fake feed of samples,"
+        " collecting every sample before creating the jobs like before"
+        " and streaming them in batches."
+        " The job creation is replaced by reading the samples"
+        " and the reports are created inside a transaction that is rolled back"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("ingestor", type=str, help="Name of the ingestor config")
+        parser.add_argument(
+            "--samples", type=int, default=200, help="Number of samples of the feed"
+        )
+        parser.add_argument(
+            "--size", type=int, default=1024 * 1024, help="Bytes of every sample"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10, help="Jobs batch size"
+        )
+
+    @staticmethod
+    def _feed(samples: int, size: int):
+        for _ in range(samples):
+            yield os.urandom(size)
+
+    @staticmethod
+    def _create_jobs(value, *args, **kwargs):
+        for sample in value:
+            yield len(sample)
+
+    @staticmethod
+    def _collect_all(ingestor, config, content):
+        content = list(content)
+        ingestor.report.report = [
+            base64.b64encode(sample).decode("utf-8") for sample in content
+        ]
+        ingestor.report.save(update_fields=["report"])
+        deque(
+            config.create_jobs(
+                content, TLP.CLEAR.value, config.user, playbook_to_execute=None
+            ),
+            maxlen=0,
+        )
+
+    def handle(self, *args, **options):
+        config = IngestorConfig.objects.get(name=options["ingestor"])
+        config.jobs_batch_size = options["batch_size"]
+        for name in ["collect all", "streaming"]:
+            with transaction.atomic(), patch.object(
+                IngestorConfig, "create_jobs", side_effect=self._create_jobs
+            ):
+                ingestor = config.python_module.python_class(config)
+                ingestor.report = config.generate_empty_report(
+                    None, None, ingestor.report_model.STATUSES.RUNNING.value
+                )
+                content = self._feed(options["samples"], options["size"])
+                tracemalloc.start()
+                if name == "streaming":
+                    ingestor.after_run_success(content)
+                else:
+                    self._collect_all(ingestor, config, content)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                transaction.set_rollback(True)
+            self.stdout.write(
+                self.style.SUCCESS(f"{name}: peak {peak / 1024 / 1024:.1f} MiB")
+            )
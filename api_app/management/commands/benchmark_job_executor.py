@@ -0,0 +1,99 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from api_app.analyzables_manager.models import Analyzable
+from api_app.analyzers_manager.models import AnalyzerConfig
+from api_app.models import Job
+from certego_saas.apps.user.models import User
+from intel_owl.celery import get_queue_name
+from intel_owl.tasks import job_pipeline
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the end-to-end latency of jobs run with the chain executor"
+        " and with the event executor. Requires running celery workers"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("user", type=str, help="Username owning the jobs")
+        parser.add_argument(
+            "--analyzers",
+            nargs="+",
+            default=["Classic_DNS"],
+            help="Analyzers to execute in every job",
+        )
+        parser.add_argument("--observable", type=str, default="google.com")
+        parser.add_argument("--classification", type=str, default="domain")
+        parser.add_argument(
+            "--jobs", type=int, default=10, help="Number of jobs for every executor"
+        )
+        parser.add_argument(
+            "--timeout", type=int, default=120, help="Seconds to wait for every job"
+        )
+        parser.add_argument(
+            "--executors",
+            nargs="+",
+            default=[Job.EXECUTOR_CHAIN, Job.EXECUTOR_EVENT],
+            choices=[Job.EXECUTOR_CHAIN, Job.EXECUTOR_EVENT],
+        )
+
+    def _run_job(self, user, analyzable, analyzers, executor: str, timeout: int):
+        job = Job.objects.create(user=user, analyzable=analyzable)
+        job.analyzers_to_execute.set(analyzers)
+        start = time.perf_counter()
+        job_pipeline.apply_async(
+            args=[job.pk],
+            kwargs={"executor": executor},
+            queue=get_queue_name(settings.DEFAULT_QUEUE),
+            MessageGroupId=str(uuid.uuid4()),
+        )
+        final_statuses = Job.STATUSES.final_statuses()
+        try:
+            while time.perf_counter() - start < timeout:
+                job.refresh_from_db(fields=["status"])
+                if job.status in final_statuses:
+                    return time.perf_counter() - start
+                time.sleep(0.05)
+            raise CommandError(f"Job {job.pk} not completed in {timeout} seconds")
+        finally:
+            job.delete()
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options["user"])
+        analyzers = list(AnalyzerConfig.objects.filter(name__in=options["analyzers"]))
+        if len(analyzers) != len(options["analyzers"]):
+            raise CommandError(f"Analyzers {options['analyzers']} not found")
+        analyzable, _ = Analyzable.objects.get_or_create(
+            name=options["observable"], classification=options["classification"]
+        )
+        results = {}
+        for executor in options["executors"]:
+            results[executor] = [
+                self._run_job(user, analyzable, analyzers, executor, options["timeout"])
+                for _ in range(options["jobs"])
+            ]
+
+        self.stdout.write(
+            f"{options['jobs']} jobs with analyzers {', '.join(options['analyzers'])}"
+        )
+        for executor, timings in results.items():
+            self.stdout.write(
+                f"{executor}: mean {statistics.mean(timings):.3f}s,"
+                f" median {statistics.median(timings):.3f}s,"
+                f" max {max(timings):.3f}s"
+            )
+        if len(results) == 2:
+            chain, event = (
+                statistics.median(results[executor])
+                for executor in (Job.EXECUTOR_CHAIN, Job.EXECUTOR_EVENT)
+            )
+            self.stdout.write(self.style.SUCCESS(f"speedup {chain / event:.2f}x"))
@@ -0,0 +1,98 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import hashlib
+import random
+import statistics
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+
+from api_app.analyzables_manager.models import Analyzable
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the analyzable searches served by the trigram and hash indexes"
+        " against sequential scans, on a synthetic dataset."
+        " The dataset is created inside a transaction that is rolled back"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--rows", type=int, default=5_000_000, help="Number of analyzables"
+        )
+        parser.add_argument(
+            "--lookups", type=int, default=20, help="Number of searches of every kind"
+        )
+
+    @staticmethod
+    def _populate(rows: int):
+        # names, mimetypes and hashes are computed by postgres
+        # to avoid sending millions of rows from python
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Analyzable._meta.db_table}
+                (name, discovery_date, classification, mimetype, md5, sha1, sha256)
+                SELECT 'host' || i || '.' || md5('name' || i) || '.com',
+                       now(),
+                       'domain',
+                       'application/x-bench-' || (i % 100),
+                       md5('bench' || i),
+                       left(encode(sha256(('sha1' || i)::bytea), 'hex'), 40),
+                       encode(sha256(('bench' || i)::bytea), 'hex')
+                FROM generate_series(1, %s) AS i
+                """,
+                [rows],
+            )
+            cursor.execute(f"ANALYZE {Analyzable._meta.db_table}")
+
+    @staticmethod
+    def _time(queryset, sequential: bool) -> float:
+        with connection.cursor() as cursor:
+            value = "off" if sequential else "on"
+            cursor.execute(f"SET LOCAL enable_indexscan = {value}")
+            cursor.execute(f"SET LOCAL enable_bitmapscan = {value}")
+        start = time.perf_counter()
+        list(queryset[:100])
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        numbers = random.sample(range(1, rows + 1), options["lookups"])
+
+        def md5(value: str) -> str:
+            return hashlib.md5(value.encode()).hexdigest()
+
+        searches = {
+            "name contains": lambda i: Analyzable.objects.filter_contains(
+                "name", md5(f"name{i}")[4:16].upper()
+            ),
+            "md5 contains": lambda i: Analyzable.objects.filter_contains(
+                "md5", md5(f"bench{i}")[8:20]
+            ),
+            "md5 full": lambda i: Analyzable.objects.filter_contains(
+                "md5", md5(f"bench{i}")
+            ),
+            "sha256 full": lambda i: Analyzable.objects.filter_contains(
+                "md5", hashlib.sha256(f"bench{i}".encode()).hexdigest()
+            ),
+        }
+        self.stdout.write(f"Creating {rows} analyzables")
+        with transaction.atomic():
+            self._populate(rows)
+            self.stdout.write(f"{rows} analyzables, {len(numbers)} searches each")
+            for search, get_queryset in searches.items():
+                scan = [self._time(get_queryset(i), sequential=True) for i in numbers]
+                index = [self._time(get_queryset(i), sequential=False) for i in numbers]
+                self.stdout.write(
+                    f"{search}: sequential scan {statistics.median(scan) * 1000:.1f}ms,"
+                    f" index {statistics.median(index) * 1000:.1f}ms "
+                    + self.style.SUCCESS(
+                        f"({statistics.median(scan) / statistics.median(index):.1f}x)"
+                    )
+                )
+            transaction.set_rollback(True)
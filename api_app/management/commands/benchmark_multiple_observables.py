@@ -0,0 +1,99 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import time
+import types
+import uuid
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from api_app.serializers.job import ObservableAnalysisSerializer
+from certego_saas.apps.user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the throughput of the multiple observables submission,"
+        " comparing the batched creation with the creation of one job at a time."
+        " The jobs are created inside a transaction that is rolled back"
+        " and no task is sent"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("user", type=str, help="Username submitting the jobs")
+        parser.add_argument(
+            "--observables",
+            type=int,
+            default=200,
+            help="Number of observables of every submission",
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=5, help="Number of submissions"
+        )
+        parser.add_argument(
+            "--analyzers", nargs="+", default=["Classic_DNS"], help="Analyzers names"
+        )
+        parser.add_argument(
+            "--repeated",
+            type=float,
+            default=0.5,
+            help="Fraction of observables already analyzed in the previous round",
+        )
+
+    @staticmethod
+    def _observables(number: int, previous: list, repeated: float) -> list:
+        reused = previous[: int(number * repeated)]
+        return reused + [
+            f"{uuid.uuid4().hex[:12]}.bench.com" for _ in range(number - len(reused))
+        ]
+
+    @staticmethod
+    def _submit_batch(request, names, analyzers) -> float:
+        start = time.perf_counter()
+        serializer = ObservableAnalysisSerializer(
+            data={
+                "observables": [["domain", name] for name in names],
+                "analyzers_requested": analyzers,
+            },
+            many=True,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _submit_one_by_one(request, names, analyzers) -> float:
+        start = time.perf_counter()
+        for name in names:
+            serializer = ObservableAnalysisSerializer(
+                data={"observable_name": name, "analyzers_requested": analyzers},
+                context={"request": request},
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        request = types.SimpleNamespace(user=User.objects.get(username=options["user"]))
+        number = options["observables"]
+        for name, submit in [
+            ("one by one", self._submit_one_by_one),
+            ("batched", self._submit_batch),
+        ]:
+            elapsed = 0
+            names = []
+            with transaction.atomic():
+                for _ in range(options["rounds"]):
+                    names = self._observables(number, names, options["repeated"])
+                    elapsed += submit(request, names, options["analyzers"])
+                transaction.set_rollback(True)
+            total = number * options["rounds"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {total} observables in {elapsed:.2f}s"
+                    f" ({total / elapsed:.0f} observables/s)"
+                )
+            )
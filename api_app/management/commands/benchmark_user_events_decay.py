@@ -0,0 +1,124 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import datetime
+import ipaddress
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+
+from api_app.data_model_manager.models import IPDataModel
+from api_app.user_events_manager.choices import DecayProgressionEnum
+from api_app.user_events_manager.models import UserIPWildCardEvent
+from certego_saas.apps.user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the decay of the user events, comparing the set-based update"
+        " with the previous update of every event in python."
+        " The events are created inside a transaction that is rolled back"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("user", type=str, help="Username owning the events")
+        parser.add_argument(
+            "--events", type=int, default=1_000_000, help="Number of events to decay"
+        )
+        parser.add_argument(
+            "--loop-events",
+            type=int,
+            default=10_000,
+            help="Number of events decayed one by one for the comparison",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    @staticmethod
+    def _populate(user: User, events: int, batch_size: int):
+        start_ip = int(ipaddress.IPv4Address("10.0.0.0"))
+        next_decay = now() - datetime.timedelta(days=1)
+        for offset in range(0, events, batch_size):
+            size = min(batch_size, events - offset)
+            data_models = IPDataModel.objects.bulk_create(
+                [IPDataModel(reliability=10) for _ in range(size)]
+            )
+            UserIPWildCardEvent.objects.bulk_create(
+                [
+                    UserIPWildCardEvent(
+                        user=user,
+                        start_ip=str(ipaddress.IPv4Address(start_ip + offset + i)),
+                        end_ip=str(ipaddress.IPv4Address(start_ip + offset + i)),
+                        data_model=data_model,
+                        decay_progression=(
+                            DecayProgressionEnum.LINEAR.value
+                            if i % 2
+                            else DecayProgressionEnum.INVERSE_EXPONENTIAL.value
+                        ),
+                        decay_timedelta_days=3,
+                        next_decay=next_decay,
+                    )
+                    for i, data_model in enumerate(data_models)
+                ]
+            )
+
+    @staticmethod
+    def _decay_loop(queryset) -> int:
+        # the previous implementation, with two saves for every event
+        objects = queryset.exclude(
+            decay_progression=DecayProgressionEnum.FIXED.value
+        ).filter(next_decay__lte=now())
+        number = 0
+        for obj in objects:
+            obj.decay_times += 1
+            obj.data_model.reliability -= 1
+            if obj.data_model.reliability == 0:
+                obj.next_decay = None
+            elif obj.decay_progression == DecayProgressionEnum.LINEAR.value:
+                obj.next_decay += datetime.timedelta(days=obj.decay_timedelta_days)
+            else:
+                obj.next_decay += datetime.timedelta(
+                    days=obj.decay_timedelta_days ** (obj.decay_times + 1)
+                )
+            obj.data_model.save()
+            obj.save()
+            number += 1
+        return number
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options["user"])
+        events = options["events"]
+        loop_events = min(options["loop_events"], events)
+        with transaction.atomic():
+            self.stdout.write(f"Creating {events} events")
+            self._populate(user, events, options["batch_size"])
+            pks = list(
+                UserIPWildCardEvent.objects.filter(user=user)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:loop_events]
+            )
+
+            with transaction.atomic():
+                start = time.perf_counter()
+                self._decay_loop(UserIPWildCardEvent.objects.filter(pk__in=pks))
+                loop_time = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+            start = time.perf_counter()
+            decayed = UserIPWildCardEvent.objects.filter(user=user).decay()
+            set_time = time.perf_counter() - start
+            transaction.set_rollback(True)
+
+        loop_rate = loop_events / loop_time
+        set_rate = decayed / set_time
+        self.stdout.write(
+            f"python loop: {loop_events} events in {loop_time:.2f}s"
+            f" ({loop_rate:.0f} events/s, {events / loop_rate:.1f}s estimated"
+            f" for {events} events)"
+        )
+        self.stdout.write(
+            f"set-based: {decayed} events in {set_time:.2f}s ({set_rate:.0f} events/s)"
+        )
+        self.stdout.write(self.style.SUCCESS(f"speedup: {set_rate / loop_rate:.1f}x"))
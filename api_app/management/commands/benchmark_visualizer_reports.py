@@ -0,0 +1,71 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import time
+
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api_app.analyzers_manager.models import AnalyzerReport
+from api_app.visualizers_manager.classes import Visualizer
+from api_app.visualizers_manager.models import VisualizerConfig
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time and the queries a visualizer takes to load"
+        " the analyzer reports it reads for a job:"
+        " every whole report with its own query like before"
+        " and the paths declared by the visualizer with a single query"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("visualizer", type=str, help="Name of the visualizer")
+        parser.add_argument("job", type=int, help="Id of the job")
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Number of loads of every mode"
+        )
+
+    @staticmethod
+    def _whole_reports(visualizer: Visualizer):
+        for config_name in visualizer.analyzer_reports_paths:
+            try:
+                visualizer.get_analyzer_reports().get(config__name=config_name)
+            except AnalyzerReport.DoesNotExist:
+                pass
+
+    @staticmethod
+    def _projected_reports(visualizer: Visualizer):
+        visualizer.__dict__.pop("_projected_analyzer_reports", None)
+        for config_name in visualizer.analyzer_reports_paths:
+            try:
+                visualizer.get_analyzer_report(config_name)
+            except AnalyzerReport.DoesNotExist:
+                pass
+
+    def handle(self, *args, **options):
+        config = VisualizerConfig.objects.get(name=options["visualizer"])
+        visualizer = config.python_module.python_class(config)
+        visualizer.job_id = options["job"]
+        if not visualizer.analyzer_reports_paths:
+            self.stderr.write(f"{config.name} does not declare analyzer_reports_paths")
+            return
+        # the job is loaded once
+        visualizer._job
+        for name, load in [
+            ("whole reports", self._whole_reports),
+            ("projected reports", self._projected_reports),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    load(visualizer)
+                elapsed = (time.perf_counter() - start) / options["repeat"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {elapsed * 1000:.1f}ms,"
+                    f" {len(queries) // options['repeat']} queries for every load"
+                )
+            )
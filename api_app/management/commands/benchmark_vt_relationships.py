@@ -0,0 +1,138 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import json
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.test import override_settings
+
+from api_app.analyzers_manager.models import AnalyzerConfig
+from api_app.analyzers_manager.observable_analyzers.vt.vt3_get import VirusTotalv3
+
+RELATIONSHIPS = [
+    "behaviours",
+    "bundled_files",
+    "comments",
+    "contacted_domains",
+    "contacted_ips",
+    "contacted_urls",
+    "execution_parents",
+    "dropped_files",
+]
+
+
+class _StubVirusTotal(ThreadingHTTPServer):
+    """
+    VirusTotal API answering every request after ``latency`` seconds
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/api/v3/"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = json.dumps({"data": [{"id": self.path}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time a VirusTotal analyzer takes to request the relationships,"
+        " the behaviour summary and the sigma analyses of a file report"
+        " from a stub VirusTotal API running in process, one at a time like before"
+        " and concurrently"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.3,
+            help="Seconds every answer of the stub API takes",
+        )
+        parser.add_argument(
+            "--reports", type=int, default=5, help="Number of reports of every mode"
+        )
+
+    @staticmethod
+    def _fetch(analyzer: VirusTotalv3, observable_name: str) -> dict:
+        # the requests sent by _vt_get_report after the report of the file
+        result = {
+            "data": {
+                "relationships": {
+                    relationship: {"data": [{"id": relationship}]}
+                    for relationship in RELATIONSHIPS + ["sigma_analysis"]
+                }
+            }
+        }
+        fetches = {
+            "behaviour_summary": partial(
+                analyzer._vt_include_behaviour_summary, result, observable_name
+            ),
+            "sigma_analyses": partial(
+                analyzer._vt_include_sigma_analyses, result, observable_name
+            ),
+            **analyzer._vt_relationships_to_fetch(
+                observable_name, RELATIONSHIPS, f"files/{observable_name}", result
+            ),
+        }
+        analyzer._vt_fetch_concurrently(result, fetches)
+        return result
+
+    def handle(self, *args, **options):
+        server = _StubVirusTotal(options["latency"])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        analyzer = VirusTotalv3(
+            AnalyzerConfig.objects.get(name="VirusTotal_v3_Get_File")
+        )
+        analyzer.url = server.url
+        analyzer._api_key_name = "benchmark"
+        analyzer.relationships_to_request = RELATIONSHIPS
+        analyzer.relationships_elements = 1
+        try:
+            for concurrency in sorted(
+                {1, settings.VT_MAX_CONCURRENT_REQUESTS, len(RELATIONSHIPS) + 2}
+            ):
+                with override_settings(VT_MAX_CONCURRENT_REQUESTS=concurrency):
+                    start = time.perf_counter()
+                    for i in range(options["reports"]):
+                        result = self._fetch(analyzer, f"{i:032x}")
+                    elapsed = (time.perf_counter() - start) / options["reports"]
+                errors = [
+                    key
+                    for key, value in result.items()
+                    if isinstance(value, dict) and "error" in value
+                ]
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{concurrency} concurrent requests:"
+                        f" {elapsed:.2f}s for every report, errors {errors}"
+                    )
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
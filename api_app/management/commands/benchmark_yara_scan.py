@@ -0,0 +1,60 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import time
+from pathlib import PosixPath
+
+from django.core.management import BaseCommand, CommandError
+
+from api_app.analyzers_manager.file_analyzers.yara_scan import YaraRepo, rules_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the yara scan throughput of a rules directory,"
+        " loading the compiled rules for every scan like before the rules cache"
+        " and reusing the rules kept in memory by the worker"
+    )
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "directory", type=str, help="Directory of a downloaded yara repository"
+        )
+        parser.add_argument("file", type=str, help="Sample to scan")
+        parser.add_argument(
+            "--scans", type=int, default=20, help="Number of scans of every mode"
+        )
+
+    @staticmethod
+    def _scan(directory: PosixPath, file: str, scans: int, cached: bool) -> float:
+        start = time.perf_counter()
+        for _ in range(scans):
+            if not cached:
+                rules_cache.clear()
+            # a new repo for every scan, like the analyzer does for every job
+            YaraRepo("", directory=directory).analyze(file, PosixPath(file).name)
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        directory = PosixPath(options["directory"])
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory")
+        scans = options["scans"]
+        start = time.perf_counter()
+        YaraRepo("", directory=directory).compile()
+        self.stdout.write(f"compile: {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        YaraRepo("", directory=directory).compile()
+        self.stdout.write(
+            f"compile without changes: {time.perf_counter() - start:.2f}s"
+        )
+        for name, cached in [("load every scan", False), ("rules cache", True)]:
+            elapsed = self._scan(directory, options["file"], scans, cached)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {scans} scans in {elapsed:.2f}s"
+                    f" ({scans / elapsed:.1f} scans/s)"
+                )
+            )
+        self.stdout.write(f"rules in memory: {rules_cache.size} bytes")
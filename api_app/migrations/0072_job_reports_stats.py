@@ -0,0 +1,62 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def migrate(apps, schema_editor):
+    Job = apps.get_model("api_app", "Job")
+    report_models = [
+        apps.get_model("analyzers_manager", "AnalyzerReport"),
+        apps.get_model("connectors_manager", "ConnectorReport"),
+        apps.get_model("visualizers_manager", "VisualizerReport"),
+    ]
+    # the finished jobs do not need their counters anymore
+    for job in Job.objects.exclude(
+        status__in=["reported_without_fails", "reported_with_fails", "killed", "failed"]
+    ):
+        stats = {"all": 0, "success": 0, "failed": 0, "killed": 0}
+        for report_model in report_models:
+            partial_stats = report_model.objects.filter(job=job).aggregate(
+                all=Count("pk"),
+                success=Count("pk", filter=Q(status="SUCCESS")),
+                failed=Count("pk", filter=Q(status="FAILED")),
+                killed=Count("pk", filter=Q(status="KILLED")),
+            )
+            for key in stats:
+                stats[key] += partial_stats[key]
+        Job.objects.filter(pk=job.pk).update(
+            **{f"reports_{key}": value for key, value in stats.items()}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_app", "0071_delete_last_elastic_report"),
+        ("analyzers_manager", "0170_update_yaraify_archive"),
+        ("connectors_manager", "0032_more_params_emails"),
+        ("visualizers_manager", "0040_visualizer_config_data_model"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="reports_all",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="reports_success",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="reports_failed",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="reports_killed",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(migrate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_app", "0072_job_reports_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobStage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=32)),
+                (
+                    "status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("analyzers_running", "analyzers_running"),
+                            ("analyzers_completed", "analyzers_completed"),
+                            ("connectors_running", "connectors_running"),
+                            ("connectors_completed", "connectors_completed"),
+                            ("pivots_running", "pivots_running"),
+                            ("pivots_completed", "pivots_completed"),
+                            ("visualizers_running", "visualizers_running"),
+                            ("visualizers_completed", "visualizers_completed"),
+                            ("reported_without_fails", "reported_without_fails"),
+                            ("reported_with_fails", "reported_with_fails"),
+                            ("killed", "killed"),
+                            ("failed", "failed"),
+                        ],
+                        default=None,
+                        max_length=32,
+                        null=True,
+                    ),
+                ),
+                (
+                    "dependencies",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=32),
+                        blank=True,
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("tasks", models.JSONField(default=list)),
+                ("remaining", models.IntegerField(default=0)),
+                ("dispatched", models.BooleanField(default=False)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stages",
+                        to="api_app.job",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("job", "name")},
+            },
+        ),
+    ]
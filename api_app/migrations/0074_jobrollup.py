@@ -0,0 +1,135 @@
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Trunc
+
+
+def migrate(apps, schema_editor):
+    Job = apps.get_model("api_app", "Job")
+    JobRollup = apps.get_model("api_app", "JobRollup")
+    rows = (
+        Job.objects.filter(
+            status__in=[
+                "reported_without_fails",
+                "reported_with_fails",
+                "killed",
+                "failed",
+            ]
+        )
+        .order_by()
+        .annotate(
+            bucket=Trunc("received_request_time", "hour", tzinfo=datetime.timezone.utc)
+        )
+        .values(
+            "bucket",
+            "user_id",
+            "status",
+            "tlp",
+            classification=F("analyzable__classification"),
+            mimetype=F("analyzable__mimetype"),
+            playbook_id=F("playbook_to_execute_id"),
+        )
+        .annotate(count=Count("pk"))
+    )
+    JobRollup.objects.bulk_create(
+        [JobRollup(**row) for row in rows.iterator()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("playbooks_manager", "0059_add_ipquery_analyzer_free_to_use"),
+        ("api_app", "0073_jobstage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("analyzers_running", "analyzers_running"),
+                            ("analyzers_completed", "analyzers_completed"),
+                            ("connectors_running", "connectors_running"),
+                            ("connectors_completed", "connectors_completed"),
+                            ("pivots_running", "pivots_running"),
+                            ("pivots_completed", "pivots_completed"),
+                            ("visualizers_running", "visualizers_running"),
+                            ("visualizers_completed", "visualizers_completed"),
+                            ("reported_without_fails", "reported_without_fails"),
+                            ("reported_with_fails", "reported_with_fails"),
+                            ("killed", "killed"),
+                            ("failed", "failed"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("classification", models.CharField(max_length=100)),
+                (
+                    "mimetype",
+                    models.CharField(
+                        blank=True, default=None, max_length=80, null=True
+                    ),
+                ),
+                (
+                    "tlp",
+                    models.CharField(
+                        choices=[
+                            ("CLEAR", "Clear"),
+                            ("GREEN", "Green"),
+                            ("AMBER", "Amber"),
+                            ("RED", "Red"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "playbook",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="playbooks_manager.playbookconfig",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["bucket", "user"],
+                        name="api_app_job_bucket_2ff931_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(migrate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api_app", "0074_jobrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobstage",
+            name="dispatched_at",
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -5,11 +5,14 @@ import os
 import pathlib
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Tuple
 from zipfile import ZipFile
 
 import requests
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 from jbxapi import ApiError, JoeSandbox
@@ -19,6 +22,7 @@ from api_app.analyzers_manager.classes import BaseAnalyzerMixin
 from api_app.analyzers_manager.exceptions import AnalyzerRunException
 from api_app.analyzers_manager.models import AnalyzerRulesFileVersion, PythonModule
 from api_app.choices import Classification
+from api_app.http_client import HTTPClient
 from certego_saas.ext.pagination import CustomPageNumberPagination
 
 logger = logging.getLogger(__name__)
@@ -95,6 +99,10 @@ class VirusTotalv3BaseMixin(metaclass=abc.ABCMeta):
     def headers(self) -> dict:
         return {"x-apikey": self._api_key_name}
 
+    @property
+    def _vt_client(self) -> HTTPClient:
+        return HTTPClient("virustotal", self._api_key_name)
+
     def _perform_get_request(
         self, uri: str, ignore_404: bool = False, **kwargs
     ) -> Dict:
@@ -118,17 +126,17 @@ class VirusTotalv3BaseMixin(metaclass=abc.ABCMeta):
                     logger.debug(
                         f"about to send get request to url {url} with headers {self.headers} and kwargs: {kwargs}"
                     )
-                    response = requests.get(url, headers=self.headers, **kwargs)
+                    response = self._vt_client.get(url, headers=self.headers, **kwargs)
                 else:
                     logger.debug(
                         f"about to send get request to url {url} with headers {self.headers} and no kwargs"
                     )
-                    response = requests.get(url, headers=self.headers)
+                    response = self._vt_client.get(url, headers=self.headers)
             elif method == "POST":
                 logger.debug(
                     f"about to send post request to url {url} with headers {self.headers} and kwargs: {kwargs}"
                 )
-                response = requests.post(url, headers=self.headers, **kwargs)
+                response = self._vt_client.post(url, headers=self.headers, **kwargs)
             else:
                 raise NotImplementedError()
             logger.info(f"requests done to: {response.request.url} ")
@@ -265,7 +273,7 @@ class VirusTotalv3BaseMixin(metaclass=abc.ABCMeta):
         try:
             endpoint = self.url + f"files/{file_hash}/download"
             logger.info(f"Requesting file from {endpoint}")
-            response = requests.get(endpoint, headers=self.headers)
+            response = self._vt_client.get(endpoint, headers=self.headers)
             if not isinstance(response.content, bytes):
                 raise ValueError("VT downloaded file is not instance of bytes")
         except Exception as e:
@@ -370,13 +378,30 @@ class VirusTotalv3AnalyzerMixin(
             limit = 40
         return limit
 
-    def _vt_get_relationships(
+    def _vt_get_relationship(self, observable_name: str, relationship: str, uri: str):
+        rel_uri = (
+            uri + f"/{relationship}?limit={self._get_relationship_limit(relationship)}"
+        )
+        logger.debug(f"requesting uri: {rel_uri}")
+        try:
+            response = self._vt_client.get(self.url + rel_uri, headers=self.headers)
+            return response.json()
+        except Exception as e:
+            # the other relationships are still returned
+            logger.error(
+                f"something went wrong when extracting relationship {relationship}"
+                f" for observable {observable_name}: {e}"
+            )
+            return {"error": str(e)}
+
+    def _vt_relationships_to_fetch(
         self,
         observable_name: str,
         relationships_requested: list,
         uri: str,
         result: dict,
-    ) -> None:
+    ) -> Dict[str, Callable[[], Dict]]:
+        fetches = {}
         try:
             # skip relationship request if something went wrong
             if "error" not in result:
@@ -398,20 +423,48 @@ class VirusTotalv3AnalyzerMixin(
                                 f"for observable {observable_name}."
                                 " Requesting additional information about"
                             )
-                            rel_uri = (
-                                uri + f"/{relationship}"
-                                f"?limit={self._get_relationship_limit(relationship)}"
-                            )
-                            logger.debug(f"requesting uri: {rel_uri}")
-                            response = requests.get(
-                                self.url + rel_uri, headers=self.headers
+                            fetches[relationship] = partial(
+                                self._vt_get_relationship,
+                                observable_name,
+                                relationship,
+                                uri,
                             )
-                            result[relationship] = response.json()
         except Exception as e:
             logger.error(
                 "something went wrong when extracting relationships"
                 f" for observable {observable_name}: {e}"
             )
+        return fetches
+
+    @staticmethod
+    def _vt_fetch_concurrently(
+        result: dict, fetches: Dict[str, Callable[[], Dict]]
+    ) -> None:
+        """
+        Adds to the result the sub-resources returned by the fetches,
+        requesting at most VT_MAX_CONCURRENT_REQUESTS of them at the same time
+        """
+        if not fetches:
+            return
+        max_workers = min(settings.VT_MAX_CONCURRENT_REQUESTS, len(fetches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {key: executor.submit(fetch) for key, fetch in fetches.items()}
+        for key, future in futures.items():
+            result[key] = future.result()
+
+    def _vt_get_relationships(
+        self,
+        observable_name: str,
+        relationships_requested: list,
+        uri: str,
+        result: dict,
+    ) -> None:
+        self._vt_fetch_concurrently(
+            result,
+            self._vt_relationships_to_fetch(
+                observable_name, relationships_requested, uri, result
+            ),
+        )
 
     def _get_url_prefix_postfix(self, result: Dict) -> Tuple[str, str]:
         uri_postfix = self._job.analyzable.name
@@ -651,25 +704,30 @@ class VirusTotalv3AnalyzerMixin(
             obs_clfn,
         )
 
+        # the additional requests are sent concurrently
+        fetches = {}
         if obs_clfn == Classification.HASH:
             # Include behavioral report, if flag enabled
             # Attention: this will cost additional quota!
             if self.include_behaviour_summary:
-                result["behaviour_summary"] = self._vt_include_behaviour_summary(
-                    result, observable_name
+                fetches["behaviour_summary"] = partial(
+                    self._vt_include_behaviour_summary, result, observable_name
                 )
 
             # Include sigma analysis report, if flag enabled
             # Attention: this will cost additional quota!
             if self.include_sigma_analyses:
-                result["sigma_analyses"] = self._vt_include_sigma_analyses(
-                    result, observable_name
+                fetches["sigma_analyses"] = partial(
+                    self._vt_include_sigma_analyses, result, observable_name
                 )
 
         if self.relationships_to_request:
-            self._vt_get_relationships(
-                observable_name, relationships_requested, uri, result
+            fetches.update(
+                self._vt_relationships_to_fetch(
+                    observable_name, relationships_requested, uri, result
+                )
             )
+        self._vt_fetch_concurrently(result, fetches)
 
         uri_prefix, uri_postfix = self._get_url_prefix_postfix(result)
         result["link"] = f"https://www.virustotal.com/gui/{uri_prefix}/{uri_postfix}"
@@ -1,11 +1,12 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
 import datetime
+import hashlib
 import json
 import logging
 import typing
 import uuid
-from typing import TYPE_CHECKING, Any, Dict, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
@@ -20,7 +21,7 @@ from api_app.interfaces import OwnershipAbstractModel
 if TYPE_CHECKING:
     from api_app.serializers import PythonConfigSerializer
 
-from celery import group
+from celery import group, signature
 from celery.canvas import Signature
 from django.conf import settings
 from django.contrib.postgres import fields as pg_fields
@@ -28,7 +29,13 @@ from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import MinLengthValidator, MinValueValidator, RegexValidator
 from django.db import models
-from django.db.models import BaseConstraint, Q, QuerySet, UniqueConstraint
+from django.db.models import (
+    DEFERRED,
+    BaseConstraint,
+    Q,
+    QuerySet,
+    UniqueConstraint,
+)
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -47,12 +54,14 @@ if typing.TYPE_CHECKING:
     from api_app.classes import Plugin
 
 from api_app.defaults import default_runtime
-from api_app.helpers import deprecated, get_now
+from api_app.helpers import count_queries, deprecated, get_now
 from api_app.queryset import (
     AbstractConfigQuerySet,
     AbstractReportQuerySet,
     CommentQuerySet,
     JobQuerySet,
+    JobRollupQuerySet,
+    JobStageQuerySet,
     OrganizationPluginConfigurationQuerySet,
     ParameterQuerySet,
     PluginConfigQuerySet,
@@ -349,6 +358,8 @@ class Job(MP_Node):
     # constants
     TLP = TLP
     STATUSES = Status
+    EXECUTOR_CHAIN = "chain"
+    EXECUTOR_EVENT = "event"
     investigation = models.ForeignKey(
         "investigations_manager.Investigation",
         on_delete=models.PROTECT,
@@ -448,9 +459,66 @@ class Job(MP_Node):
     data_model_object_id = models.IntegerField(null=True, editable=False, blank=True)
     data_model = GenericForeignKey("data_model_content_type", "data_model_object_id")
 
+    # counters of the analyzer, connector and visualizer reports,
+    # updated by the reports themselves when they reach a final status
+    reports_all = models.IntegerField(default=0, editable=False)
+    reports_success = models.IntegerField(default=0, editable=False)
+    reports_failed = models.IntegerField(default=0, editable=False)
+    reports_killed = models.IntegerField(default=0, editable=False)
+
+    REPORTS_STATS_FIELDS = (
+        "reports_all",
+        "reports_success",
+        "reports_failed",
+        "reports_killed",
+    )
+
+    # status the job had when loaded from the database
+    _loaded_status: Optional[str] = None
+
     def __str__(self):
         return f'{self.__class__.__name__}(#{self.pk}, "{self.analyzable.name}")'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status", DEFERRED)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.status
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the job, keeping the dashboard counters up to date.
+        """
+        previous_status = None if self._state.adding else self._loaded_status
+        if previous_status is DEFERRED:
+            # the status was not loaded with the job
+            previous_status = (
+                Job.objects.filter(pk=self.pk).values_list("status", flat=True).first()
+            )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding and not args:
+            # the report counters are changed atomically by the reports:
+            # a job loaded before would write back their old values
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.REPORTS_STATS_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+        if update_fields is not None and "status" not in update_fields:
+            return
+        if previous_status != self.status:
+            JobRollup.objects.job_status_changed(self, previous_status)
+        self._loaded_status = self.status
+
     def get_root(self):
         if self.is_root():
             return self
@@ -461,6 +529,36 @@ class Job(MP_Node):
             # this is not a really valid solution, but it will work for now
             return self.objects.filter(path=self.path[0 : self.steplen]).first()  # noqa
 
+    @cached_property
+    def root(self) -> "Job":
+        """
+        Return the root of the tree of the job, cached on the instance.
+        """
+        return self.get_root()
+
+    @classmethod
+    def prefetch_roots(cls, jobs: List["Job"]) -> None:
+        """
+        Sets the root, with its investigation, of every job with a single query.
+
+        Args:
+            jobs (List[Job]): The jobs to update.
+        """
+        paths = {job.path[: cls.steplen] for job in jobs if not job.is_root()}
+        roots = {}
+        if paths:
+            roots = {
+                root.path: root
+                for root in cls.objects.filter(path__in=paths).select_related(
+                    "investigation"
+                )
+            }
+        for job in jobs:
+            if job.is_root():
+                job.root = job
+            elif job.path[: cls.steplen] in roots:
+                job.root = roots[job.path[: cls.steplen]]
+
     @cached_property
     def is_sample(self) -> bool:
         return self.analyzable.is_sample
@@ -499,14 +597,11 @@ class Job(MP_Node):
         self.status = self.STATUSES.RUNNING
         self.save(update_fields=["status"])
 
-        runner = self._get_pipeline(
+        self._run_pipeline(
             analyzers=self.analyzerreports.filter_retryable().get_configurations(),
             pivots=self.pivotreports.filter_retryable().get_configurations(),
             connectors=self.connectorreports.filter_retryable().get_configurations(),
             visualizers=self.visualizerreports.filter_retryable().get_configurations(),
-        )
-
-        runner.apply_async(
             queue=get_queue_name(settings.CONFIG_QUEUE),
             MessageGroupId=str(uuid.uuid4()),
             priority=self.priority,
@@ -520,7 +615,7 @@ class Job(MP_Node):
                 f"[REPORT] {self}, status: failed. " "Do not process the report"
             )
         else:
-            stats = self._get_config_reports_stats()
+            stats = self.reports_stats
             logger.info(f"[REPORT] {self}, status:{self.status}, reports:{stats}")
 
             if stats["success"] == stats["all"]:
@@ -560,34 +655,103 @@ class Job(MP_Node):
             self, f"{config.__name__.split('Config')[0].lower()}s_to_execute"
         )
 
-    def __get_single_config_reports_stats(
-        self, config: typing.Type["AbstractConfig"]
-    ) -> typing.Dict:
-        reports = self.__get_config_reports(config)
-        aggregators = {
-            s.lower(): models.Count("status", filter=models.Q(status=s))
-            for s in AbstractReport.STATUSES.values
-        }
-        return reports.aggregate(
-            all=models.Count("status"),
-            **aggregators,
-        )
-
     def _get_config_reports_stats(self) -> typing.Dict:
+        """
+        Counts the analyzer, connector and visualizer reports
+        of the job by status, with a single query.
+        """
         from api_app.analyzers_manager.models import AnalyzerConfig
         from api_app.connectors_manager.models import ConnectorConfig
         from api_app.visualizers_manager.models import VisualizerConfig
 
-        result = {}
-        for config in [AnalyzerConfig, ConnectorConfig, VisualizerConfig]:
-            partial_result = self.__get_single_config_reports_stats(config)
-            # merge them
-            result = {
-                k: result.get(k, 0) + partial_result.get(k, 0)
-                for k in set(result) | set(partial_result)
-            }
+        querysets = [
+            self.__get_config_reports(config)
+            .order_by()
+            .values("status")
+            .annotate(count=models.Count("pk"))
+            for config in [AnalyzerConfig, ConnectorConfig, VisualizerConfig]
+        ]
+        result = {s.lower(): 0 for s in AbstractReport.STATUSES.values}
+        result["all"] = 0
+        for row in querysets[0].union(*querysets[1:], all=True):
+            result[row["status"].lower()] += row["count"]
+            result["all"] += row["count"]
         return result
 
+    @property
+    def reports_stats(self) -> typing.Dict[str, int]:
+        """
+        Report counters of the job, without querying the reports.
+        """
+        return {
+            "all": self.reports_all,
+            **{
+                status.lower(): getattr(self, f"reports_{status.lower()}")
+                for status in ReportStatus.final_statuses()
+            },
+        }
+
+    def refresh_reports_stats(self) -> None:
+        """
+        Recomputes the report counters of the job,
+        after its reports have been created or updated in bulk.
+        """
+        stats = self._get_config_reports_stats()
+        update_fields = []
+        for key in self.reports_stats:
+            setattr(self, f"reports_{key}", stats[key])
+            update_fields.append(f"reports_{key}")
+        self.save(update_fields=update_fields)
+
+    @classmethod
+    def update_reports_stats(
+        cls, job_id: int, previous_status: Optional[str], status: str
+    ) -> None:
+        """
+        Atomically updates the report counters of a job
+        when one of its reports is created or changes status.
+
+        Args:
+            job_id (int): The job of the report.
+            previous_status (Optional[str]): The status the report had,
+                None if the report has just been created.
+            status (str): The new status of the report.
+        """
+        final_statuses = ReportStatus.final_statuses()
+        updates = {}
+        if previous_status is None:
+            updates["reports_all"] = models.F("reports_all") + 1
+        elif previous_status in final_statuses:
+            field = f"reports_{previous_status.lower()}"
+            updates[field] = models.F(field) - 1
+        if status in final_statuses:
+            field = f"reports_{status.lower()}"
+            updates[field] = models.F(field) + 1
+        if updates:
+            cls.objects.filter(pk=job_id).update(**updates)
+
+    def fail_running_reports(self, task_ids: typing.List[str]) -> None:
+        """
+        Fails the reports of the tasks that never ended.
+
+        Args:
+            task_ids (List[str]): The ids of the tasks.
+        """
+        from api_app.analyzers_manager.models import AnalyzerConfig
+        from api_app.connectors_manager.models import ConnectorConfig
+        from api_app.pivots_manager.models import PivotConfig
+        from api_app.visualizers_manager.models import VisualizerConfig
+
+        for config in [AnalyzerConfig, ConnectorConfig, PivotConfig, VisualizerConfig]:
+            self.__get_config_reports(config).filter(
+                task_id__in=task_ids,
+                status__in=[
+                    AbstractReport.STATUSES.PENDING,
+                    AbstractReport.STATUSES.RUNNING,
+                ],
+            ).update(status=AbstractReport.STATUSES.FAILED, end_time=now())
+        self.refresh_reports_stats()
+
     def kill_if_ongoing(self):
         from api_app.analyzers_manager.models import AnalyzerConfig
         from api_app.connectors_manager.models import ConnectorConfig
@@ -612,9 +776,12 @@ class Job(MP_Node):
 
         self.status = self.STATUSES.KILLED
         self.save(update_fields=["status"])
+        self.refresh_reports_stats()
         JobConsumer.serialize_and_send_job(self)
 
-    def _get_signatures(self, queryset: PythonConfigQuerySet) -> Signature:
+    def _get_plugin_signatures(
+        self, queryset: PythonConfigQuerySet, required: bool = True
+    ) -> typing.Optional[typing.List[Signature]]:
         config_class: PythonConfig = queryset.model
         signatures = list(
             queryset.annotate_runnable(self.user)
@@ -622,6 +789,19 @@ class Job(MP_Node):
             .get_signatures(self)
         )
         logger.info(f"{config_class} signatures are {signatures}")
+        # the queryset is evaluated only here,
+        # so we do not need a previous query to check that it is not empty
+        if not signatures and not required:
+            return None
+        return signatures
+
+    def _get_signatures(
+        self, queryset: PythonConfigQuerySet, required: bool = True
+    ) -> typing.Optional[Signature]:
+        config_class: PythonConfig = queryset.model
+        signatures = self._get_plugin_signatures(queryset, required)
+        if signatures is None:
+            return None
 
         return (
             config_class.signature_pipeline_running(self)
@@ -641,6 +821,58 @@ class Job(MP_Node):
             )
         return pivots.annotate_runnable(self.user).filter(runnable=True)
 
+    @cached_property
+    def pivots_to_execute_names(self) -> List[str]:
+        return list(self.pivots_to_execute.values_list("name", flat=True))
+
+    @classmethod
+    def prefetch_pivots_to_execute(cls, jobs: List["Job"]) -> None:
+        """
+        Sets the names of the pivots to execute of every job
+        with one query for every distinct user,
+        instead of one query with correlated subqueries for every job.
+        The plugins to execute of the jobs should be already prefetched.
+
+        Args:
+            jobs (List[Job]): The jobs to update.
+        """
+        from api_app.pivots_manager.models import PivotConfig
+
+        runnable_by_user = {}
+        for job in jobs:
+            if job.user_id not in runnable_by_user:
+                runnable_by_user[job.user_id] = list(
+                    PivotConfig.objects.annotate_runnable(job.user)
+                    .filter(runnable=True)
+                    .many_to_many_to_array("related_analyzer_configs")
+                    .many_to_many_to_array("related_connector_configs")
+                    .values_list(
+                        "pk",
+                        "name",
+                        "related_analyzer_configs_array",
+                        "related_connector_configs_array",
+                    )
+                )
+            runnable = runnable_by_user[job.user_id]
+            if job.playbook_to_execute:
+                playbook_pivots = {
+                    pivot.pk for pivot in job.playbook_to_execute.pivots.all()
+                }
+                names = [name for pk, name, _, _ in runnable if pk in playbook_pivots]
+            else:
+                # same logic of PivotConfigQuerySet.valid
+                analyzers = {analyzer.pk for analyzer in job.analyzers_to_execute.all()}
+                connectors = {
+                    connector.pk for connector in job.connectors_to_execute.all()
+                }
+                names = [
+                    name
+                    for _, name, related_analyzers, related_connectors in runnable
+                    if (not analyzers or set(related_analyzers) <= analyzers)
+                    and (not connectors or set(related_connectors) <= connectors)
+                ]
+            job.pivots_to_execute_names = sorted(set(names))
+
     @property
     def _final_status_signature(self) -> Signature:
         return tasks.job_set_final_status.signature(
@@ -676,34 +908,167 @@ class Job(MP_Node):
         visualizers: PythonConfigQuerySet,
     ) -> Signature:
         runner = self._get_signatures(analyzers.distinct())
-        pivots_analyzers = pivots.filter(
-            related_analyzer_configs__isnull=False
-        ).distinct()
-        if pivots_analyzers.exists():
-            runner |= self._get_signatures(pivots_analyzers)
+        pivots_analyzers = self._get_signatures(
+            pivots.filter(related_analyzer_configs__isnull=False).distinct(),
+            required=False,
+        )
+        if pivots_analyzers is not None:
+            runner |= pivots_analyzers
         runner |= self._get_engine_signature()
-        if connectors.exists():
-            runner |= self._get_signatures(connectors)
-            pivots_connectors = pivots.filter(
-                related_connector_configs__isnull=False
-            ).distinct()
-            if pivots_connectors.exists():
-                runner |= self._get_signatures(pivots_connectors)
-        if visualizers.exists():
-            runner |= self._get_signatures(visualizers)
+        connectors_signature = self._get_signatures(connectors, required=False)
+        if connectors_signature is not None:
+            runner |= connectors_signature
+            pivots_connectors = self._get_signatures(
+                pivots.filter(related_connector_configs__isnull=False).distinct(),
+                required=False,
+            )
+            if pivots_connectors is not None:
+                runner |= pivots_connectors
+        visualizers_signature = self._get_signatures(visualizers, required=False)
+        if visualizers_signature is not None:
+            runner |= visualizers_signature
         runner |= self._final_status_signature
         return runner
 
-    def execute(self):
+    def _create_stages(
+        self,
+        analyzers: PythonConfigQuerySet,
+        pivots: PythonConfigQuerySet,
+        connectors: PythonConfigQuerySet,
+        visualizers: PythonConfigQuerySet,
+    ) -> typing.List["JobStage"]:
+        """
+        Event driven version of `_get_pipeline`.
+
+        Instead of a chain, the pipeline is saved as a set of stages:
+        every stage is dispatched as soon as the stages it depends on
+        are completed, so independent stages run together
+        and no task is needed to update the status between them.
+        """
+        stages = []
+
+        def add_stage(
+            name: str,
+            signatures: typing.Optional[typing.List[Signature]],
+            dependencies: typing.List[str],
+            status: str = None,
+        ):
+            # a stage without tasks would never be completed:
+            # it is not stored and the stages depending on it do not wait for it
+            if not signatures:
+                return
+            names = {stage.name for stage in stages}
+            for task in signatures:
+                # the task notifies its stage when it is finished
+                task.kwargs = {**task.kwargs, "job_stage": name}
+            stages.append(
+                JobStage(
+                    job=self,
+                    name=name,
+                    status=status,
+                    dependencies=[
+                        dependency for dependency in dependencies if dependency in names
+                    ],
+                    tasks=signatures,
+                    remaining=len(signatures),
+                )
+            )
+
+        add_stage(
+            "analyzers",
+            self._get_plugin_signatures(analyzers.distinct()),
+            [],
+            self.STATUSES.ANALYZERS_RUNNING.value,
+        )
+        add_stage(
+            "pivots_analyzers",
+            self._get_plugin_signatures(
+                pivots.filter(related_analyzer_configs__isnull=False).distinct(),
+                required=False,
+            ),
+            ["analyzers"],
+            self.STATUSES.PIVOTS_RUNNING.value,
+        )
+        # like in the chain, the engine waits for the pivots of the analyzers
+        add_stage(
+            "engine", [self._get_engine_signature()], ["analyzers", "pivots_analyzers"]
+        )
+        add_stage(
+            "connectors",
+            self._get_plugin_signatures(connectors, required=False),
+            ["engine"],
+            self.STATUSES.CONNECTORS_RUNNING.value,
+        )
+        if stages[-1].name == "connectors":
+            add_stage(
+                "pivots_connectors",
+                self._get_plugin_signatures(
+                    pivots.filter(related_connector_configs__isnull=False).distinct(),
+                    required=False,
+                ),
+                ["connectors"],
+                self.STATUSES.PIVOTS_RUNNING.value,
+            )
+        # visualizers show the reports of every other plugin
+        add_stage(
+            "visualizers",
+            self._get_plugin_signatures(visualizers, required=False),
+            [stage.name for stage in stages],
+            self.STATUSES.VISUALIZERS_RUNNING.value,
+        )
+        add_stage(
+            "final_status",
+            [self._final_status_signature],
+            [stage.name for stage in stages],
+        )
+        self.stages.all().delete()
+        return JobStage.objects.bulk_create(stages)
+
+    def _run_pipeline(
+        self,
+        analyzers: PythonConfigQuerySet,
+        pivots: PythonConfigQuerySet,
+        connectors: PythonConfigQuerySet,
+        visualizers: PythonConfigQuerySet,
+        executor: str = None,
+        **options,
+    ) -> None:
+        """
+        Runs the plugins of the job.
+
+        Args:
+            executor (str): ``chain`` to run the stages one after the other
+                in a single canvas, ``event`` to dispatch every stage
+                as soon as its dependencies are completed.
+                Default to the JOB_EXECUTOR setting.
+            options: options of the canvas, with the ``chain`` executor.
+        """
+        executor = executor or settings.JOB_EXECUTOR
+        with count_queries() as queries:
+            if executor == self.EXECUTOR_EVENT:
+                self._create_stages(analyzers, pivots, connectors, visualizers)
+            else:
+                runner = self._get_pipeline(analyzers, pivots, connectors, visualizers)
+            # the reports have been created or reset in bulk
+            self.refresh_reports_stats()
+        logger.debug(
+            f"Job {self.pk} {executor} pipeline built with {queries.count} queries"
+        )
+        if executor == self.EXECUTOR_EVENT:
+            JobStage.objects.dispatch_ready(self.pk)
+        else:
+            runner.apply_async(**options)
+
+    def execute(self, executor: str = None):
         self.status = self.STATUSES.RUNNING
         self.save(update_fields=["status"])
-        runner = self._get_pipeline(
+        self._run_pipeline(
             self.analyzers_to_execute.all(),
             self.pivots_to_execute.all(),
             self.connectors_to_execute.all(),
             self.visualizers_to_execute.all(),
+            executor=executor,
         )
-        runner()
 
     def get_user_events_data_model(self) -> BaseDataModelQuerySet:
         return self.analyzable.get_all_user_events_data_model(self.user)
@@ -726,6 +1091,37 @@ class Job(MP_Node):
             config.name, {}
         )
 
+    def get_configs_runtime_configuration(
+        self, configs: typing.List["AbstractConfig"]
+    ) -> typing.Dict[int, typing.Dict]:
+        """
+        Bulk version of `get_config_runtime_configuration`,
+        for configurations of the same class.
+
+        Returns:
+            Dict[int, Dict]: The runtime configuration of every configuration,
+                keyed by primary key.
+        """
+        if not configs:
+            return {}
+        config_class = configs[0].__class__
+        configured = set(
+            self.__get_config_to_execute(config_class)
+            .filter(pk__in=[config.pk for config in configs])
+            .values_list("pk", flat=True)
+        )
+        result = {}
+        for config in configs:
+            if config.pk not in configured:
+                raise TypeError(
+                    f"{config_class.__name__} {config.name} "
+                    f"is not configured inside job {self.pk}"
+                )
+            result[config.pk] = self.runtime_configuration.get(
+                config.runtime_configuration_key, {}
+            ).get(config.name, {})
+        return result
+
     # user methods
 
     @classmethod
@@ -770,6 +1166,87 @@ class Job(MP_Node):
             )
 
 
+class JobStage(models.Model):
+    """
+    Stage of a job run by the event executor.
+
+    The tasks of a stage are dispatched together as soon as
+    all the stages it depends on are completed.
+    Every task decrements ``remaining`` when it is finished.
+    """
+
+    objects = JobStageQuerySet.as_manager()
+    job = models.ForeignKey(Job, related_name="stages", on_delete=models.CASCADE)
+    name = models.CharField(max_length=32)
+    # status of the job while the stage is running
+    status = models.CharField(
+        max_length=32, choices=Status.choices, null=True, blank=True, default=None
+    )
+    dependencies = pg_fields.ArrayField(
+        models.CharField(max_length=32), default=list, blank=True
+    )
+    # serialized signatures of the tasks
+    tasks = models.JSONField(default=list)
+    remaining = models.IntegerField(default=0)
+    dispatched = models.BooleanField(default=False)
+    dispatched_at = models.DateTimeField(null=True, blank=True, default=None)
+
+    class Meta:
+        unique_together = [("job", "name")]
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(job:#{self.job_id}, {self.name})"
+
+    def dispatch(self) -> None:
+        """
+        Sends the tasks of the stage.
+        """
+        logger.info(f"Dispatching {self}")
+        if self.status:
+            Job.objects.filter(pk=self.job_id).exclude(
+                status__in=Job.STATUSES.final_statuses()
+            ).update(status=self.status)
+        for task in self.tasks:
+            signature(task).apply_async()
+
+
+class JobRollup(models.Model):
+    """
+    Number of finished jobs received in an hour,
+    for every combination of the fields shown in the dashboard.
+
+    The counters are updated when a job reaches a final status,
+    so that the aggregations depend on the number of buckets
+    instead of the number of jobs.
+    """
+
+    objects = JobRollupQuerySet.as_manager()
+    bucket = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+    )
+    status = models.CharField(max_length=32, choices=Status.choices)
+    classification = models.CharField(max_length=100)
+    mimetype = models.CharField(max_length=80, null=True, blank=True, default=None)
+    playbook = models.ForeignKey(
+        "playbooks_manager.PlaybookConfig",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    tlp = models.CharField(max_length=8, choices=TLP.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["bucket", "user"])]
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({self.bucket}, {self.status}: {self.count})"
+
+
 class Parameter(models.Model):
     """
     Represents a parameter that can be configured for a Python module.
@@ -1178,9 +1655,8 @@ class ListCachable(models.Model):
             user (User): The user for whom the cache keys are being deleted.
         """
         base_key = f"{cls.__name__}_{user.username if user else ''}"
-        for key in cache.get_where(f"list_{base_key}").keys():
-            logger.debug(f"Deleting cache key {key}")
-            cache.delete(key)
+        keys = cache.delete_where(f"list_{base_key}")
+        logger.debug(f"Deleted cache keys {keys}")
 
     @classmethod
     @property
@@ -1356,6 +1832,11 @@ class AbstractReport(models.Model):
     parameters = models.JSONField(blank=False, null=False, editable=False)
     sent_to_bi = models.BooleanField(default=False, editable=False)
 
+    # whether the report is counted in the report counters of its job
+    counted_in_job_stats = False
+    # status the report had when loaded from the database
+    _loaded_status: Optional[str] = None
+
     class Meta:
         abstract = True
         indexes = [
@@ -1368,6 +1849,37 @@ class AbstractReport(models.Model):
         """Returns a string representation of the report."""
         return f"{self.__class__.__name__}(job:#{self.job_id}, {self.config.name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status", DEFERRED)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.status
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the report, keeping the report counters of the job up to date.
+        """
+        previous_status = None if self._state.adding else self._loaded_status
+        if previous_status is DEFERRED:
+            # the status was not loaded with the report
+            previous_status = (
+                self.__class__.objects.filter(pk=self.pk)
+                .values_list("status", flat=True)
+                .first()
+            )
+        update_fields = kwargs.get("update_fields")
+        super().save(*args, **kwargs)
+        if update_fields is not None and "status" not in update_fields:
+            return
+        if self.counted_in_job_stats and previous_status != self.status:
+            Job.update_reports_stats(self.job_id, previous_status, self.status)
+        self._loaded_status = self.status
+
     @classmethod
     @property
     def config(cls) -> "AbstractConfig":
@@ -1476,6 +1988,9 @@ class PythonConfig(AbstractConfig):
     )
     health_check_status = models.BooleanField(default=True, editable=False)
 
+    # seconds for which the resolved parameters are kept in cache
+    CONFIGURED_PARAMS_CACHE_TIMEOUT = 60 * 60 * 24
+
     class Meta:
         abstract = True
         indexes = [
@@ -1559,9 +2074,11 @@ class PythonConfig(AbstractConfig):
             dict: The configured parameters.
         """
         return {
-            parameter.name: parameter.value
-            for parameter in self.read_configured_params(user, runtime_configuration)
-            if not parameter.is_secret
+            parameter["name"]: parameter["value"]
+            for parameter in self.get_configured_params(
+                user, runtime_configuration, secrets=False
+            )
+            if not parameter["is_secret"]
         }
 
     def generate_empty_report(self, job: Job, task_id: str, status: str):
@@ -1590,6 +2107,71 @@ class PythonConfig(AbstractConfig):
             },
         )[0]
 
+    @classmethod
+    def generate_empty_reports(
+        cls,
+        job: Job,
+        configs: List["PythonConfig"],
+        task_ids: Dict[int, str],
+        status: str,
+        parameters: Dict[int, Dict[str, Any]],
+    ) -> None:
+        """
+        Bulk version of `generate_empty_report`.
+
+        When the report model is unique for job and configuration,
+        every report is created or updated with a single statement.
+
+        Args:
+            job (Job): The job associated with the reports.
+            configs (List[PythonConfig]): The configurations of the reports.
+            task_ids (Dict[int, str]): The task id of every configuration.
+            status (str): The status of the reports.
+            parameters (Dict[int, Dict[str, Any]]): The parameters
+                of every configuration.
+        """
+        report_class = cls.report_class
+        reports = [
+            report_class(
+                job=job,
+                config=config,
+                status=status,
+                task_id=task_ids[config.pk],
+                start_time=now(),
+                end_time=now(),
+                parameters=parameters[config.pk],
+            )
+            for config in configs
+        ]
+        update_fields = ["status", "task_id", "start_time", "end_time", "parameters"]
+        if any(
+            set(fields) == {"job", "config"}
+            for fields in report_class._meta.unique_together
+        ):
+            report_class.objects.bulk_create(
+                reports,
+                update_conflicts=True,
+                unique_fields=["job", "config"],
+                update_fields=update_fields,
+            )
+            return
+        # without the unique constraint we can't upsert:
+        # the configurations that already have a report (ie retries)
+        # update it one by one, the others are created together
+        existing = set(
+            report_class.objects.filter(
+                job=job, config__in=[config.pk for config in configs]
+            ).values_list("config", flat=True)
+        )
+        for report in reports:
+            if report.config_id in existing:
+                report_class.objects.filter(job=job, config=report.config_id).update(
+                    **{field: getattr(report, field) for field in update_fields}
+                )
+        report_class.objects.bulk_create(
+            [report for report in reports if report.config_id not in existing]
+        )
+
     def refresh_cache_keys(self, user: User = None):
         """
         Refreshes the cache keys associated with the plugin configuration.
@@ -1599,12 +2181,12 @@ class PythonConfig(AbstractConfig):
         """
         from api_app.serializers.plugin import PythonConfigListSerializer
 
+        self.invalidate_configured_params()
         base_key = (
             f"{self.__class__.__name__}_{self.name}_{user.username if user else ''}"
         )
-        for key in cache.get_where(f"serializer_{base_key}").keys():
-            logger.debug(f"Deleting cache key {key}")
-            cache.delete(key)
+        keys = cache.delete_where(f"serializer_{base_key}")
+        logger.debug(f"Deleted cache keys {keys}")
         if user:
             PythonConfigListSerializer(
                 child=self.serializer_class()
@@ -1783,6 +2365,141 @@ class PythonConfig(AbstractConfig):
             return params.filter(Q(configured=True) | Q(value__isnull=False))
         return params.filter(configured=True)
 
+    @property
+    def _configured_params_version_key(self) -> str:
+        return f"params_version_{self.__class__.__name__}_{self.pk}"
+
+    def invalidate_configured_params(self) -> None:
+        """
+        Invalidates every cached resolution of the parameters of the plugin,
+        for every user and runtime configuration, by changing its version.
+        """
+        cache.set(self._configured_params_version_key, uuid.uuid4().hex, None)
+
+    @classmethod
+    def _configured_params_versions(
+        cls, configs: List["PythonConfig"]
+    ) -> Dict[int, str]:
+        """
+        Returns the version of the resolved parameters
+        of every configuration, reading them from the cache at once.
+        """
+        keys = {config.pk: config._configured_params_version_key for config in configs}
+        versions = cache.get_many(keys.values())
+        # if the version is missing (never set or evicted) we generate a new one,
+        # so that we never read a resolution made before the last invalidation
+        missing = {
+            key: uuid.uuid4().hex for key in keys.values() if key not in versions
+        }
+        if missing:
+            cache.set_many(missing, None)
+            versions.update(missing)
+        return {pk: versions[key] for pk, key in keys.items()}
+
+    def _configured_params_cache_key(
+        self, user: User = None, config_runtime: Dict = None, version: str = None
+    ) -> str:
+        """
+        Returns the cache key of the resolved parameters.
+        The key changes with the user, its organization,
+        the runtime configuration and the version of the configuration.
+        """
+        if version is None:
+            version = self._configured_params_versions([self])[self.pk]
+        runtime_hash = hashlib.sha256(
+            json.dumps(config_runtime or {}, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        if user:
+            organization = (
+                user.membership.organization_id if user.has_membership() else ""
+            )
+            user_key = f"{user.pk}_{organization}"
+        else:
+            user_key = "_"
+        return (
+            f"params_{self.__class__.__name__}_{self.pk}"
+            f"_{user_key}_{runtime_hash}_{version}"
+        )
+
+    def get_configured_params(
+        self, user: User = None, config_runtime: Dict = None, secrets: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Cached version of `read_configured_params`.
+
+        The parameters are resolved once, when the signatures of the job are built,
+        and the plugin task reads them back from the cache.
+        The values of the secrets are never cached:
+        they are read again from the database every time.
+        The cache is invalidated every time a `PluginConfig` or
+        a `Parameter` of the plugin changes.
+
+        Args:
+            user (User): The user for whom the parameters are read.
+            config_runtime (Dict): The runtime configuration settings.
+            secrets (bool): Whether the values of the secrets are read.
+                If False, the secrets have no value.
+
+        Returns:
+            List[Dict[str, Any]]: name, value, is_secret, required and is_from_org
+                of every configured parameter.
+        """
+        key = self._configured_params_cache_key(user, config_runtime)
+        params = cache.get(key)
+        if params is None:
+            params = [
+                self._configured_param_to_dict(parameter)
+                for parameter in self.read_configured_params(user, config_runtime)
+            ]
+            cache.set(
+                key,
+                self._without_secret_values(params),
+                self.CONFIGURED_PARAMS_CACHE_TIMEOUT,
+            )
+            return params if secrets else self._without_secret_values(params)
+        names = [param["name"] for param in params if param["is_secret"]]
+        if secrets and names:
+            values = dict(
+                self.parameters.filter(is_secret=True, name__in=names)
+                .annotate_configured(self, user)
+                .annotate_value_for_user(self, user, config_runtime)
+                .values_list("name", "value")
+            )
+            params = [
+                (
+                    {**param, "value": values.get(param["name"])}
+                    if param["is_secret"]
+                    else param
+                )
+                for param in params
+            ]
+        return params
+
+    @staticmethod
+    def _without_secret_values(params: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Returns the parameters without the values of the secrets,
+        that must not be saved in the cache.
+        """
+        return [
+            {**param, "value": None} if param["is_secret"] else param
+            for param in params
+        ]
+
+    @staticmethod
+    def _configured_param_to_dict(parameter: Parameter) -> Dict[str, Any]:
+        """
+        Returns the cached representation of a parameter
+        annotated with `annotate_value_for_user`.
+        """
+        return {
+            "name": parameter.name,
+            "value": parameter.value,
+            "is_secret": parameter.is_secret,
+            "required": parameter.required,
+            "is_from_org": parameter.is_from_org,
+        }
+
     def generate_health_check_periodic_task(self):
         """
         Generates a periodic task for health checks.
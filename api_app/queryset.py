@@ -4,27 +4,31 @@ This module defines custom query sets for various models used in the IntelOwl pr
 Each query set provides additional methods for filtering, annotating, and manipulating
 query results specific to the needs of the IntelOwl application.
 """
+
 import datetime
 import json
+import time
 import uuid
-from typing import TYPE_CHECKING, Generator, Type
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Type
 
 from django.conf import settings
 from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from treebeard.mp_tree import MP_NodeQuerySet
 
 if TYPE_CHECKING:
-    from api_app.models import PythonConfig
+    from api_app.models import AbstractReport, PythonConfig
     from api_app.serializers import AbstractBIInterface
 
 import logging
 
 from celery.canvas import Signature
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, transaction
 from django.db.models import (
     BooleanField,
     Case,
+    Count,
     Exists,
     F,
     Func,
@@ -34,10 +38,11 @@ from django.db.models import (
     Q,
     QuerySet,
     Subquery,
+    Sum,
     Value,
     When,
 )
-from django.db.models.functions import Cast, Coalesce
+from django.db.models.functions import Cast, Coalesce, Trunc
 from django.db.models.lookups import Exact
 from django.utils.timezone import now
 
@@ -300,9 +305,88 @@ class JobQuerySet(MP_NodeQuerySet, CleanOnCreateQuerySet, SendToBiQuerySet):
             *args: Additional arguments.
             **kwargs: Additional keyword arguments.
         """
+        from api_app.models import JobRollup
+
+        # the finished jobs that are going to be deleted, with their children,
+        # must not be counted in the dashboard anymore
+        JobRollup.objects.remove_jobs(self.with_descendants())
         # just to be sure to call the correct method
         return MP_NodeQuerySet.delete(self, *args, **kwargs)
 
+    def subtrees(self, paths: List[str]) -> "JobQuerySet":
+        """
+        Filters the jobs in the subtrees starting from the given paths.
+
+        Args:
+            paths (List[str]): The materialized paths of the roots of the subtrees.
+
+        Returns:
+            The filtered queryset.
+        """
+        if not paths:
+            return self.none()
+        query = Q()
+        for path in paths:
+            query |= Q(path__startswith=path)
+        return self.filter(query)
+
+    def with_descendants(self) -> "JobQuerySet":
+        """
+        Returns the jobs together with all their descendants.
+        """
+        return self.model.objects.subtrees(list(self.values_list("path", flat=True)))
+
+    def purge(self, batch_size: int = 500, max_rate: float = 0) -> int:
+        """
+        Deletes the jobs in batches of consecutive primary keys,
+        with the analyzables that are not used anymore and their files.
+
+        Every batch is committed on its own, so that locks are held
+        only for a short time and an interrupted purge can be
+        executed again to continue from where it stopped.
+
+        Args:
+            batch_size (int): The number of jobs deleted with every statement.
+            max_rate (float): The maximum number of jobs deleted every second.
+                0 means no limit.
+
+        Returns:
+            int: The number of deleted jobs.
+        """
+        from api_app.analyzables_manager.models import Analyzable
+
+        deleted = 0
+        last_pk = 0
+        start = time.monotonic()
+        while True:
+            batch = list(
+                self.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "analyzable_id")[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            pks = [pk for pk, _ in batch]
+            analyzables = {analyzable for _, analyzable in batch}
+            with transaction.atomic():
+                # treebeard removes the children of the jobs too
+                self.model.objects.filter(pk__in=pks).delete()
+                Analyzable.objects.filter(pk__in=analyzables).delete_unused()
+            deleted += len(pks)
+            elapsed = time.monotonic() - start
+            logger.info(
+                f"purged {deleted} jobs in {elapsed:.1f}s"
+                f" ({deleted / elapsed if elapsed else 0:.1f} jobs/s),"
+                f" last pk {last_pk}"
+            )
+            if max_rate:
+                # we sleep to keep the average under the limit
+                delay = deleted / max_rate - elapsed
+                if delay > 0:
+                    time.sleep(delay)
+        return deleted
+
     @classmethod
     def _get_bi_serializer_class(cls):
         """
@@ -427,6 +511,278 @@ class JobQuerySet(MP_NodeQuerySet, CleanOnCreateQuerySet, SendToBiQuerySet):
         return qs.filter(received_request_time__lte=difference)
 
 
+class JobStageQuerySet(models.QuerySet):
+    """
+    A custom queryset for the stages of the jobs run by the event executor.
+    """
+
+    def dispatch_ready(self, job_id: int) -> List[str]:
+        """
+        Dispatches the stages of a job whose dependencies are all completed.
+
+        Args:
+            job_id (int): The job of the stages.
+
+        Returns:
+            List[str]: The names of the dispatched stages.
+        """
+        stages = list(self.filter(job_id=job_id))
+        completed = {
+            stage.name for stage in stages if stage.dispatched and stage.remaining <= 0
+        }
+        dispatched = []
+        for stage in stages:
+            if stage.dispatched or not set(stage.dependencies) <= completed:
+                continue
+            # the last tasks of a stage can finish together:
+            # only the one that flags the stage dispatches it
+            if self.filter(pk=stage.pk, dispatched=False).update(
+                dispatched=True, dispatched_at=now()
+            ):
+                stage.dispatch()
+                dispatched.append(stage.name)
+        return dispatched
+
+    def task_completed(self, job_id: int, name: str) -> List[str]:
+        """
+        Records that a task of a stage is finished
+        and, if it was the last one, dispatches the stages depending on it.
+
+        Args:
+            job_id (int): The job of the stage.
+            name (str): The name of the stage.
+
+        Returns:
+            List[str]: The names of the dispatched stages.
+        """
+        stage = self.filter(job_id=job_id, name=name)
+        stage.update(remaining=F("remaining") - 1)
+        if stage.filter(remaining__lte=0).exists():
+            return self.dispatch_ready(job_id)
+        return []
+
+    def complete_stale(self, minutes_ago: int = 25) -> List["JobStage"]:
+        """
+        Completes the stages dispatched more than ``minutes_ago`` minutes ago
+        whose tasks never notified their end (ie the worker died
+        or the task hit the hard time limit).
+        The reports of their tasks are failed and the next stages are dispatched.
+
+        Args:
+            minutes_ago (int): The minutes after which a stage is stale.
+
+        Returns:
+            List[JobStage]: The completed stages.
+        """
+        completed = []
+        for stage in self.filter(
+            dispatched=True,
+            remaining__gt=0,
+            dispatched_at__lte=now() - datetime.timedelta(minutes=minutes_ago),
+        ).select_related("job"):
+            # only one sweeper completes the stage
+            if not self.filter(pk=stage.pk, remaining__gt=0).update(remaining=0):
+                continue
+            logger.error(f"{stage} is stale: completing it")
+            stage.job.fail_running_reports(
+                [task.get("options", {}).get("task_id") for task in stage.tasks]
+            )
+            if stage.name == "final_status":
+                stage.job.set_final_status()
+            else:
+                self.dispatch_ready(stage.job_id)
+            completed.append(stage)
+        return completed
+
+
+class JobRollupQuerySet(models.QuerySet):
+    """
+    A custom queryset for the hourly counters of the finished jobs.
+    """
+
+    # job field -> rollup field
+    DIMENSIONS = {
+        "status": "status",
+        "analyzable__classification": "classification",
+        "analyzable__mimetype": "mimetype",
+        "playbook_to_execute__name": "playbook__name",
+        "user__username": "user__username",
+        "tlp": "tlp",
+    }
+
+    @staticmethod
+    def get_bucket(date: datetime.datetime) -> datetime.datetime:
+        return date.replace(minute=0, second=0, microsecond=0)
+
+    def add(self, job, status: str, count: int) -> None:
+        """
+        Adds ``count`` to the counter of the job bucket.
+
+        Args:
+            job (Job): The job to count.
+            status (str): The status the job is counted with.
+            count (int): 1 when the job is finished, -1 when it is not anymore.
+        """
+        dimensions = {
+            "bucket": self.get_bucket(job.received_request_time),
+            "user_id": job.user_id,
+            "status": status,
+            "classification": job.analyzable.classification,
+            "mimetype": job.analyzable.mimetype,
+            "playbook_id": job.playbook_to_execute_id,
+            "tlp": job.tlp,
+        }
+        # rows can be duplicated by concurrent creations:
+        # that is fine, since they are always summed up
+        pk = self.filter(**dimensions).values_list("pk", flat=True).first()
+        if pk:
+            self.filter(pk=pk).update(count=F("count") + count)
+        elif count > 0:
+            self.create(count=count, **dimensions)
+
+    def job_status_changed(self, job, previous_status: str = None) -> None:
+        """
+        Keeps the counters up to date when a job reaches,
+        or leaves (ie when it is retried), a final status.
+        """
+        final_statuses = job.STATUSES.final_statuses()
+        if previous_status in final_statuses:
+            self.add(job, previous_status, -1)
+        if job.status in final_statuses:
+            self.add(job, job.status, 1)
+
+    def job_deleted(self, job) -> None:
+        """
+        Removes from the counters a single finished job that is going to be deleted.
+        """
+        if job.status in job.STATUSES.final_statuses():
+            self.add(job, job.status, -1)
+
+    def _rollup(self, jobs: QuerySet) -> QuerySet:
+        return (
+            jobs.filter(status__in=jobs.model.STATUSES.final_statuses())
+            .order_by()
+            .annotate(
+                bucket=Trunc(
+                    "received_request_time", "hour", tzinfo=datetime.timezone.utc
+                )
+            )
+            .values(
+                "bucket",
+                "user_id",
+                "status",
+                "tlp",
+                classification=F("analyzable__classification"),
+                mimetype=F("analyzable__mimetype"),
+                playbook_id=F("playbook_to_execute_id"),
+            )
+            .annotate(count=Count("pk"))
+        )
+
+    def remove_jobs(self, jobs: QuerySet) -> None:
+        """
+        Removes the jobs that are going to be deleted from the counters.
+        Since the counters are always summed up, the counts of the jobs
+        are inserted as negative counters with a single query,
+        instead of updating every counter on its own.
+        """
+        self.bulk_create(
+            [
+                self.model(**{**row, "count": -row["count"]})
+                for row in self._rollup(jobs)
+            ]
+        )
+
+    def backfill(self, since: datetime.datetime = None, batch_size: int = 1000) -> int:
+        """
+        Computes again the counters from the finished jobs.
+
+        Args:
+            since (datetime, optional): Computes only the counters
+                of the jobs received after this date.
+                It is rounded down to its hour, since every counter
+                is computed again as a whole.
+            batch_size (int): Number of counters created with every query.
+
+        Returns:
+            int: The number of counters created.
+        """
+        from api_app.models import Job
+
+        jobs = Job.objects.all()
+        rollups = self
+        if since:
+            since = self.get_bucket(since)
+            jobs = jobs.filter(received_request_time__gte=since)
+            rollups = rollups.filter(bucket__gte=since)
+        with transaction.atomic():
+            rollups.delete()
+            objects = self.bulk_create(
+                [self.model(**row) for row in self._rollup(jobs).iterator()],
+                batch_size=batch_size,
+            )
+        return len(objects)
+
+    def aggregate_rows(
+        self,
+        field_name: str,
+        since: datetime.datetime,
+        basis: str,
+        users: List[User] = None,
+    ) -> List[Dict]:
+        """
+        Counts the jobs received after ``since`` by date and value of a field.
+
+        The finished jobs are read from the hourly counters,
+        so the cost depends on the number of buckets, not of jobs.
+        The running jobs, that are few and are not counted yet,
+        and the jobs received in the hour of ``since``,
+        whose counter starts before it, are read from the jobs.
+
+        Args:
+            field_name (str): The job field to aggregate by, one of `DIMENSIONS`.
+            since (datetime): Start of the range.
+            basis (str): Truncation of the dates, ie ``day``.
+            users (List[User], optional): Count only the jobs of these users.
+
+        Returns:
+            List[Dict]: rows with ``date``, ``value``,
+            ``classification`` and ``count``.
+        """
+        from api_app.models import Job
+
+        # the first counter that starts inside the range
+        first_bucket = self.get_bucket(since)
+        if first_bucket < since:
+            first_bucket += datetime.timedelta(hours=1)
+        rollups = self.filter(bucket__gte=first_bucket)
+        jobs = Job.objects.filter(
+            ~Q(status__in=Job.STATUSES.final_statuses())
+            | Q(received_request_time__lt=first_bucket),
+            received_request_time__gte=since,
+        )
+        if users:
+            rollups = rollups.filter(user__in=users)
+            jobs = jobs.filter(user__in=users)
+        rollups = (
+            rollups.order_by()
+            .annotate(date=Trunc("bucket", basis))
+            .values("date", "classification", value=F(self.DIMENSIONS[field_name]))
+            .annotate(count=Sum("count"))
+        )
+        jobs = (
+            jobs.order_by()
+            .annotate(date=Trunc("received_request_time", basis))
+            .values(
+                "date",
+                classification=F("analyzable__classification"),
+                value=F(field_name),
+            )
+            .annotate(count=Count("pk"))
+        )
+        return list(rollups) + list(jobs)
+
+
 class ParameterQuerySet(CleanOnCreateQuerySet):
     """
     Custom queryset for managing parameters, providing methods for filtering and annotating based on user configuration.
@@ -439,8 +795,52 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
     - _alias_runtime_config: Aliases runtime configuration values.
     - _alias_for_test: Aliases values for testing environments.
     - annotate_value_for_user: Annotates the final value for a user, considering runtime, owner, organization, default, and test values.
+    - for_configs: Retrieves the parameters of multiple configurations in a single query.
+
+    Every method that requires a `config` accepts either a single configuration
+    or, after `for_configs`, the configuration class.
     """
 
+    @staticmethod
+    def _config_filter(config) -> Dict:
+        """
+        Returns the PluginConfig filter selecting the values of the configuration.
+
+        Args:
+            config (PythonConfig | Type[PythonConfig]): The configuration or,
+                for querysets built with `for_configs`, the configuration class.
+
+        Returns:
+            Dict: The filter.
+        """
+        if isinstance(config, type):
+            # the configuration is the one of the row, annotated by `for_configs`
+            return {config.snake_case_name: OuterRef("config_pk")}
+        return {config.snake_case_name: config.pk}
+
+    def for_configs(
+        self, config_class: Type["PythonConfig"], pks: List[int]
+    ) -> "ParameterQuerySet":
+        """
+        Returns a row for every parameter of every configuration,
+        with the primary key of the configuration annotated as `config_pk`.
+        The configurations sharing the same python module share its parameters,
+        so the same parameter can be present in multiple rows.
+
+        Args:
+            config_class (Type[PythonConfig]): The class of the configurations.
+            pks (List[int]): The primary keys of the configurations.
+
+        Returns:
+            ParameterQuerySet: The annotated queryset.
+        """
+        related_name = config_class._meta.get_field(
+            "python_module"
+        ).related_query_name()
+        return self.annotate(config_pk=F(f"python_module__{related_name}__pk")).filter(
+            config_pk__in=pks
+        )
+
     def annotate_configured(
         self, config: "PythonConfig", user: User = None
     ) -> "ParameterQuerySet":
@@ -462,7 +862,7 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
         return self.annotate(
             configured=Exists(
                 PluginConfig.objects.filter(
-                    parameter=OuterRef("pk"), **{config.snake_case_name: config.pk}
+                    parameter=OuterRef("pk"), **self._config_filter(config)
                 ).visible_for_user(user)
             )
         )
@@ -486,7 +886,7 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
             owner_value=Subquery(
                 PluginConfig.objects.filter(
                     parameter__pk=OuterRef("pk"),
-                    **{config.snake_case_name: config.pk},
+                    **self._config_filter(config),
                     for_organization=False,
                 )
                 .visible_for_user_owned(user)
@@ -514,7 +914,7 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
                 Subquery(
                     PluginConfig.objects.filter(
                         parameter__pk=OuterRef("pk"),
-                        **{config.snake_case_name: config.pk},
+                        **self._config_filter(config),
                     )
                     .visible_for_user_by_org(user)
                     .values("value")[:1],
@@ -539,29 +939,39 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
         return self.alias(
             default_value=Subquery(
                 PluginConfig.objects.filter(
-                    parameter__pk=OuterRef("pk"), **{config.snake_case_name: config.pk}
+                    parameter__pk=OuterRef("pk"), **self._config_filter(config)
                 )
                 .default_values()
                 .values("value")[:1],
             )
         )
 
-    def _alias_runtime_config(self, runtime_config=None):
+    def _alias_runtime_config(self, runtime_config=None, grouped: bool = False):
         """
         Aliases runtime configuration values.
 
         Args:
             runtime_config (dict, optional): The runtime configuration. Defaults to None.
+            grouped (bool, optional): If the runtime configuration is a dict
+                of runtime configurations keyed by the `config_pk` annotation.
+                Defaults to False.
 
         Returns:
             ParameterQuerySet: The aliased queryset.
         """
         if not runtime_config:
             runtime_config = {}
+        if not grouped:
+            runtime_config = {None: runtime_config}
         # we are creating conditions for when runtime config should be used
         whens = [
-            When(name=para, then=Value(value, output_field=JSONField()))
-            for para, value in runtime_config.items()
+            When(
+                name=para,
+                **({"config_pk": config_pk} if grouped else {}),
+                then=Value(value, output_field=JSONField()),
+            )
+            for config_pk, config_runtime in runtime_config.items()
+            for para, value in config_runtime.items()
         ]
         return self.annotate(
             runtime_value=Case(*whens, default=None, output_field=JSONField())
@@ -613,6 +1023,8 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
             config (PythonConfig): The configuration to check against.
             user (User, optional): The user to check. Defaults to None.
             runtime_config (dict, optional): The runtime configuration. Defaults to None.
+                If `config` is a configuration class, the runtime configurations
+                keyed by the primary key of the configuration.
 
         Returns:
             ParameterQuerySet: The annotated queryset.
@@ -622,7 +1034,7 @@ class ParameterQuerySet(CleanOnCreateQuerySet):
             ._alias_owner_value_for_user(config, user)
             ._alias_org_value_for_user(config, user)
             ._alias_default_value(config)
-            ._alias_runtime_config(runtime_config)
+            ._alias_runtime_config(runtime_config, grouped=isinstance(config, type))
             ._alias_for_test()
             # importance order
             .annotate(
@@ -674,6 +1086,7 @@ class AbstractReportQuerySet(SendToBiQuerySet):
     - filter_completed: Filters reports that are completed.
     - filter_retryable: Filters reports that are retryable.
     - get_configurations: Retrieves configurations associated with the reports.
+    - project: Loads only some values of the reports with a single query.
     """
 
     def filter_completed(self):
@@ -710,6 +1123,67 @@ class AbstractReportQuerySet(SendToBiQuerySet):
             pk__in=self.values("config_id")
         )
 
+    def project(
+        self, paths: Dict[Any, List[str]], key: str = "config__name"
+    ) -> List["AbstractReport"]:
+        """
+        Loads the reports selected by the keys of paths with a single query,
+        reading from the database only the values of the report at their paths.
+
+        Args:
+            paths (Dict[Any, List[str]]): for every value of ``key``,
+                the paths of the report to read, like
+                ``data__attributes__last_analysis_stats``;
+                an empty path reads the whole report.
+            key (str): lookup of the report matched by the keys of paths.
+
+        Returns:
+            List[AbstractReport]: the reports, whose report contains only the values
+            found at the paths. They must not be saved.
+        """
+        projections = []
+        for value, report_paths in paths.items():
+            for path in [""] if "" in report_paths else report_paths:
+                projections.append(
+                    (
+                        path,
+                        Case(
+                            When(
+                                **{key: value},
+                                then=F(f"report__{path}" if path else "report"),
+                            ),
+                            output_field=JSONField(),
+                        ),
+                    )
+                )
+        reports = []
+        for report in (
+            self.filter(**{f"{key}__in": list(paths)})
+            .defer("report")
+            .annotate(
+                **{
+                    f"projection_{i}": expression
+                    for i, (_, expression) in enumerate(projections)
+                }
+            )
+        ):
+            content = {}
+            for i, (path, _) in enumerate(projections):
+                value = getattr(report, f"projection_{i}")
+                if value is None:
+                    continue
+                if not path:
+                    content = value
+                    continue
+                *parents, last = path.split("__")
+                node = content
+                for parent in parents:
+                    node = node.setdefault(parent, {})
+                node[last] = value
+            report.report = content
+            reports.append(report)
+        return reports
+
 
 class ModelWithOwnershipQuerySet:
     """
@@ -816,6 +1290,7 @@ class PythonConfigQuerySet(AbstractConfigQuerySet):
     Methods:
     - annotate_configured: Annotates configurations indicating if they are fully configured.
     - annotate_runnable: Annotates configurations indicating if they are runnable.
+    - get_configured_params: Retrieves the configured parameters of every configuration.
     - get_signatures: Generates task signatures for each configuration.
     """
 
@@ -920,10 +1395,89 @@ class PythonConfigQuerySet(AbstractConfigQuerySet):
             )
         )
 
+    def get_configured_params(
+        self, user: User = None, runtime_configurations: Dict[int, Dict] = None
+    ) -> Dict[int, List[Dict]]:
+        """
+        Grouped version of `PythonConfig.get_configured_params`.
+        The parameters that are not already cached are resolved
+        for every configuration with a single query.
+        The secrets have no value: the plugins read them when they run.
+
+        Args:
+            user (User, optional): The user for whom the parameters are read.
+            runtime_configurations (Dict[int, Dict], optional): The runtime
+                configuration of every configuration, keyed by primary key.
+
+        Returns:
+            Dict[int, List[Dict]]: The configured parameters of every configuration.
+
+        Raises:
+            TypeError: If a required parameter does not have a valid value.
+        """
+        from api_app.models import Parameter
+
+        configs = list(self)
+        if not configs:
+            return {}
+        runtime_configurations = runtime_configurations or {}
+        versions = self.model._configured_params_versions(configs)
+        keys = {
+            config.pk: config._configured_params_cache_key(
+                user, runtime_configurations.get(config.pk, {}), versions[config.pk]
+            )
+            for config in configs
+        }
+        cached = cache.get_many(keys.values())
+        result = {pk: cached[key] for pk, key in keys.items() if key in cached}
+        missing = [pk for pk in keys if pk not in result]
+        if missing:
+            parameters = (
+                Parameter.objects.for_configs(self.model, missing)
+                .annotate_configured(self.model, user)
+                .annotate_value_for_user(
+                    self.model,
+                    user,
+                    {pk: runtime_configurations.get(pk, {}) for pk in missing},
+                )
+            )
+            resolved = {pk: [] for pk in missing}
+            # same checks of `PythonConfig.read_configured_params`
+            for parameter in parameters:
+                if (
+                    parameter.required
+                    and not parameter.configured
+                    and (not settings.STAGE_CI or not parameter.value)
+                ):
+                    raise TypeError(
+                        f"Required param {parameter.name} "
+                        f"of plugin {parameter.python_module.module}"
+                        " does not have a valid value"
+                    )
+                if parameter.configured or (
+                    settings.STAGE_CI and parameter.value is not None
+                ):
+                    resolved[parameter.config_pk].append(
+                        self.model._configured_param_to_dict(parameter)
+                    )
+            resolved = {
+                pk: self.model._without_secret_values(params)
+                for pk, params in resolved.items()
+            }
+            cache.set_many(
+                {keys[pk]: params for pk, params in resolved.items()},
+                self.model.CONFIGURED_PARAMS_CACHE_TIMEOUT,
+            )
+            result.update(resolved)
+        return result
+
     def get_signatures(self, job) -> Generator[Signature, None, None]:
         """
         Generates task signatures for each configuration.
 
+        The pending reports of every configuration are generated together
+        before the first signature is returned.
+
         Args:
             job (Job): The job instance.
 
@@ -934,28 +1488,44 @@ class PythonConfigQuerySet(AbstractConfigQuerySet):
         from intel_owl import tasks
 
         job: Job
-        for config in self:
-            config: PythonConfig
+        configs: List[PythonConfig] = list(self)
+        for config in configs:
             if not hasattr(config, "runnable"):
                 raise RuntimeError(
                     "You have to call `annotate_runnable`"
                     " before being able to call `get_signature`"
                 )
-            # gen new task_id
             if not config.runnable:
                 raise RuntimeWarning(
                     "You are trying to get the signature of a not runnable plugin"
                 )
-
-            task_id = str(uuid.uuid4())
-            config.generate_empty_report(
-                job, task_id, AbstractReport.STATUSES.PENDING.value
-            )
+        if not configs:
+            return
+        runtime_configurations = job.get_configs_runtime_configuration(configs)
+        configured_params = self.get_configured_params(job.user, runtime_configurations)
+        # gen new task_id
+        task_ids = {config.pk: str(uuid.uuid4()) for config in configs}
+        self.model.generate_empty_reports(
+            job,
+            configs,
+            task_ids,
+            AbstractReport.STATUSES.PENDING.value,
+            {
+                pk: {
+                    parameter["name"]: parameter["value"]
+                    for parameter in params
+                    if not parameter["is_secret"]
+                }
+                for pk, params in configured_params.items()
+            },
+        )
+        for config in configs:
+            task_id = task_ids[config.pk]
             args = [
                 job.pk,
                 config.python_module_id,
                 config.pk,
-                job.get_config_runtime_configuration(config),
+                runtime_configurations[config.pk],
                 task_id,
             ]
             yield tasks.run_plugin.signature(
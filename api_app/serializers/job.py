@@ -4,11 +4,12 @@ import ipaddress
 import logging
 import re
 import uuid
-from typing import Dict, Generator, List, Union
+from typing import Dict, Generator, Iterable, List, Tuple, Union
 
 import django.core
 from django.conf import settings
 from django.db.models import Q, QuerySet
+from django.db.models.manager import BaseManager
 from django.http import QueryDict
 from django.utils.timezone import now
 from rest_framework import serializers as rfs
@@ -23,7 +24,7 @@ from api_app.choices import TLP, Classification, ScanMode
 from api_app.connectors_manager.exceptions import NotRunnableConnector
 from api_app.connectors_manager.models import ConnectorConfig
 from api_app.defaults import default_runtime
-from api_app.helpers import calculate_md5, gen_random_colorhex
+from api_app.helpers import calculate_hashes, calculate_md5, gen_random_colorhex
 from api_app.investigations_manager.models import Investigation
 from api_app.models import Comment, Job, Tag
 from api_app.playbooks_manager.models import PlaybookConfig
@@ -82,14 +83,40 @@ class JobRecentScanSerializer(rfs.ModelSerializer):
         ]
 
 
+class _JobPrefetchListSerializer(rfs.ListSerializer):
+    """
+    Computes in bulk, before the serialization,
+    the values that every job would read with its own queries.
+    """
+
+    def to_representation(self, data):
+        jobs = list(data.all() if isinstance(data, BaseManager) else data)
+        self.child.prefetch(jobs)
+        return super().to_representation(jobs)
+
+
 class _AbstractJobViewSerializer(rfs.ModelSerializer):
     """
     Base Serializer for ``Job`` model's ``retrieve()`` and ``list()``.
     """
 
+    # relations read by the serializer, loaded by ``optimize_queryset``
+    select_related_fields: Tuple[str] = ("user", "analyzable")
+    prefetch_related_fields: Tuple[str] = ("tags",)
+
     user = UserSerializer()
     tags = TagSerializer(many=True, read_only=True)
 
+    @classmethod
+    def optimize_queryset(cls, queryset: QuerySet) -> QuerySet:
+        return queryset.select_related(*cls.select_related_fields).prefetch_related(
+            *cls.prefetch_related_fields
+        )
+
+    @classmethod
+    def prefetch(cls, jobs: List[Job]) -> None:
+        Job.prefetch_pivots_to_execute(jobs)
+
 
 class _AbstractJobCreateSerializer(rfs.ModelSerializer):
     """
@@ -329,28 +356,96 @@ class _AbstractJobCreateSerializer(rfs.ModelSerializer):
             else:
                 yield plugin_config
 
-    def check_previous_jobs(self, validated_data: Dict) -> Job:
-        logger.info("Checking previous jobs")
+    def _previous_jobs_queryset(self, validated_data: Dict) -> QuerySet:
         if not validated_data["scan_check_time"]:
             raise ValidationError({"detail": "Scan check time can't be null"})
         status_to_exclude = [Job.STATUSES.KILLED, Job.STATUSES.FAILED]
         if not validated_data.get("playbook_to_execute", None):
             status_to_exclude.append(Job.STATUSES.REPORTED_WITH_FAILS)
-        qs = (
-            self.Meta.model.objects.visible_for_user(self.context["request"].user)
-            .filter(
-                received_request_time__gte=now() - validated_data["scan_check_time"]
-            )
-            .filter(Q(analyzable__pk=validated_data["analyzable"].pk))
-        )
+        qs = self.Meta.model.objects.visible_for_user(
+            self.context["request"].user
+        ).filter(received_request_time__gte=now() - validated_data["scan_check_time"])
         for analyzer in validated_data.get("analyzers_to_execute", []):
             qs = qs.filter(analyzers_requested__in=[analyzer])
         for connector in validated_data.get("connectors_to_execute", []):
             qs = qs.filter(connectors_requested__in=[connector])
         for visualizer in validated_data.get("visualizers_to_execute", []):
             qs = qs.filter(visualizers_to_execute__in=[visualizer])
+        return qs.exclude(status__in=status_to_exclude)
 
-        return qs.exclude(status__in=status_to_exclude).latest("received_request_time")
+    @staticmethod
+    def previous_jobs_key(validated_data: Dict) -> Tuple:
+        # the analyses with the same key share the filters of the previous jobs
+        return (
+            validated_data["scan_check_time"],
+            bool(validated_data.get("playbook_to_execute", None)),
+            *(
+                tuple(sorted(plugin.pk for plugin in validated_data.get(field, [])))
+                for field in [
+                    "analyzers_to_execute",
+                    "connectors_to_execute",
+                    "visualizers_to_execute",
+                ]
+            ),
+        )
+
+    @staticmethod
+    def should_check_previous_jobs(validated_data: Dict) -> bool:
+        # if we have a parent job and a new playbook to excute force new analysis
+        # in order to avoid graph related issues
+        return validated_data[
+            "scan_mode"
+        ] == ScanMode.CHECK_PREVIOUS_ANALYSIS.value and not (
+            "parent" in validated_data
+            and validated_data["parent"]
+            and "playbook_to_execute" in validated_data
+            and validated_data["playbook_to_execute"]
+        )
+
+    def check_previous_jobs(self, validated_data: Dict) -> Job:
+        logger.info("Checking previous jobs")
+        return (
+            self._previous_jobs_queryset(validated_data)
+            .filter(analyzable__pk=validated_data["analyzable"].pk)
+            .latest("received_request_time")
+        )
+
+    def check_previous_jobs_many(self, validated_data: List[Dict]) -> List[Job]:
+        """
+        Looks up the previous jobs of many analyses,
+        with one query for every group of analyses executing the same plugins.
+
+        Args:
+            validated_data (List[Dict]): The validated data of the analyses,
+            with the ``analyzable`` set.
+
+        Returns:
+            List[Job]: The latest previous job of every analysis,
+            None where there is none or it must not be checked.
+        """
+        logger.info(f"Checking previous jobs of {len(validated_data)} analyses")
+        groups = {}
+        for data in validated_data:
+            if self.should_check_previous_jobs(data):
+                key = self.previous_jobs_key(data)
+                groups.setdefault(key, (data, set()))[1].add(data["analyzable"].pk)
+        previous_jobs = {}
+        for key, (data, analyzables) in groups.items():
+            for job in (
+                self._previous_jobs_queryset(data)
+                .filter(analyzable__pk__in=analyzables)
+                .order_by("analyzable", "-received_request_time")
+                .distinct("analyzable")
+            ):
+                previous_jobs[(key, job.analyzable_id)] = job
+        return [
+            (
+                previous_jobs.get((self.previous_jobs_key(data), data["analyzable"].pk))
+                if self.should_check_previous_jobs(data)
+                else None
+            )
+            for data in validated_data
+        ]
 
     def create(self, validated_data: Dict) -> Job:
         # POP VALUES!
@@ -361,23 +456,18 @@ class _AbstractJobCreateSerializer(rfs.ModelSerializer):
         delay = validated_data.pop("delay")
         send_task = validated_data.pop("send_task", False)
         parent_job = validated_data.pop("parent_job", None)
+        # already looked up when the jobs are created in batch
+        previous_job = validated_data.pop("previous_job", empty)
 
-        # if we have a parent job and a new playbook to excute force new analysis
-        # in order to avoid graph related issues
-        if validated_data[
-            "scan_mode"
-        ] == ScanMode.CHECK_PREVIOUS_ANALYSIS.value and not (
-            "parent" in validated_data
-            and validated_data["parent"]
-            and "playbook_to_execute" in validated_data
-            and validated_data["playbook_to_execute"]
-        ):
-            try:
-                return self.check_previous_jobs(validated_data)
-            except self.Meta.model.DoesNotExist:
-                job = super().create(validated_data)
-        else:
-            job = super().create(validated_data)
+        if self.should_check_previous_jobs(validated_data):
+            if previous_job is empty:
+                try:
+                    previous_job = self.check_previous_jobs(validated_data)
+                except self.Meta.model.DoesNotExist:
+                    previous_job = None
+            if previous_job:
+                return previous_job
+        job = super().create(validated_data)
         job.warnings = warnings
         job.save()
         logger.info(f"Job {job.pk} created")
@@ -469,6 +559,17 @@ class JobListSerializer(_AbstractJobViewSerializer):
             "tlp",
             "investigation",
         )
+        list_serializer_class = _JobPrefetchListSerializer
+
+    select_related_fields = _AbstractJobViewSerializer.select_related_fields + (
+        "playbook_to_execute",
+    )
+    prefetch_related_fields = _AbstractJobViewSerializer.prefetch_related_fields + (
+        "analyzers_to_execute",
+        "connectors_to_execute",
+        "visualizers_to_execute",
+        "playbook_to_execute__pivots",
+    )
 
     pivots_to_execute = rfs.SerializerMethodField(read_only=True)
     analyzers_to_execute = rfs.SlugRelatedField(
@@ -491,7 +592,13 @@ class JobListSerializer(_AbstractJobViewSerializer):
     md5 = rfs.CharField(source="analyzable.md5", read_only=True)
 
     def get_pivots_to_execute(self, obj: Job):  # skipcq: PYL-R0201
-        return obj.pivots_to_execute.all().values_list("name", flat=True)
+        return obj.pivots_to_execute_names
+
+
+class _JobTreeListSerializer(rfs.ListSerializer):
+    def to_representation(self, data):
+        roots = data.all() if isinstance(data, BaseManager) else data
+        return self.child.build_trees(roots)
 
 
 class JobTreeSerializer(ModelSerializer):
@@ -547,17 +654,53 @@ class JobTreeSerializer(ModelSerializer):
             "isp",
             "country",
         ]
-
-    def to_representation(self, instance):
-        instance: Job
+        list_serializer_class = _JobTreeListSerializer
+
+    def build_trees(self, roots: Iterable[Job]) -> List[Dict]:
+        """
+        Serializes the trees starting from the roots.
+
+        All the nodes are loaded with a single query on the materialized path,
+        with their data models and pivot maps,
+        and the nested structure is assembled in memory.
+
+        Args:
+            roots (Iterable[Job]): The roots of the trees.
+
+        Returns:
+            List[Dict]: The serialized tree of every root.
+        """
+        roots = list(roots)
+        jobs = (
+            Job.objects.subtrees([root.path for root in roots])
+            .select_related(
+                "analyzable", "playbook_to_execute", "pivot_parent__pivot_config"
+            )
+            .prefetch_related("data_model")
+            .order_by("path")
+        )
+        nodes = {}
+        for job in jobs:
+            # ordered by path, so the parent is always serialized before its children
+            nodes[job.path] = self._to_node(job)
+            if parent := nodes.get(job.path[: -Job.steplen]):
+                parent.setdefault("children", []).append(nodes[job.path])
+        return [nodes[root.path] for root in roots if root.path in nodes]
+
+    def _to_node(self, instance: Job) -> Dict:
         data = super().to_representation(instance)
-        for child in instance.get_children():
-            # recursive call
-            data.setdefault("children", []).append(self.__class__(instance=child).data)
         if data["pivot_config"] is None:
             del data["pivot_config"]
         return data
 
+    def to_representation(self, instance):
+        instance: Job
+        trees = self.build_trees([instance])
+        # the job is not in the database anymore (ie deleted in the meantime)
+        if not trees:
+            return self._to_node(instance)
+        return trees[0]
+
 
 class JobSerializer(_AbstractJobViewSerializer):
     """
@@ -601,6 +744,26 @@ class JobSerializer(_AbstractJobViewSerializer):
             "warnings",
             "errors",
         )
+        list_serializer_class = _JobPrefetchListSerializer
+
+    select_related_fields = _AbstractJobViewSerializer.select_related_fields + (
+        "playbook_to_execute",
+        "playbook_requested",
+        "investigation",
+    )
+    prefetch_related_fields = _AbstractJobViewSerializer.prefetch_related_fields + (
+        "analyzers_to_execute",
+        "analyzers_requested",
+        "connectors_to_execute",
+        "connectors_requested",
+        "visualizers_to_execute",
+        "playbook_to_execute__pivots",
+        "analyzable__comments__user",
+        "analyzerreports__config",
+        "connectorreports__config",
+        "pivotreports__config",
+        "visualizerreports__config",
+    )
 
     comments = CommentSerializer(
         many=True, read_only=True, source="analyzable.comments"
@@ -613,9 +776,7 @@ class JobSerializer(_AbstractJobViewSerializer):
     )
     md5 = rfs.CharField(source="analyzable.md5", read_only=True)
 
-    pivots_to_execute = rfs.SlugRelatedField(
-        many=True, read_only=True, slug_field="name"
-    )
+    pivots_to_execute = rfs.SerializerMethodField(read_only=True)
     analyzers_to_execute = rfs.SlugRelatedField(
         many=True, read_only=True, slug_field="name"
     )
@@ -640,17 +801,22 @@ class JobSerializer(_AbstractJobViewSerializer):
     data_model = rfs.SerializerMethodField()
     is_sample = rfs.BooleanField(read_only=True)
 
+    @classmethod
+    def prefetch(cls, jobs: List[Job]) -> None:
+        super().prefetch(jobs)
+        Job.prefetch_roots(jobs)
+
     def get_pivots_to_execute(self, obj: Job):  # skipcq: PYL-R0201
         # this cast is required or serializer doesn't work with websocket
-        return list(obj.pivots_to_execute.all().values_list("name", flat=True))
+        return list(obj.pivots_to_execute_names)
 
     def get_investigation_id(self, instance: Job):  # skipcq: PYL-R0201
-        if root_investigation := instance.get_root().investigation:
+        if root_investigation := instance.root.investigation:
             return root_investigation.pk
         return instance.investigation
 
     def get_investigation_name(self, instance: Job):  # skipcq: PYL-R0201
-        if root_investigation := instance.get_root().investigation:
+        if root_investigation := instance.root.investigation:
             return root_investigation.name
         return instance.investigation
 
@@ -711,8 +877,15 @@ class MultipleJobSerializer(rfs.ListSerializer):
     def update(self, instance, validated_data):
         raise NotImplementedError("This serializer does not support update().")
 
-    def save(self, parent: Job = None, **kwargs):
+    def save(self, parent: Job = None, investigation: Investigation = None, **kwargs):
         jobs = super().save(**kwargs, parent=parent)
+        if investigation:
+            # the jobs are created in batches, all of them in the same investigation
+            for job in jobs:
+                job: Job
+                job.investigation = investigation
+                job.save(update_fields=["investigation"])
+            return jobs
         if parent:
             # the parent has already an investigation
             # so we don't need to do anything because everything is already connected
@@ -757,7 +930,7 @@ class MultipleJobSerializer(rfs.ListSerializer):
                 for job in jobs:
                     job: Job
                     job.investigation = investigation
-                    job.save()
+                    job.save(update_fields=["investigation"])
                 investigation.start_time = now()
             else:
                 return jobs
@@ -824,7 +997,9 @@ class MultipleFileJobSerializer(MultipleJobSerializer):
             if data_to_check.get("file_mimetypes", []):
                 item["file_mimetype"] = data_to_check["file_mimetypes"][index]
             if delay := data_to_check.get("delay", datetime.timedelta()):
-                item["delay"] = int(delay * index)
+                item["delay"] = int(
+                    delay * (self.context.get("index_offset", 0) + index)
+                )
             try:
                 validated = self.child.run_validation(item)
             except ValidationError as exc:
@@ -862,12 +1037,12 @@ class FileJobSerializer(_AbstractJobCreateSerializer):
         # calculate ``file_mimetype``
         if "file_name" not in attrs:
             attrs["file_name"] = attrs["file"].name
-        # calculate ``md5``
-        file_obj = attrs["file"].file
-        file_obj.seek(0)
-        file_buffer = file_obj.read()
-        attrs["file_mimetype"] = MimeTypes.calculate(file_buffer, attrs["file_name"])
-        attrs["md5"] = calculate_md5(file_buffer)
+        # the digests are calculated with a single pass over the chunks of the file,
+        # and the mimetype from its beginning, without reading it all in memory
+        attrs["file_mimetype"] = MimeTypes.calculate_from_file(
+            attrs["file"], attrs["file_name"]
+        )
+        attrs.update(calculate_hashes(attrs["file"].chunks()))
         attrs = super().validate(attrs)
         logger.debug(f"after attrs: {attrs}")
         return attrs
@@ -881,6 +1056,9 @@ class FileJobSerializer(_AbstractJobCreateSerializer):
                 "file": validated_data.pop("file"),
                 "mimetype": validated_data.pop("file_mimetype"),
                 "md5": md5,
+                # already calculated, so the file is not hashed again
+                "sha1": validated_data.pop("sha1"),
+                "sha256": validated_data.pop("sha256"),
                 "classification": Classification.FILE.value,
             },
         )
@@ -948,6 +1126,38 @@ class MultipleObservableJobSerializer(MultipleJobSerializer):
     def update(self, instance, validated_data):
         raise NotImplementedError("This serializer does not support update().")
 
+    def create(self, validated_data: List[Dict]) -> List[Job]:
+        # the analyzables and the previous jobs of the whole batch
+        # are retrieved together, instead of once for every observable
+        analyzables = Analyzable.objects.get_or_create_many(
+            Analyzable(
+                name=data["observable_name"],
+                md5=data["md5"],
+                classification=data["observable_classification"],
+            )
+            for data in validated_data
+        )
+        for data in validated_data:
+            data["analyzable"] = analyzables[data["md5"]]
+        previous_jobs = self.child.check_previous_jobs_many(validated_data)
+        jobs = []
+        created = {}
+        for data, previous_job in zip(validated_data, previous_jobs):
+            # the same observable submitted twice is analyzed only once
+            key = (
+                self.child.previous_jobs_key(data)
+                if self.child.should_check_previous_jobs(data)
+                else None
+            )
+            data["previous_job"] = previous_job or created.get(
+                (key, data["analyzable"].pk)
+            )
+            job = self.child.create(data)
+            if key is not None:
+                created.setdefault((key, data["analyzable"].pk), job)
+            jobs.append(job)
+        return jobs
+
     def to_internal_value(self, data):
         ret = []
         errors = []
@@ -962,7 +1172,9 @@ class MultipleObservableJobSerializer(MultipleJobSerializer):
             item["observable_name"] = name
 
             if delay := data.get("delay", datetime.timedelta()):
-                item["delay"] = int(delay * index)
+                item["delay"] = int(
+                    delay * (self.context.get("index_offset", 0) + index)
+                )
 
             try:
                 validated = self.child.run_validation(item)
@@ -996,19 +1208,22 @@ class ObservableAnalysisSerializer(_AbstractJobCreateSerializer):
     def create(self, validated_data):
         observable_classification = validated_data.pop("observable_classification")
         md5 = validated_data.pop("md5")
-        obs, created = Analyzable.objects.get_or_create(
-            defaults={
-                "name": validated_data.pop("observable_name"),
-                "md5": md5,
-                "classification": observable_classification,
-            },
-            md5=md5,
-        )
-        if created:
-            obs.full_clean()
-            obs.save()
+        observable_name = validated_data.pop("observable_name")
+        # already retrieved when the jobs are created in batch
+        if "analyzable" not in validated_data:
+            obs, created = Analyzable.objects.get_or_create(
+                defaults={
+                    "name": observable_name,
+                    "md5": md5,
+                    "classification": observable_classification,
+                },
+                md5=md5,
+            )
+            if created:
+                obs.full_clean()
+                obs.save()
 
-        validated_data["analyzable"] = obs
+            validated_data["analyzable"] = obs
 
         return super().create(validated_data)
 
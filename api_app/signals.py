@@ -13,6 +13,7 @@ from api_app.decorators import prevent_signal_recursion
 from api_app.investigations_manager.models import Investigation
 from api_app.models import (
     Job,
+    JobRollup,
     ListCachable,
     Parameter,
     PluginConfig,
@@ -43,6 +44,25 @@ def post_save_job(sender, instance: Job, *args, **kwargs):
         instance.process_time = round(td.total_seconds(), 2)
 
 
+@receiver(models.signals.pre_delete, sender=Job)
+def pre_delete_job(sender, instance: Job, origin=None, **kwargs):
+    """
+    Signal receiver for the pre_delete signal of the Job model.
+    Removes the job from the dashboard counters
+    when it is deleted in cascade (ie with its analyzable or its user):
+    the jobs deleted by a JobQuerySet are removed all together by its `delete`.
+
+    Args:
+        sender (Model): The model class sending the signal.
+        instance (Job): The instance of the model being deleted.
+        origin (Model | QuerySet): The origin of the deletion.
+        **kwargs: Additional keyword arguments.
+    """
+    if isinstance(origin, models.QuerySet) and origin.model is Job:
+        return
+    JobRollup.objects.job_deleted(instance)
+
+
 @receiver(models.signals.post_delete, sender=Job)
 def post_delete_job(sender, instance: Job, **kwargs):
     """
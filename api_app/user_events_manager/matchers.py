@@ -0,0 +1,234 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+import bisect
+import ipaddress
+import logging
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+REGEX_METACHARACTERS = set(".^$*+?()[]{}|\\")
+
+# markers of the patterns ending in a node of a trie
+_PREFIX = 0
+_CONTAINS = 1
+_SUFFIX = 2
+
+
+def parse_wildcard(query: str) -> Optional[Tuple[str, str]]:
+    """
+    Translates a case-insensitive regex that matches a literal,
+    like the common ``.*\\.example\\.com``, in a string lookup.
+
+    Args:
+        query (str): The regex, executed as a search like postgres ``~*``.
+
+    Returns:
+        Optional[Tuple[str, str]]: The lookup (``iexact``, ``istartswith``,
+        ``iendswith`` or ``icontains``) and the lowercase literal,
+        or None if the regex is not a literal.
+    """
+    start, end = query.startswith("^"), False
+    if start:
+        query = query[1:]
+    if query.startswith(".*"):
+        start, query = False, query[2:]
+    if query.endswith("$") and not query.endswith("\\$"):
+        end, query = True, query[:-1]
+    if query.endswith(".*") and not query.endswith("\\.*"):
+        end, query = False, query[:-2]
+    literal = []
+    escaped = False
+    for char in query:
+        if escaped:
+            if char.isalnum():
+                # character classes like \d
+                return None
+            literal.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in REGEX_METACHARACTERS:
+            return None
+        else:
+            literal.append(char)
+    if escaped:
+        return None
+    lookup = {
+        (True, True): "iexact",
+        (True, False): "istartswith",
+        (False, True): "iendswith",
+        (False, False): "icontains",
+    }[(start, end)]
+    return lookup, "".join(literal).lower()
+
+
+class DomainWildCardMatcher:
+    """
+    Matches a name against many wildcard regexes at once.
+
+    The regexes matching a literal are stored in a dictionary
+    and in two tries, one of the literals and one of the reversed literals,
+    so that the cost of a match depends on the length of the name
+    and not on the number of regexes.
+    The other regexes are returned apart, to be evaluated by the database.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, str]]):
+        self._exact: Dict[str, Set[int]] = defaultdict(set)
+        self._forward: Dict = {}
+        self._backward: Dict = {}
+        self._always: Set[int] = set()
+        self.regexes: List[int] = []
+        for pk, query in rows:
+            self.add(pk, query)
+
+    @staticmethod
+    def _insert(trie: Dict, literal: str, marker: int, pk: int) -> None:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node.setdefault(marker, set()).add(pk)
+
+    def add(self, pk: int, query: str) -> None:
+        parsed = parse_wildcard(query)
+        if parsed is None:
+            self.regexes.append(pk)
+            return
+        lookup, literal = parsed
+        if lookup == "iexact":
+            self._exact[literal].add(pk)
+        elif not literal:
+            self._always.add(pk)
+        elif lookup == "istartswith":
+            self._insert(self._forward, literal, _PREFIX, pk)
+        elif lookup == "icontains":
+            self._insert(self._forward, literal, _CONTAINS, pk)
+        else:
+            self._insert(self._backward, literal[::-1], _SUFFIX, pk)
+
+    def match(self, name: str) -> Set[int]:
+        """
+        Returns the primary keys of the literal regexes matching the name.
+        """
+        name = name.lower()
+        result = set(self._always) | self._exact.get(name, set())
+        for start in range(len(name)):
+            node = self._forward
+            for char in name[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                result |= node.get(_CONTAINS, set())
+                if not start:
+                    result |= node.get(_PREFIX, set())
+        node = self._backward
+        for char in reversed(name):
+            node = node.get(char)
+            if node is None:
+                break
+            result |= node.get(_SUFFIX, set())
+        return result
+
+
+class IPRangeMatcher:
+    """
+    Interval index of IP ranges.
+
+    The ranges are sorted by start address, with the running maximum of the end
+    addresses, so that a lookup scans only the ranges that can contain the address.
+    Addresses are ordered like postgres ``inet``: IPv4 before IPv6.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, str, str]]):
+        ranges = sorted(
+            (self.to_key(start), self.to_key(end), pk) for pk, start, end in rows
+        )
+        self._starts = [start for start, _, _ in ranges]
+        self._ranges = ranges
+        self._max_ends = []
+        max_end = None
+        for _, end, _ in ranges:
+            max_end = end if max_end is None else max(max_end, end)
+            self._max_ends.append(max_end)
+
+    @staticmethod
+    def to_key(address: str) -> Tuple[int, int]:
+        ip = ipaddress.ip_address(address)
+        return ip.version, int(ip)
+
+    def match(self, address: str) -> Set[int]:
+        """
+        Returns the primary keys of the ranges containing the address.
+        """
+        try:
+            key = self.to_key(address)
+        except ValueError:
+            return set()
+        result = set()
+        position = bisect.bisect_right(self._starts, key) - 1
+        while position >= 0 and self._max_ends[position] >= key:
+            _, end, pk = self._ranges[position]
+            if end >= key:
+                result.add(pk)
+            position -= 1
+        return result
+
+
+class CachedMatcher:
+    """
+    Matcher built once for every process and rebuilt when its rows change.
+
+    The version of the rows is kept in the django cache,
+    so that a change made by any process is seen by all the others.
+    """
+
+    def __init__(self, name: str, build: Callable[[], object]):
+        self._cache_key = f"matcher_version_{name}"
+        self._build = build
+        self._version = None
+        self._matcher = None
+
+    def get(self):
+        version = cache.get(self._cache_key)
+        if self._matcher is None or version != self._version:
+            logger.info(f"Building matcher {self._cache_key} version {version}")
+            self._matcher = self._build()
+            self._version = version
+        return self._matcher
+
+    def invalidate(self) -> None:
+        # this process sees its own transaction, so it can rebuild immediately,
+        # while the others are notified only when the change is visible to them
+        self._matcher = None
+        transaction.on_commit(
+            lambda: cache.set(self._cache_key, str(uuid.uuid4()), timeout=None)
+        )
+
+
+def _build_domain_matcher() -> DomainWildCardMatcher:
+    from api_app.user_events_manager.models import UserDomainWildCardEvent
+
+    return DomainWildCardMatcher(
+        UserDomainWildCardEvent.objects.values_list("pk", "query").iterator()
+    )
+
+
+def _build_ip_matcher() -> IPRangeMatcher:
+    from api_app.user_events_manager.models import UserIPWildCardEvent
+
+    return IPRangeMatcher(
+        UserIPWildCardEvent.objects.values_list("pk", "start_ip", "end_ip").iterator()
+    )
+
+
+domain_wildcard_matcher = CachedMatcher(
+    "user_domain_wildcard_events", _build_domain_matcher
+)
+ip_wildcard_matcher = CachedMatcher("user_ip_wildcard_events", _build_ip_matcher)
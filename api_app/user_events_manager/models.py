@@ -12,6 +12,7 @@ from api_app.analyzables_manager.queryset import AnalyzableQuerySet
 from api_app.choices import Classification
 from api_app.data_model_manager.models import DomainDataModel, IPDataModel
 from api_app.user_events_manager.choices import DecayProgressionEnum
+from api_app.user_events_manager.matchers import parse_wildcard
 from api_app.user_events_manager.queryset import (
     UserDomainWildCardEventQuerySet,
     UserEventQuerySet,
@@ -127,8 +128,14 @@ class UserDomainWildCardEvent(UserEvent):
         unique_together = (("user", "query"),)
 
     def find_new_analyzables_from_query(self) -> AnalyzableQuerySet:
+        parsed = parse_wildcard(self.query)
+        if parsed is None:
+            lookup = {"name__iregex": self.query}
+        else:
+            # served by the trigram index instead of a sequential scan
+            lookup = {f"name__{parsed[0]}": parsed[1]}
         return Analyzable.objects.filter(
-            name__iregex=self.query,
+            **lookup,
             classification__in=[Classification.URL.value, Classification.DOMAIN.value],
         ).exclude(pk__in=self.analyzables.values_list("pk", flat=True))
 
@@ -1,19 +1,70 @@
 import datetime
 
-from django.db.models import F, Q, QuerySet, Value
-from django.db.models.lookups import IRegex, Range
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Least, Power
+from django.db.models.lookups import Exact, IRegex
 from django.utils.timezone import now
 
 from api_app.analyzables_manager.models import Analyzable
 from api_app.choices import Classification
 from api_app.user_events_manager.choices import DecayProgressionEnum
+from api_app.user_events_manager.matchers import (
+    domain_wildcard_matcher,
+    ip_wildcard_matcher,
+)
 
 
 class UserEventQuerySet(QuerySet):
 
-    def decay(self):
-        from api_app.user_events_manager.models import UserEvent
+    # upper bound of the days between two decays,
+    # to avoid overflows with the inverse exponential progression
+    MAX_DECAY_DAYS = 36500
+
+    def _next_decay(self) -> Case:
+        # days to the next decay, computed after the increment of decay_times
+        days = Case(
+            When(
+                decay_progression=DecayProgressionEnum.INVERSE_EXPONENTIAL.value,
+                then=Least(
+                    Power(F("decay_timedelta_days"), F("decay_times") + 2),
+                    Value(float(self.MAX_DECAY_DAYS)),
+                ),
+            ),
+            default=Cast(F("decay_timedelta_days"), FloatField()),
+            output_field=FloatField(),
+        )
+        return F("next_decay") + ExpressionWrapper(
+            days * Value(datetime.timedelta(days=1), output_field=DurationField()),
+            output_field=DurationField(),
+        )
+
+    def decay(self) -> int:
+        """
+        Decreases by one the reliability of the data models of the events
+        whose decay date has passed, and schedules their next decay.
 
+        For every type of data model, the data models and the events
+        are updated with one statement each, instead of two saves for every event.
+
+        Returns:
+            int: The number of decayed events.
+        """
         objects = (
             self.exclude(decay_progression=DecayProgressionEnum.FIXED.value)
             .exclude(next_decay__isnull=True)
@@ -21,26 +72,45 @@ class UserEventQuerySet(QuerySet):
                 next_decay__lte=now(),
             )
         )
-        # TODO we can probably translate all of this in sql query
-        for obj in objects:
-            obj: UserEvent
-            obj.decay_times += 1
-            obj.data_model.reliability -= 1
-            if obj.data_model.reliability == 0:
-                obj.next_decay = None
-            else:
-                if obj.decay_progression == DecayProgressionEnum.LINEAR.value:
-                    obj.next_decay += datetime.timedelta(days=obj.decay_timedelta_days)
-                elif (
-                    obj.decay_progression
-                    == DecayProgressionEnum.INVERSE_EXPONENTIAL.value
-                ):
-                    obj.next_decay += datetime.timedelta(
-                        days=obj.decay_timedelta_days ** (obj.decay_times + 1)
-                    )
-            obj.data_model.save()
-            obj.save()
-        return objects.count()
+        if isinstance(self.model._meta.get_field("data_model"), GenericForeignKey):
+            groups = [
+                (
+                    objects.filter(data_model_content_type=content_type),
+                    ContentType.objects.get_for_id(content_type).model_class(),
+                    "data_model_object_id",
+                )
+                for content_type in objects.order_by()
+                .values_list("data_model_content_type", flat=True)
+                .distinct()
+            ]
+        else:
+            groups = [
+                (
+                    objects,
+                    self.model._meta.get_field("data_model").related_model,
+                    "data_model_id",
+                )
+            ]
+        decayed = 0
+        with transaction.atomic():
+            for events, data_model_class, data_model_field in groups:
+                data_model_class.objects.filter(
+                    pk__in=events.values(data_model_field), reliability__gt=0
+                ).update(reliability=F("reliability") - 1)
+                reliability = Subquery(
+                    data_model_class.objects.filter(
+                        pk=OuterRef(data_model_field)
+                    ).values("reliability")[:1]
+                )
+                decayed += events.update(
+                    decay_times=F("decay_times") + 1,
+                    next_decay=Case(
+                        When(Exact(reliability, 0), then=Value(None)),
+                        default=self._next_decay(),
+                        output_field=DateTimeField(),
+                    ),
+                )
+        return decayed
 
     def visible_for_user(self, user):
         if user.has_membership():
@@ -66,13 +136,24 @@ class UserEventQuerySet(QuerySet):
 class UserDomainWildCardEventQuerySet(UserEventQuerySet):
 
     def matches(self, analyzable: Analyzable) -> "UserDomainWildCardEventQuerySet":
+        """
+        Filters the events whose query matches the name of the analyzable.
+
+        The queries matching a literal are resolved by the in-process matcher;
+        only the other regexes are evaluated by the database.
+        """
         if analyzable.classification in [
             Classification.DOMAIN.value,
             Classification.URL.value,
         ]:
-            return self.annotate(
-                matches=IRegex(Value(analyzable.name), F("query"))
-            ).filter(matches=True)
+            matcher = domain_wildcard_matcher.get()
+            query = Q(pk__in=matcher.match(analyzable.name))
+            if matcher.regexes:
+                query |= Q(
+                    IRegex(Value(analyzable.name), F("query")),
+                    pk__in=matcher.regexes,
+                )
+            return self.filter(query)
         return self.none()
 
     def create(self, **kwargs):
@@ -84,10 +165,12 @@ class UserDomainWildCardEventQuerySet(UserEventQuerySet):
 class UserIPWildCardEventQuerySet(UserEventQuerySet):
 
     def matches(self, analyzable: Analyzable) -> "UserIPWildCardEventQuerySet":
+        """
+        Filters the events whose range contains the ip of the analyzable,
+        using the in-process interval index of the ranges.
+        """
         if analyzable.classification == Classification.IP.value:
-            return self.annotate(
-                matches=Range(Value(analyzable.name), (F("start_ip"), F("end_ip")))
-            ).filter(matches=True)
+            return self.filter(pk__in=ip_wildcard_matcher.get().match(analyzable.name))
         return self.none()
 
     def create(self, **kwargs):
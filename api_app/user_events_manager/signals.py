@@ -1,6 +1,7 @@
 from django.db import models
 from django.dispatch import receiver
 
+from .matchers import domain_wildcard_matcher, ip_wildcard_matcher
 from .models import UserAnalyzableEvent, UserDomainWildCardEvent, UserIPWildCardEvent
 
 
@@ -11,3 +12,15 @@ def post_delete_event_delete_data_model(
     sender, instance: UserDomainWildCardEvent, **kwargs
 ):
     instance.data_model.delete()
+
+
+@receiver(models.signals.post_save, sender=UserDomainWildCardEvent)
+@receiver(models.signals.post_delete, sender=UserDomainWildCardEvent)
+def post_change_domain_wildcard_event(sender, instance, **kwargs):
+    domain_wildcard_matcher.invalidate()
+
+
+@receiver(models.signals.post_save, sender=UserIPWildCardEvent)
+@receiver(models.signals.post_delete, sender=UserIPWildCardEvent)
+def post_change_ip_wildcard_event(sender, instance, **kwargs):
+    ip_wildcard_matcher.invalidate()
@@ -3,13 +3,14 @@
 import copy
 import datetime
 import logging
+import operator
 import uuid
 from abc import ABCMeta, abstractmethod
+from functools import partial
+from typing import Any, Callable, Dict
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, Q
-from django.db.models.functions import Trunc
 from django.http import FileResponse
 from django.utils.timezone import now
 from elasticsearch_dsl import Q as QElastic
@@ -46,6 +47,7 @@ from .models import (
     AbstractReport,
     Comment,
     Job,
+    JobRollup,
     OrganizationPluginConfiguration,
     PluginConfig,
     PythonConfig,
@@ -390,6 +392,9 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         """
         Filters the queryset to include only jobs visible to the authenticated user, ordered by request time.
 
+        For `list` and `retrieve` the relations read by the serializer are loaded
+        in advance, so the number of queries does not depend on the number of jobs.
+
         Logs the request parameters and returns the filtered queryset.
 
         Returns:
@@ -399,7 +404,10 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         logger.info(
             f"user: {user} request the jobs with params: {self.request.query_params}"
         )
-        return Job.objects.visible_for_user(user).order_by("-received_request_time")
+        queryset = Job.objects.visible_for_user(user).order_by("-received_request_time")
+        if self.action in ["list", "retrieve"]:
+            queryset = self.get_serializer_class().optimize_queryset(queryset)
+        return queryset
 
     @action(detail=False, methods=["post"])
     def recent_scans(self, request):
@@ -605,10 +613,8 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         - Aggregated count of jobs for each status.
         """
         annotations = {
-            key.lower(): Count("status", filter=Q(status=key))
-            for key in Job.STATUSES.values
-            if key
-            in [
+            key.lower(): partial(operator.eq, key)
+            for key in [
                 Job.STATUSES.PENDING,
                 Job.STATUSES.FAILED,
                 Job.STATUSES.REPORTED_WITH_FAILS,
@@ -616,7 +622,7 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
             ]
         }
         return self.__aggregation_response_static(
-            annotations, users=self.get_org_members(request)
+            "status", annotations, users=self.get_org_members(request)
         )
 
     @action(
@@ -633,15 +639,13 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         - Aggregated count of jobs for each type.
         """
         annotations = {
-            "file": Count(
-                "pk", filter=Q(analyzable__classification=Classification.FILE.value)
-            ),
-            "observable": Count(
-                "pk", filter=~Q(analyzable__classification=Classification.FILE.value)
-            ),
+            "file": partial(operator.eq, Classification.FILE.value),
+            "observable": partial(operator.ne, Classification.FILE.value),
         }
         return self.__aggregation_response_static(
-            annotations, users=self.get_org_members(request)
+            "analyzable__classification",
+            annotations,
+            users=self.get_org_members(request),
         )
 
     @action(
@@ -658,9 +662,7 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         - Aggregated count of jobs for each observable classification.
         """
         annotations = {
-            oc.lower(): Count(
-                "analyzable__classification", filter=Q(analyzable__classification=oc)
-            )
+            oc.lower(): partial(operator.eq, oc)
             for oc in [
                 Classification.DOMAIN,
                 Classification.IP,
@@ -670,7 +672,9 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
             ]
         }
         return self.__aggregation_response_static(
-            annotations, users=self.get_org_members(request)
+            "analyzable__classification",
+            annotations,
+            users=self.get_org_members(request),
         )
 
     @action(
@@ -766,32 +770,39 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
             ]
         return users_of_organization
 
-    def __aggregation_response_static(self, annotations: dict, users=None) -> Response:
+    def __aggregation_response_static(
+        self,
+        field_name: str,
+        annotations: Dict[str, Callable[[Any], bool]],
+        users=None,
+    ) -> Response:
         """
         Generate a static aggregation of Job objects filtered by a time range.
 
-        This method applies the provided annotations to aggregate Job objects
-        within the specified time range. Optionally, it filters the results by
-        the given list of users.
+        For every date of the specified time range, this method counts
+        the jobs whose field value satisfies the condition of every annotation.
+        Optionally, it filters the results by the given list of users.
 
         Args:
-            annotations (dict): Annotations to apply for the aggregation.
+            field_name (str): The name of the field to aggregate by.
+            annotations (dict): The condition on the field value of every key.
             users (list, optional): A list of users to filter the Job objects by.
 
         Returns:
             Response: A Django REST framework Response object containing the aggregated data.
         """
         delta, basis = self.__parse_range(self.request)
-        filter_kwargs = {"received_request_time__gte": delta}
-        if users:
-            filter_kwargs["user__in"] = users
-        qs = (
-            Job.objects.filter(**filter_kwargs)
-            .annotate(date=Trunc("received_request_time", basis))
-            .values("date")
-            .annotate(**annotations)
-        )
-        return Response(qs)
+        aggregation = {}
+        for row in JobRollup.objects.aggregate_rows(field_name, delta, basis, users):
+            if row["count"] <= 0:
+                continue
+            date = aggregation.setdefault(
+                row["date"], {"date": row["date"], **{key: 0 for key in annotations}}
+            )
+            for key, condition in annotations.items():
+                if condition(row["value"]):
+                    date[key] += row["count"]
+        return Response(sorted(aggregation.values(), key=operator.itemgetter("date")))
 
     def __aggregation_response_dynamic(
         self,
@@ -803,67 +814,65 @@ class JobViewSet(ReadAndDeleteOnlyViewSet, SerializerActionMixin):
         """
         Dynamically aggregate Job objects based on a specified field and time range.
 
-        This method identifies the most frequent values of a given field within
+        This method identifies the values of a given field within
         a specified time range and aggregates the Job objects accordingly.
         Optionally, it can group the results by date and limit the number of
-        most frequent values.
+        values.
 
         Args:
             field_name (str): The name of the field to aggregate by.
             group_by_date (bool, optional): Whether to group the results by date. Defaults to True.
-            limit (int, optional): The maximum number of most frequent values to retrieve. Defaults to 5.
+            limit (int, optional): The maximum number of values to retrieve. Defaults to 5.
             users (list, optional): A list of users to filter the Job objects by.
 
         Returns:
-            Response: A Django REST framework Response object containing the most frequent values
+            Response: A Django REST framework Response object containing the values
             and the aggregated data.
         """
         delta, basis = self.__parse_range(self.request)
         logger.debug(f"{delta=}, {basis=}, {users=}")
-        filter_kwargs = {"received_request_time__gte": delta}
-        if users:
-            filter_kwargs["user__in"] = users
-
-        most_frequent_values = (
-            Job.objects.filter(**filter_kwargs)
-            .exclude(**{f"{field_name}__isnull": True})
-            .exclude(**{f"{field_name}__exact": ""})
-            # excluding those because they could lead to SQL query errors
-            .exclude(
-                analyzable__classification__in=[
-                    Classification.URL,
-                    Classification.GENERIC,
-                ]
-            )
-            .annotate(count=Count(field_name))
-            .distinct()
-            .order_by("-count")[:limit]
-            .values_list(field_name, flat=True)
-        )
+        rows = [
+            row
+            for row in JobRollup.objects.aggregate_rows(field_name, delta, basis, users)
+            if row["count"] > 0
+        ]
+        values_count = {}
+        for row in rows:
+            if row["value"] not in [None, ""] and row["classification"] not in [
+                # the jobs of urls and generic observables are not used
+                # to choose the values to show
+                Classification.URL,
+                Classification.GENERIC,
+            ]:
+                values_count[row["value"]] = (
+                    values_count.get(row["value"], 0) + row["count"]
+                )
+        most_frequent_values = sorted(
+            values_count, key=lambda value: (-values_count[value], value)
+        )[:limit]
 
         logger.info(
             f"request: {field_name} found most_frequent_values: {most_frequent_values}"
         )
 
-        if len(most_frequent_values):
-            annotations = {
-                val.replace(" ", "")
-                .replace("?", "")
-                .replace(";", ""): Count(field_name, filter=Q(**{field_name: val}))
+        if most_frequent_values:
+            keys = {
+                val: val.replace(" ", "").replace("?", "").replace(";", "")
                 for val in most_frequent_values
             }
-            logger.debug(f"request: {field_name} annotations: {annotations}")
+            logger.debug(f"request: {field_name} keys: {keys}")
+            totals = {}
+            for row in rows:
+                date = row["date"] if group_by_date else None
+                total = totals.setdefault(date, {key: 0 for key in keys.values()})
+                if row["value"] in keys:
+                    total[keys[row["value"]]] += row["count"]
             if group_by_date:
-                aggregation = (
-                    Job.objects.filter(**filter_kwargs)
-                    .annotate(date=Trunc("received_request_time", basis))
-                    .values("date")
-                    .annotate(**annotations)
-                )
+                aggregation = [
+                    {"date": date, **total} for date, total in sorted(totals.items())
+                ]
             else:
-                aggregation = Job.objects.filter(**filter_kwargs).aggregate(
-                    **annotations
-                )
+                aggregation = totals.get(None, {})
         else:
             aggregation = {}
 
@@ -1133,6 +1142,8 @@ class PythonReportActionViewSet(viewsets.GenericViewSet, metaclass=ABCMeta):
             )
         except StopIteration:
             raise RuntimeError(f"Unable to find signature for report {report.pk}")
+        # the report has been reset in bulk, without updating the job counters
+        report.job.refresh_reports_stats()
         runner = signature | tasks.job_set_final_status.signature(
             args=[report.job.id],
             kwargs={},
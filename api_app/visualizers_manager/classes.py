@@ -6,6 +6,7 @@ from enum import Enum
 from typing import Any, Dict, List, Tuple, Type, Union
 
 from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
 from api_app.analyzers_manager.models import MimeTypes
 from api_app.choices import PythonModuleBasePaths
@@ -538,6 +539,10 @@ class Visualizer(Plugin, metaclass=abc.ABCMeta):
     Page = VisualizablePage
     Level = VisualizableLevel
 
+    # paths of the analyzer reports read by the visualizer, by analyzer config name.
+    # See AbstractReportQuerySet.project
+    analyzer_reports_paths: Dict[str, List[str]] = {}
+
     @classmethod
     @property
     def python_base_path(cls):
@@ -599,6 +604,37 @@ class Visualizer(Plugin, metaclass=abc.ABCMeta):
 
         return AnalyzerReport.objects.filter(job=self._job)
 
+    @cached_property
+    def _projected_analyzer_reports(self) -> Dict[str, AbstractReport]:
+        reports = {}
+        for report in (
+            self.get_analyzer_reports()
+            .select_related("config")
+            .project(self.analyzer_reports_paths)
+        ):
+            report.job = self._job
+            reports[report.config.name] = report
+        return reports
+
+    def get_analyzer_report(self, config_name: str) -> AbstractReport:
+        """
+        Returns the analyzer report of the job of the config.
+        If the config is in analyzer_reports_paths, the report contains only
+        the values at its paths and every declared report is loaded
+        with the first call, in a single query.
+        Raises AnalyzerReport.DoesNotExist
+        """
+        from api_app.analyzers_manager.models import AnalyzerReport
+
+        if config_name not in self.analyzer_reports_paths:
+            return self.get_analyzer_reports().get(config__name=config_name)
+        try:
+            return self._projected_analyzer_reports[config_name]
+        except KeyError:
+            raise AnalyzerReport.DoesNotExist(
+                f"{config_name} report of job {self._job.pk} does not exist"
+            )
+
     def get_connector_reports(self) -> QuerySet:
         from api_app.connectors_manager.models import ConnectorReport
 
@@ -611,5 +647,6 @@ class Visualizer(Plugin, metaclass=abc.ABCMeta):
 
     def get_data_models(self) -> QuerySet:
         data_model_class = self._job.analyzable.get_data_model_class()
-        analyzer_reports_pk = [report.pk for report in self.get_analyzer_reports()]
-        return data_model_class.objects.filter(analyzers_report__in=analyzer_reports_pk)
+        return data_model_class.objects.filter(
+            analyzers_report__in=self.get_analyzer_reports().values("pk")
+        )
@@ -13,6 +13,7 @@ from api_app.visualizers_manager.validators import validate_report
 
 class VisualizerReport(AbstractReport):
     objects = VisualizerReportQuerySet.as_manager()
+    counted_in_job_stats = True
     config = models.ForeignKey(
         "VisualizerConfig", related_name="reports", null=False, on_delete=models.CASCADE
     )
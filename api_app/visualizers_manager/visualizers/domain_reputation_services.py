@@ -15,6 +15,20 @@ logger = getLogger(__name__)
 
 
 class DomainReputationServices(Visualizer):
+    analyzer_reports_paths = {
+        "VirusTotal_v3_Get_Observable": [
+            "data__attributes__last_analysis_stats__malicious",
+            "link",
+        ],
+        "URLhaus": ["query_status", "urlhaus_reference", "urlhaus_status"],
+        "ThreatFox": ["query_status", "data", "link"],
+        "Tranco": ["ranks"],
+        "Phishtank": ["results"],
+        "PhishingArmy": ["found", "link"],
+        "InQuest_REPdb": ["success", "data", "link"],
+        "OTXQuery": ["pulses"],
+    }
+
     @classmethod
     def update(cls) -> bool:
         pass
@@ -22,9 +36,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("VirusTotal")
     def _vt3(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(
-                config__name="VirusTotal_v3_Get_Observable"
-            )
+            analyzer_report = self.get_analyzer_report("VirusTotal_v3_Get_Observable")
         except AnalyzerReport.DoesNotExist:
             logger.warning("VirusTotal_v3_Get_Observable report does not exist")
             virustotal_report = self.Title(
@@ -58,7 +70,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("URLhaus")
     def _urlhaus(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(config__name="URLhaus")
+            analyzer_report = self.get_analyzer_report("URLhaus")
         except AnalyzerReport.DoesNotExist:
             logger.warning("URLhaus report does not exist")
         else:
@@ -86,7 +98,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("ThreatFox")
     def _threatfox(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(config__name="ThreatFox")
+            analyzer_report = self.get_analyzer_report("ThreatFox")
         except AnalyzerReport.DoesNotExist:
             logger.warning("Threatfox report does not exist")
         else:
@@ -112,7 +124,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("Tranco")
     def _tranco(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(config__name="Tranco")
+            analyzer_report = self.get_analyzer_report("Tranco")
         except AnalyzerReport.DoesNotExist:
             logger.warning("Tranco report does not exist")
         else:
@@ -134,7 +146,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("Phishtank")
     def _phishtank(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(config__name="Phishtank")
+            analyzer_report = self.get_analyzer_report("Phishtank")
         except AnalyzerReport.DoesNotExist:
             logger.warning("Phishtank report does not exist")
         else:
@@ -155,9 +167,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("PhishingArmy")
     def _phishing_army(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(
-                config__name="PhishingArmy"
-            )
+            analyzer_report = self.get_analyzer_report("PhishingArmy")
         except AnalyzerReport.DoesNotExist:
             logger.warning("PhishingArmy report does not exist")
         else:
@@ -177,9 +187,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("InQuest")
     def _inquest_repdb(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(
-                config__name="InQuest_REPdb"
-            )
+            analyzer_report = self.get_analyzer_report("InQuest_REPdb")
         except AnalyzerReport.DoesNotExist:
             logger.warning("InQuest_REPdb report does not exist")
         else:
@@ -204,7 +212,7 @@ class DomainReputationServices(Visualizer):
     @visualizable_error_handler_with_params("OTX Alienvault")
     def _otxquery(self):
         try:
-            analyzer_report = self.get_analyzer_reports().get(config__name="OTXQuery")
+            analyzer_report = self.get_analyzer_report("OTXQuery")
         except AnalyzerReport.DoesNotExist:
             logger.warning("OTXQuery report does not exist")
         else:
@@ -234,15 +242,19 @@ class DomainReputationServices(Visualizer):
         second_level_elements = []
         third_level_elements = []
 
-        for analyzer_report in self.get_analyzer_reports().filter(
-            Q(config__name__endswith="Malicious_Detector")
-            | Q(config__name="GoogleSafebrowsing")
+        for config_name, malicious in (
+            self.get_analyzer_reports()
+            .filter(
+                Q(config__name__endswith="Malicious_Detector")
+                | Q(config__name="GoogleSafebrowsing")
+            )
+            .values_list("config__name", "report__malicious")
         ):
-            printable_analyzer_name = analyzer_report.config.name.replace("_", " ")
+            printable_analyzer_name = config_name.replace("_", " ")
             third_level_elements.append(
                 self.Bool(
                     value=printable_analyzer_name,
-                    disable=not analyzer_report.report.get("malicious"),
+                    disable=not malicious,
                 )
             )
 
@@ -5,9 +5,7 @@ Passive DNS visualizer from the analyzers reports.
 import dataclasses
 import datetime
 import logging
-from typing import List
-
-from django.db.models import QuerySet
+from typing import Iterable, List
 
 from api_app.analyzers_manager.models import AnalyzerReport
 from api_app.analyzers_manager.observable_analyzers.circl_pdns import CIRCL_PDNS
@@ -36,19 +34,22 @@ class PDNSReport:
 
 
 def _extract_analyzer(
-    analyzer_reports: QuerySet, module: PythonModule, job: Job
+    analyzer_reports: Iterable[AnalyzerReport], module: PythonModule, job: Job
 ) -> AnalyzerReport:
-    try:
-        analyzer_report = analyzer_reports.get(config__python_module=module)
-        printable_analyzer_name = analyzer_report.config.name.replace("_", " ")
-        logger.debug(f"{printable_analyzer_name=}")
-    except AnalyzerReport.DoesNotExist:
-        logger.warning(f"job: {job.id}, {module} analyzer report doesn't exist")
-        return None
-    return analyzer_report
-
-
-def extract_otxquery_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSReport]:
+    # the reports are iterated, so that a list or an evaluated queryset
+    # can be shared by every extractor without further queries
+    for analyzer_report in analyzer_reports:
+        if analyzer_report.config.python_module_id == module.pk:
+            printable_analyzer_name = analyzer_report.config.name.replace("_", " ")
+            logger.debug(f"{printable_analyzer_name=}")
+            return analyzer_report
+    logger.warning(f"job: {job.id}, {module} analyzer report doesn't exist")
+    return None
+
+
+def extract_otxquery_reports(
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
+) -> List[PDNSReport]:
     otx_analyzer = _extract_analyzer(analyzer_reports, OTX.python_module, job)
     if otx_analyzer:
         otx_reports = otx_analyzer.report.get("passive_dns", [])
@@ -69,7 +70,7 @@ def extract_otxquery_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSR
 
 
 def extract_threatminer_reports(
-    analyzer_reports: QuerySet, job: Job
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
 ) -> List[PDNSReport]:
     threatminer_analyzer = _extract_analyzer(
         analyzer_reports, Threatminer.python_module, job
@@ -92,7 +93,9 @@ def extract_threatminer_reports(
     return []
 
 
-def extract_validin_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSReport]:
+def extract_validin_reports(
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
+) -> List[PDNSReport]:
     validin_analyzer = _extract_analyzer(analyzer_reports, Validin.python_module, job)
     if validin_analyzer:
         records = validin_analyzer.report.get("records", [])
@@ -122,7 +125,9 @@ def extract_validin_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSRe
     return []
 
 
-def extract_dnsdb_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSReport]:
+def extract_dnsdb_reports(
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
+) -> List[PDNSReport]:
     dnsdb_analyzer = _extract_analyzer(analyzer_reports, DNSdb.python_module, job)
     if dnsdb_analyzer:
         dnsdb_reports = dnsdb_analyzer.report.get("data", [])
@@ -146,7 +151,9 @@ def extract_dnsdb_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSRepo
     return []
 
 
-def extract_circlpdns_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSReport]:
+def extract_circlpdns_reports(
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
+) -> List[PDNSReport]:
     circlpdns_analyzer = _extract_analyzer(
         analyzer_reports, CIRCL_PDNS.python_module, job
     )
@@ -172,7 +179,9 @@ def extract_circlpdns_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNS
     return []
 
 
-def extract_robtex_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSReport]:
+def extract_robtex_reports(
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
+) -> List[PDNSReport]:
     robtex_analyzer = _extract_analyzer(analyzer_reports, Robtex.python_module, job)
     if robtex_analyzer:
         robtex_reports = robtex_analyzer.report
@@ -198,7 +207,7 @@ def extract_robtex_reports(analyzer_reports: QuerySet, job: Job) -> List[PDNSRep
 
 
 def extract_mnemonicpdns_reports(
-    analyzer_reports: QuerySet, job: Job
+    analyzer_reports: Iterable[AnalyzerReport], job: Job
 ) -> List[PDNSReport]:
     mnemonicpdns_analyzer = _extract_analyzer(
         analyzer_reports, MnemonicPassiveDNS.python_module, job
@@ -1,6 +1,15 @@
 from logging import getLogger
 from typing import Dict, List
 
+from api_app.analyzers_manager.observable_analyzers.circl_pdns import CIRCL_PDNS
+from api_app.analyzers_manager.observable_analyzers.dnsdb import DNSdb
+from api_app.analyzers_manager.observable_analyzers.mnemonic_pdns import (
+    MnemonicPassiveDNS,
+)
+from api_app.analyzers_manager.observable_analyzers.otx import OTX
+from api_app.analyzers_manager.observable_analyzers.robtex import Robtex
+from api_app.analyzers_manager.observable_analyzers.threatminer import Threatminer
+from api_app.analyzers_manager.observable_analyzers.validin import Validin
 from api_app.visualizers_manager.classes import Visualizer
 from api_app.visualizers_manager.visualizers.passive_dns.analyzer_extractor import (
     extract_circlpdns_reports,
@@ -25,28 +34,34 @@ class PassiveDNS(Visualizer):
         pass
 
     def run(self) -> List[Dict]:
-        raw_pdns_data = []
-        raw_pdns_data.extend(
-            extract_otxquery_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_threatminer_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_validin_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_dnsdb_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_circlpdns_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_robtex_reports(self.get_analyzer_reports(), self._job)
-        )
-        raw_pdns_data.extend(
-            extract_mnemonicpdns_reports(self.get_analyzer_reports(), self._job)
+        # the paths read by the extractors, by python module of the analyzer
+        analyzer_reports = (
+            self.get_analyzer_reports()
+            .select_related("config")
+            .project(
+                {
+                    OTX.python_module: ["passive_dns"],
+                    Threatminer.python_module: ["results"],
+                    Validin.python_module: ["records"],
+                    DNSdb.python_module: ["data"],
+                    CIRCL_PDNS.python_module: [""],
+                    Robtex.python_module: [""],
+                    MnemonicPassiveDNS.python_module: [""],
+                },
+                key="config__python_module",
+            )
         )
+        raw_pdns_data = []
+        for extract in [
+            extract_otxquery_reports,
+            extract_threatminer_reports,
+            extract_validin_reports,
+            extract_dnsdb_reports,
+            extract_circlpdns_reports,
+            extract_robtex_reports,
+            extract_mnemonicpdns_reports,
+        ]:
+            raw_pdns_data.extend(extract(analyzer_reports, self._job))
 
         page = self.Page(name="Passive DNS")
         page.add_level(
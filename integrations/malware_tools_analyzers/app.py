@@ -8,11 +8,13 @@ import logging
 import os
 import secrets
 import shutil
+import threading
 
 # web imports
 from pathlib import Path
+from typing import Callable, Dict, Optional
 
-from flask import Flask
+from flask import Flask, jsonify, request
 from flask_executor import Executor
 from flask_executor.futures import Future
 from flask_shell2http import Shell2HTTP
@@ -42,6 +44,58 @@ app.config["SECRET_KEY"] = secrets.token_hex(16)
 executor = Executor(app)
 shell2http = Shell2HTTP(app, executor)
 
+
+# a GET of a result with the ``wait_timeout`` argument waits for the command
+# to finish for at most these seconds (long polling), instead of answering
+# "running" immediately, so that the client does not have to poll continuously
+MAX_WAIT_TIMEOUT = 25
+
+
+# the waiters of a future are woken up before its done callbacks are run
+# (the ones completing the result and removing its temporary directory):
+# a result is served only after the last callback of its command has finished
+results_completed = threading.Condition()
+
+
+def complete_result(
+    callback_fn: Optional[Callable[[Dict, Future], None]] = None
+) -> Callable[[Dict, Future], None]:
+    # Shell2HTTP adds the callback of the command
+    # after the one removing the temporary directory, so it is the last one run
+    def callback(context, future: Future) -> None:
+        try:
+            if callback_fn:
+                callback_fn(context, future)
+        finally:
+            with results_completed:
+                future.result_completed = True
+                results_completed.notify_all()
+
+    return callback
+
+
+@app.before_request
+def wait_for_result():
+    key = request.args.get("key")
+    future = executor.futures._futures.get(key)  # skipcq PYL-W0212
+    if request.method != "GET" or not future:
+        return None
+    if request.args.get("wait", "").lower() == "true":
+        timeout = None
+    else:
+        timeout = min(
+            request.args.get("wait_timeout", default=0, type=float), MAX_WAIT_TIMEOUT
+        )
+    with results_completed:
+        completed = results_completed.wait_for(
+            lambda: getattr(future, "result_completed", False), timeout=timeout
+        )
+    if not completed:
+        return jsonify(status="running", key=key)
+    # the view serves the result
+    return None
+
+
 # we are changeing the directory for execution of
 #  artifacts script as it requires us to be in the
 #  same directory
@@ -132,58 +186,69 @@ def intercept_droidlysis_result(context, future: Future) -> None:
 
 # with this, we can make http calls to the endpoint: /peframe
 shell2http.register_command(
-    endpoint="peframe", command_name="/opt/deploy/peframe/venv/bin/peframe"
+    endpoint="peframe",
+    command_name="/opt/deploy/peframe/venv/bin/peframe",
+    callback_fn=complete_result(),
 )
 
 # with this, we can make http calls to the endpoint: /stringsifter
 shell2http.register_command(
     endpoint="stringsifter",
     command_name="/opt/deploy/stringsifter/wrapper.py",
+    callback_fn=complete_result(),
 )
 
 # with this, we can make http calls to the endpoint: /clamav
 shell2http.register_command(
-    endpoint="clamav", command_name="/usr/bin/clamdscan --allmatch --infected"
+    endpoint="clamav",
+    command_name="/usr/bin/clamdscan --allmatch --infected",
+    callback_fn=complete_result(),
 )
 
 # with this, we can make http calls to the endpoint: /boxjs
 shell2http.register_command(
     endpoint="boxjs",
     command_name="/usr/local/bin/box-js",
-    callback_fn=intercept_box_js_result,
+    callback_fn=complete_result(intercept_box_js_result),
 )
 
 # with this, we can make http calls to the endpoint: /apkid
 shell2http.register_command(
-    endpoint="apkid", command_name="/opt/deploy/apkid/venv/bin/apkid"
+    endpoint="apkid",
+    command_name="/opt/deploy/apkid/venv/bin/apkid",
+    callback_fn=complete_result(),
 )
 
 shell2http.register_command(
     endpoint="qiling",
     command_name="/opt/deploy/qiling/venv/bin/python3 /opt/deploy/qiling/analyze.py",
+    callback_fn=complete_result(),
 )
 
 # mobsfscan is the command for DroidLysis
 shell2http.register_command(
     endpoint="mobsf",
     command_name="/opt/deploy/mobsf/venv/bin/mobsfscan",
+    callback_fn=complete_result(),
 )
 
 # droidlysis is the command for DroidLysis
 shell2http.register_command(
     endpoint="droidlysis",
     command_name="/opt/deploy/droidlysis/venv/bin/droidlysis",
-    callback_fn=intercept_droidlysis_result,
+    callback_fn=complete_result(intercept_droidlysis_result),
 )
 
 # flake8: noqa
 shell2http.register_command(
     endpoint="artifacts",
     command_name="/opt/deploy/artifacts/venv/bin/python3 /opt/deploy/artifacts/artifacts/artifacts.py",
+    callback_fn=complete_result(),
 )
 
 # goresym is the command for GoReSym
 shell2http.register_command(
     endpoint="goresym",
     command_name="/usr/local/bin/goresym",
+    callback_fn=complete_result(),
 )
@@ -27,6 +27,7 @@ echo "running gunicorn"
 # start flask server
 exec /opt/deploy/flask/venv/bin/gunicorn 'app:app' \
     --bind '0.0.0.0:4002' \
+    --threads 8 \
     --user malware_tools_analyzers-user \
     --log-level "${LOG_LEVEL}" \
     --access-logfile "${LOG_PATH}/gunicorn_access.log" \
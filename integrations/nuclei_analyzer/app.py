@@ -1,9 +1,12 @@
 import json
 import logging
 import os
+import threading
+from typing import Callable, Dict, Optional
 
-from flask import Flask
+from flask import Flask, jsonify, request
 from flask_executor import Executor
+from flask_executor.futures import Future
 from flask_shell2http import Shell2HTTP
 
 # Logger configuration
@@ -42,6 +45,57 @@ executor = Executor(app)
 shell2http = Shell2HTTP(app=app, executor=executor)
 
 
+# a GET of a result with the ``wait_timeout`` argument waits for the command
+# to finish for at most these seconds (long polling), instead of answering
+# "running" immediately, so that the client does not have to poll continuously
+MAX_WAIT_TIMEOUT = 25
+
+
+# the waiters of a future are woken up before its done callbacks are run
+# (the ones completing the result and removing its temporary directory):
+# a result is served only after the last callback of its command has finished
+results_completed = threading.Condition()
+
+
+def complete_result(
+    callback_fn: Optional[Callable[[Dict, Future], None]] = None
+) -> Callable[[Dict, Future], None]:
+    # Shell2HTTP adds the callback of the command
+    # after the one removing the temporary directory, so it is the last one run
+    def callback(context, future: Future) -> None:
+        try:
+            if callback_fn:
+                callback_fn(context, future)
+        finally:
+            with results_completed:
+                future.result_completed = True
+                results_completed.notify_all()
+
+    return callback
+
+
+@app.before_request
+def wait_for_result():
+    key = request.args.get("key")
+    future = executor.futures._futures.get(key)  # skipcq PYL-W0212
+    if request.method != "GET" or not future:
+        return None
+    if request.args.get("wait", "").lower() == "true":
+        timeout = None
+    else:
+        timeout = min(
+            request.args.get("wait_timeout", default=0, type=float), MAX_WAIT_TIMEOUT
+        )
+    with results_completed:
+        completed = results_completed.wait_for(
+            lambda: getattr(future, "result_completed", False), timeout=timeout
+        )
+    if not completed:
+        return jsonify(status="running", key=key)
+    # the view serves the result
+    return None
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     return {"status": "healthy"}, 200
@@ -73,7 +127,7 @@ def my_callback_fn(context, future):
 shell2http.register_command(
     endpoint="run-nuclei",
     command_name="nuclei -j -ud /opt/nuclei-api/nuclei-templates -u",
-    callback_fn=my_callback_fn,
+    callback_fn=complete_result(my_callback_fn),
 )
 
 
@@ -15,6 +15,7 @@ crontab /etc/cron.d/suricata
 suricata --unix-socket=/tmp/suricata.socket &
 exec gunicorn 'app:app' \
     --bind '0.0.0.0:4004' \
+    --threads 8 \
     --user "${USER}" \
     --log-level "${LOG_LEVEL}" \
     --access-logfile "${LOG_PATH}"/gunicorn_access.log \
@@ -7,6 +7,7 @@
 
 /usr/local/bin/gunicorn 'app:app' \
     --bind '0.0.0.0:4005' \
+    --threads 8 \
     --log-level "${LOG_LEVEL}" \
     --user phishing-user \
     --group phishing-user \
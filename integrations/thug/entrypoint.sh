@@ -8,6 +8,7 @@ echo "running gunicorn"
 # start flask server
 /usr/local/bin/gunicorn 'app:app' \
     --bind '0.0.0.0:4002' \
+    --threads 8 \
     --user thug \
     --log-level "${LOG_LEVEL}" \
     --access-logfile "${LOG_PATH}"/gunicorn_access.log \
@@ -149,7 +149,8 @@ app.conf.beat_schedule = {
     },
     "remove_old_jobs": {
         "task": "intel_owl.tasks.remove_old_jobs",
-        "schedule": crontab(minute="10", hour="2"),
+        # every hour: the purge is throttled and done in small batches
+        "schedule": crontab(minute="10"),
         "options": {
             "queue": get_queue_name(settings.DEFAULT_QUEUE),
             "MessageGroupId": str(uuid.uuid4()),
@@ -0,0 +1,214 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+"""
+Per node, content addressed cache of the samples
+downloaded from a remote storage (S3).
+
+Every sample is saved once, as ``<root>/<sha256[:2]>/<sha256>``,
+and it is shared by all the file analyzers running on the node,
+in every worker process.
+
+- A process using a sample holds a shared ``flock`` on ``<sample>.lock``:
+  the kernel does the reference counting across processes
+  and a crashed worker can not leak a reference.
+- A sample is downloaded while holding an exclusive ``flock``
+  on ``<sample>.fill``, into a temporary file that is renamed
+  only when complete and verified: parallel workers wait for the first
+  download instead of starting their own and never read a partial file.
+- When the total size is over the budget, the least recently used samples
+  (by mtime, updated on every hit) are evicted, skipping the ones in use.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+from typing import IO, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SampleCache:
+    CHUNK_SIZE = 1024 * 1024
+    LOCK_SUFFIX = ".lock"
+    FILL_SUFFIX = ".fill"
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, root: str, max_size: int):
+        """
+        Args:
+            root (str): directory of the cache
+            max_size (int): disk budget in bytes
+        """
+        self.root = str(root)
+        self.max_size = max_size
+        # sha256 -> file descriptors of the locks held by this process
+        self._references: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    @staticmethod
+    def _open_locked(path: str, operation: int) -> int:
+        """
+        Opens and locks ``path``, retrying if the file was replaced
+        (ie deleted by an eviction) while waiting for the lock.
+        """
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, operation)
+                if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+
+    def acquire(self, sha256: str, fetch: Callable[[IO[bytes]], None]) -> str:
+        """
+        Returns the local path of the sample, downloading it if it is missing.
+        The sample can not be evicted until `release` is called.
+
+        Args:
+            sha256 (str): sha256 of the sample
+            fetch (Callable): function that writes the content
+                of the sample into the given binary file
+
+        Raises:
+            ValueError: if the downloaded content does not match ``sha256``
+        """
+        path = self.path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        reference = self._open_locked(path + self.LOCK_SUFFIX, fcntl.LOCK_SH)
+        try:
+            if os.path.exists(path):
+                # hit: the sample is now the most recently used
+                os.utime(path)
+            else:
+                self._fill(sha256, fetch)
+        except BaseException:
+            os.close(reference)
+            raise
+        with self._lock:
+            self._references.setdefault(sha256, []).append(reference)
+        return path
+
+    def _fill(self, sha256: str, fetch: Callable[[IO[bytes]], None]) -> None:
+        path = self.path(sha256)
+        fill_lock = self._open_locked(path + self.FILL_SUFFIX, fcntl.LOCK_EX)
+        try:
+            # another process may have downloaded it while we were waiting
+            if os.path.exists(path):
+                return
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{self.TMP_SUFFIX}"
+            try:
+                with open(tmp_path, "wb") as f:
+                    fetch(f)
+                digest = hashlib.sha256()
+                with open(tmp_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                if digest.hexdigest() != sha256:
+                    raise ValueError(
+                        f"Sample {sha256} downloaded with sha256 {digest.hexdigest()}"
+                    )
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"Sample {sha256} saved in the sample cache")
+        finally:
+            os.close(fill_lock)
+        self.evict(keep=sha256)
+
+    def release(self, sha256: str) -> None:
+        """
+        Releases a reference taken with `acquire`.
+        """
+        with self._lock:
+            references = self._references.get(sha256)
+            if not references:
+                logger.warning(f"Sample {sha256} released but not acquired")
+                return
+            reference = references.pop()
+            if not references:
+                del self._references[sha256]
+        os.close(reference)
+
+    def _samples(self) -> List[os.DirEntry]:
+        samples = []
+        if not os.path.isdir(self.root):
+            return samples
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.is_file() and "." not in entry.name:
+                    samples.append(entry)
+        return samples
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._samples())
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Deletes the least recently used samples that are not in use
+        until the cache is within its budget.
+
+        Returns:
+            List[str]: sha256 of the evicted samples
+        """
+        samples = self._samples()
+        size = sum(entry.stat().st_size for entry in samples)
+        evicted = []
+        for entry in sorted(samples, key=lambda e: e.stat().st_mtime_ns):
+            if size <= self.max_size:
+                break
+            if entry.name == keep:
+                continue
+            lock_path = entry.path + self.LOCK_SUFFIX
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                # a shared lock is held by every process using the sample
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            try:
+                sample_size = entry.stat().st_size
+                os.remove(entry.path)
+                for suffix in (self.FILL_SUFFIX, self.LOCK_SUFFIX):
+                    try:
+                        os.remove(entry.path + suffix)
+                    except FileNotFoundError:
+                        pass
+            finally:
+                os.close(fd)
+            size -= sample_size
+            evicted.append(entry.name)
+            logger.info(f"Sample {entry.name} evicted from the sample cache")
+        return evicted
+
+
+_sample_cache: Optional[SampleCache] = None
+
+
+def get_sample_cache() -> SampleCache:
+    """
+    Returns the sample cache of the process,
+    configured with SAMPLE_CACHE_ROOT and SAMPLE_CACHE_MAX_SIZE.
+    """
+    from django.conf import settings
+
+    global _sample_cache
+    if _sample_cache is None:
+        _sample_cache = SampleCache(
+            settings.SAMPLE_CACHE_ROOT, settings.SAMPLE_CACHE_MAX_SIZE
+        )
+    return _sample_cache
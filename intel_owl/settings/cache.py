@@ -1,9 +1,16 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
-from typing import Any, Dict
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Iterable, List, Set
 
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
 from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
 from django.db import ProgrammingError, connections, router
+from django.utils.module_loading import import_string
+
+from ._util import get_secret
 
 
 def plain_key(key, key_prefix, version):
@@ -37,11 +44,330 @@ class DatabaseCacheExtended(DatabaseCache):
             return {}
         return self.get_many([row[0] for row in rows], version=version)
 
+    def delete_where(self, starts_with: str, version=None) -> List[str]:
+        """
+        Deletes every key starting with `starts_with`.
+        Returns the deleted keys.
+        """
+        keys = list(self.get_where(starts_with, version=version).keys())
+        if keys:
+            self.delete_many(keys, version=version)
+        return keys
+
+
+class KeySetCacheMixin(metaclass=ABCMeta):
+    """
+    Prefix lookups without scanning the whole cache.
+
+    Every key starting with one of the INDEXED_PREFIXES is added
+    to a key set for each of its `_` separated prefixes, so that
+    `list_AnalyzerConfig_user_1_10` is found by `get_where("list_AnalyzerConfig_")`
+    and by `get_where("list_AnalyzerConfig_user")`, reading only the keys it contains.
+
+    Unlike a LIKE scan, a prefix without the trailing `_` matches only whole
+    segments: `get_where("list_AnalyzerConfig_user")` does not return
+    the keys of the user `user2`.
+    The other prefixes fall back to a scan of the keys.
+
+    Sets are never expired, the keys that are not in the cache anymore
+    are removed from them when they are read.
+    """
+
+    INDEXED_PREFIXES = ("list_", "serializer_")
+    SEPARATOR = "_"
+
+    @classmethod
+    def _key_sets(cls, key: str) -> List[str]:
+        if not key.startswith(cls.INDEXED_PREFIXES):
+            return []
+        segments = key.split(cls.SEPARATOR)
+        return [
+            cls.SEPARATOR.join(segments[:i]) + cls.SEPARATOR
+            for i in range(1, len(segments))
+        ]
+
+    def _index(self, keys: Iterable[str]) -> None:
+        key_sets: Dict[str, Set[str]] = {}
+        for key in keys:
+            for key_set in self._key_sets(key):
+                key_sets.setdefault(key_set, set()).add(key)
+        if key_sets:
+            self._add_to_key_sets(key_sets)
+
+    @abstractmethod
+    def _add_to_key_sets(self, key_sets: Dict[str, Set[str]]) -> None:
+        pass
+
+    @abstractmethod
+    def _key_set_members(self, key_set: str) -> Set[str]:
+        pass
+
+    @abstractmethod
+    def _remove_from_key_set(self, key_set: str, keys: Iterable[str]) -> None:
+        pass
+
+    @abstractmethod
+    def _scan(self, starts_with: str) -> Set[str]:
+        pass
+
+    def get_where(self, starts_with: str, version=None) -> Dict[str, Any]:
+        """
+        Usage: cache.get_where('string')
+        """
+        if not starts_with.startswith(self.INDEXED_PREFIXES):
+            return self.get_many(self._scan(starts_with), version=version)
+        if starts_with.endswith(self.SEPARATOR):
+            key_set = starts_with
+            keys = self._key_set_members(key_set)
+        else:
+            # the key itself and every key that has it as prefix
+            key_set = starts_with + self.SEPARATOR
+            keys = self._key_set_members(key_set) | {starts_with}
+        result = self.get_many(keys, version=version)
+        expired = keys - set(result) - {starts_with}
+        if expired:
+            self._remove_from_key_set(key_set, expired)
+        return result
+
+    def delete_where(self, starts_with: str, version=None) -> List[str]:
+        """
+        Deletes every key starting with `starts_with`.
+        Returns the deleted keys.
+        """
+        keys = list(self.get_where(starts_with, version=version).keys())
+        if keys:
+            self.delete_many(keys, version=version)
+        return keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = super().add(key, value, timeout=timeout, version=version)
+        if added:
+            self._index([key])
+        return added
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout=timeout, version=version)
+        self._index([key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = super().set_many(data, timeout=timeout, version=version)
+        self._index(key for key in data if key not in failed)
+        return failed
+
+
+# key set name -> keys, for every local memory cache
+_key_sets: Dict[str, Dict[str, Set[str]]] = {}
+
+
+class LocMemCacheExtended(KeySetCacheMixin, LocMemCache):
+    """
+    Local memory cache of the single process, with prefix lookups.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._sets = _key_sets.setdefault(name, {})
+
+    def _add_to_key_sets(self, key_sets: Dict[str, Set[str]]) -> None:
+        with self._lock:
+            for key_set, keys in key_sets.items():
+                self._sets.setdefault(key_set, set()).update(keys)
+
+    def _key_set_members(self, key_set: str) -> Set[str]:
+        with self._lock:
+            return set(self._sets.get(key_set, ()))
+
+    def _remove_from_key_set(self, key_set: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._sets.get(key_set, set()).difference_update(keys)
+
+    def _scan(self, starts_with: str) -> Set[str]:
+        with self._lock:
+            return {key for key in self._cache if key.startswith(starts_with)}
 
-CACHES = {
-    "default": {
-        "BACKEND": "intel_owl.settings.cache.DatabaseCacheExtended",
-        "LOCATION": "intelowl_cache",
-        "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._sets.clear()
+
+
+class RedisCacheExtended(KeySetCacheMixin, RedisCache):
+    """
+    Redis cache, shared by every process, with prefix lookups.
+    Key sets are stored as redis sets.
+    """
+
+    KEY_SET_PREFIX = "keyset:"
+
+    def _key_set_name(self, key_set: str) -> str:
+        return self.make_and_validate_key(f"{self.KEY_SET_PREFIX}{key_set}")
+
+    def _add_to_key_sets(self, key_sets: Dict[str, Set[str]]) -> None:
+        pipeline = self._cache.get_client(write=True).pipeline()
+        for key_set, keys in key_sets.items():
+            pipeline.sadd(self._key_set_name(key_set), *keys)
+        pipeline.execute()
+
+    def _key_set_members(self, key_set: str) -> Set[str]:
+        client = self._cache.get_client()
+        return {key.decode() for key in client.smembers(self._key_set_name(key_set))}
+
+    def _remove_from_key_set(self, key_set: str, keys: Iterable[str]) -> None:
+        self._cache.get_client(write=True).srem(self._key_set_name(key_set), *keys)
+
+    def _scan(self, starts_with: str) -> Set[str]:
+        client = self._cache.get_client()
+        return {
+            key.decode()
+            for key in client.scan_iter(match=f"{starts_with}*")
+            if not key.startswith(self.KEY_SET_PREFIX.encode())
+        }
+
+
+class TieredCache(BaseCache):
+    """
+    Two levels cache: a small local memory cache (L1)
+    in front of a shared cache (L2), usually redis.
+
+    The L1 is private to the process, so the entries are kept there
+    for at most L1_TIMEOUT seconds: a change made by another process
+    is visible after, at most, that delay.
+
+    Params:
+        L2: the configuration of the shared cache, like an entry of CACHES
+        L1_TIMEOUT: seconds an entry is kept in the L1
+        L1_MAX_ENTRIES: maximum number of entries of the L1
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        l2 = params["L2"]
+        self.l2: BaseCache = import_string(l2["BACKEND"])(l2.get("LOCATION", ""), l2)
+        self.l1_timeout = params.get("L1_TIMEOUT", 5)
+        self.l1 = LocMemCache(
+            f"l1-{location}",
+            {
+                "TIMEOUT": self.l1_timeout,
+                "KEY_FUNCTION": params.get("KEY_FUNCTION"),
+                "OPTIONS": {"MAX_ENTRIES": params.get("L1_MAX_ENTRIES", 1000)},
+            },
+        )
+        self._missing = object()
+
+    def _l1_timeout(self, timeout) -> int:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, self._missing, version=version)
+        if value is self._missing:
+            value = self.l2.get(key, self._missing, version=version)
+            if value is self._missing:
+                return default
+            self.l1.set(key, value, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        result = self.l1.get_many(keys, version=version)
+        missing = [key for key in keys if key not in result]
+        if missing:
+            from_l2 = self.l2.get_many(missing, version=version)
+            self.l1.set_many(from_l2, version=version)
+            result.update(from_l2)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout=timeout, version=version)
+        self.l1.set(key, value, timeout=self._l1_timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout=timeout, version=version)
+        self.l1.set_many(
+            {key: value for key, value in data.items() if key not in failed},
+            timeout=self._l1_timeout(timeout),
+            version=version,
+        )
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        if added:
+            self.l1.set(key, value, timeout=self._l1_timeout(timeout), version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.l1.delete_many(keys, version=version)
+        self.l2.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self.l1.has_key(key, version=version) or self.l2.has_key(
+            key, version=version
+        )
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.incr(key, delta=delta, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    def get_where(self, starts_with: str, version=None) -> Dict[str, Any]:
+        return self.l2.get_where(starts_with, version=version)
+
+    def delete_where(self, starts_with: str, version=None) -> List[str]:
+        keys = self.l2.delete_where(starts_with, version=version)
+        self.l1.delete_many(keys, version=version)
+        return keys
+
+
+# database (default), redis or locmem
+CACHE_BACKEND = get_secret("CACHE_BACKEND", "database")
+CACHE_REDIS_URL = get_secret("CACHE_REDIS_URL", "redis://redis:6379/2")
+CACHE_L1_TIMEOUT = int(get_secret("CACHE_L1_TIMEOUT", 5))
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "intel_owl.settings.cache.TieredCache",
+            "LOCATION": "intelowl_cache",
+            "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+            "L1_TIMEOUT": CACHE_L1_TIMEOUT,
+            "L2": {
+                "BACKEND": "intel_owl.settings.cache.RedisCacheExtended",
+                "LOCATION": CACHE_REDIS_URL,
+                "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+            },
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "intel_owl.settings.cache.LocMemCacheExtended",
+            "LOCATION": "intelowl_cache",
+            "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "intel_owl.settings.cache.DatabaseCacheExtended",
+            "LOCATION": "intelowl_cache",
+            "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+        }
     }
-}
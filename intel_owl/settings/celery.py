@@ -22,3 +22,7 @@ CELERY_QUEUES = get_secret("CELERY_QUEUES", DEFAULT_QUEUE).split(",")
 for queue in [DEFAULT_QUEUE, CONFIG_QUEUE]:
     if queue not in CELERY_QUEUES:
         CELERY_QUEUES.append(queue)
+
+# "chain" runs the stages of a job one after the other in a single canvas,
+# "event" dispatches every stage as soon as the stages it depends on are completed
+JOB_EXECUTOR = get_secret("JOB_EXECUTOR", "chain")
@@ -15,6 +15,30 @@ MEDIA_ROOT = BASE_DIR / "files_required"
 CONFIG_ROOT = PROJECT_LOCATION / "configuration"
 BLINT_REPORTS_PATH = MEDIA_ROOT / "blint"
 YARA_RULES_PATH = MEDIA_ROOT / "yara"  # path for manual yara rules
+# memory budget in bytes of the compiled yara rules kept by every worker process
+YARA_RULES_CACHE_MAX_SIZE = int(get_secret("YARA_RULES_CACHE_MAX_SIZE", 1024**3))
+# HTTP client of the plugins (api_app.http_client)
+# keep-alive connections kept for every host of a third party service
+HTTP_POOL_MAXSIZE = int(get_secret("HTTP_POOL_MAXSIZE", 10))
+# rate limits of the third party services, for every API key,
+# like "virustotal=4/60,tranco=1/1" (requests/seconds)
+HTTP_RATE_LIMITS = {
+    service.strip(): tuple(float(value) for value in rate.split("/"))
+    for service, rate in (
+        limit.split("=")
+        for limit in get_secret("HTTP_RATE_LIMITS", "").split(",")
+        if limit.strip()
+    )
+}
+# maximum seconds a request waits for the rate limit before failing
+HTTP_RATE_LIMIT_MAX_WAIT = int(get_secret("HTTP_RATE_LIMIT_MAX_WAIT", 60))
+# redis shared by the workers for the rate limits, kept in the process if empty
+HTTP_RATE_LIMIT_REDIS_URL = get_secret(
+    "HTTP_RATE_LIMIT_REDIS_URL", "redis://redis:6379/3"
+)
+# maximum concurrent requests of a VirusTotal analyzer for the relationships
+# and the other additional details of a report
+VT_MAX_CONCURRENT_REQUESTS = int(get_secret("VT_MAX_CONCURRENT_REQUESTS", 4))
 
 LOG_DIR = Path("/") / "var" / "log" / "intel_owl"
 # test / ci
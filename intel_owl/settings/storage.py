@@ -1,7 +1,7 @@
 # This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
 # See the file 'LICENSE' for copying permission.
 
-import os
+import shutil
 
 from django.core.files.storage import FileSystemStorage
 
@@ -19,40 +19,45 @@ STATICFILES_DIRS = [
 
 NFS = get_secret("NFS", "False") == "True"
 LOCAL_STORAGE = get_secret("LOCAL_STORAGE", "True") == "True"
+# local cache of the samples downloaded from S3
+SAMPLE_CACHE_ROOT = MEDIA_ROOT / "samples"
+SAMPLE_CACHE_MAX_SIZE = int(get_secret("SAMPLE_CACHE_MAX_SIZE", 2 * 1024**3))
 # Storage settings
 if LOCAL_STORAGE:
 
     class FileSystemStorageWrapper(FileSystemStorage):
         @staticmethod
-        def retrieve(file, analyzer):
+        def retrieve(file, sha256):
             # we have one single sample for every analyzer
             return file.path
 
+        @staticmethod
+        def release(sha256):
+            pass
+
     DEFAULT_FILE_STORAGE = "intel_owl.settings.FileSystemStorageWrapper"
 else:
     from storages.backends.s3boto3 import S3Boto3Storage
 
     class S3Boto3StorageWrapper(S3Boto3Storage):
-        def retrieve(self, file, analyzer):
-            # FIXME we can optimize this a lot.
-            #  Right now we are doing an http request FOR analyzer. We can have a
-            #  proxy that will store the content and then save it locally
-
-            # The idea is to download the file in MEDIA_ROOT/analyzer/namefile
-            # if it does not exist
-            path_dir = os.path.join(MEDIA_ROOT, analyzer)
-            name = file.name
-            _path = os.path.join(path_dir, name)
-            if not os.path.exists(_path):
-                os.makedirs(path_dir, exist_ok=True)
-                if not self.exists(name):
+        def retrieve(self, file, sha256):
+            # the sample is downloaded once for every node
+            # and shared by every analyzer, until `release` is called
+            from intel_owl.sample_cache import get_sample_cache
+
+            def fetch(local_file_object):
+                if not self.exists(file.name):
                     raise AssertionError
-                with self.open(name) as s3_file_object:
-                    content = s3_file_object.read()
-                    s3_file_object.seek(0)
-                    with open(_path, "wb") as local_file_object:
-                        local_file_object.write(content)
-            return _path
+                with self.open(file.name) as s3_file_object:
+                    shutil.copyfileobj(s3_file_object, local_file_object)
+
+            return get_sample_cache().acquire(sha256, fetch)
+
+        @staticmethod
+        def release(sha256):
+            from intel_owl.sample_cache import get_sample_cache
+
+            get_sample_cache().release(sha256)
 
     DEFAULT_FILE_STORAGE = "intel_owl.settings.S3Boto3StorageWrapper"
     AWS_STORAGE_BUCKET_NAME = secrets.get_secret("AWS_STORAGE_BUCKET_NAME")
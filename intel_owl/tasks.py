@@ -85,23 +85,18 @@ def remove_old_jobs():
     logger.info("started remove_old_jobs")
 
     retention_days = int(secrets.get_secret("OLD_JOBS_RETENTION_DAYS", 14))
+    batch_size = int(secrets.get_secret("OLD_JOBS_DELETION_BATCH_SIZE", 500))
+    # maximum number of jobs deleted every second, 0 means no limit
+    max_rate = float(secrets.get_secret("OLD_JOBS_DELETION_MAX_RATE", 200))
     date_to_check = now() - datetime.timedelta(days=retention_days)
-    old_jobs = Job.objects.filter(finished_analysis_time__lt=date_to_check)
-    num_jobs_to_delete = old_jobs.count()
-    logger.info(f"found {num_jobs_to_delete} old jobs to delete")
-    for old_job in old_jobs.iterator():
-        # if the job that we are going to delete is the last one, and it has a file
-        if old_job.analyzable.jobs.count() == 1 and old_job.analyzable.file:
-            old_job.analyzable.file.delete()
-        try:
-            old_job.delete()
-        except Job.DoesNotExist as e:
-            logger.warning(
-                f"job {old_job.id} does not exist. Err: {e}", stack_info=True
-            )
+    # the purge is done in small batches, each one committed on its own:
+    # if the task is interrupted, the next execution continues from there
+    num_jobs_deleted = Job.objects.filter(
+        finished_analysis_time__lt=date_to_check
+    ).purge(batch_size=batch_size, max_rate=max_rate)
 
-    logger.info("finished remove_old_jobs")
-    return num_jobs_to_delete
+    logger.info(f"finished remove_old_jobs: deleted {num_jobs_deleted} jobs")
+    return num_jobs_deleted
 
 
 @shared_task(base=FailureLoggedTask)
@@ -127,7 +122,7 @@ def check_stuck_analysis(minutes_ago: int = 25, check_pending: bool = False):
     to avoid special exceptions,
     we can just put this function as a cron to cleanup.
     """
-    from api_app.models import Job
+    from api_app.models import Job, JobStage
 
     def fail_job(job):
         logger.error(
@@ -139,6 +134,8 @@ def check_stuck_analysis(minutes_ago: int = 25, check_pending: bool = False):
         job.save(update_fields=["status", "finished_analysis_time"])
 
     logger.info("started check_stuck_analysis")
+    # event executor: the stages whose tasks died never dispatch the next ones
+    JobStage.objects.complete_stale(minutes_ago=minutes_ago)
     running_jobs = Job.objects.running(
         check_pending=check_pending, minutes_ago=minutes_ago
     )
@@ -229,14 +226,18 @@ def update_notifications_with_releases():
 
 
 @app.task(name="job_set_final_status", soft_time_limit=30)
-def job_set_final_status(job_id: int):
-    from api_app.models import Job
+def job_set_final_status(job_id: int, job_stage: str = None):
+    from api_app.models import Job, JobStage
     from api_app.websocket import JobConsumer
 
-    job = Job.objects.get(pk=job_id)
-    # execute some callbacks
-    job.set_final_status()
-    JobConsumer.serialize_and_send_job(job)
+    try:
+        job = Job.objects.get(pk=job_id)
+        # execute some callbacks
+        job.set_final_status()
+        JobConsumer.serialize_and_send_job(job)
+    finally:
+        if job_stage:
+            JobStage.objects.task_completed(job_id, job_stage)
 
 
 @shared_task(base=FailureLoggedTask, name="job_set_pipeline_status", soft_time_limit=30)
@@ -252,14 +253,12 @@ def job_set_pipeline_status(job_id: int, status: str):
 
 
 @shared_task(base=FailureLoggedTask, name="job_pipeline", soft_time_limit=100)
-def job_pipeline(
-    job_id: int,
-):
+def job_pipeline(job_id: int, executor: str = None):
     from api_app.models import Job
 
     job = Job.objects.get(pk=job_id)
     try:
-        job.execute()
+        job.execute(executor)
     except Exception as e:
         logger.exception(e)
         for report in (
@@ -279,37 +278,46 @@ def run_plugin(
     plugin_config_pk: str,
     runtime_configuration: dict,
     task_id: int,
+    job_stage: str = None,
 ):
     from api_app.classes import Plugin
-    from api_app.models import Job, PythonModule
+    from api_app.models import Job, JobStage, PythonModule
     from api_app.websocket import JobConsumer
 
     logger.info(
         f"Configuring plugin {plugin_config_pk} for job {job_id} with task {task_id}"
     )
-    plugin_class: typing.Type[Plugin] = PythonModule.objects.get(
-        pk=python_module_pk
-    ).python_class
-    config = plugin_class.config_model.objects.get(pk=plugin_config_pk)
-    plugin = plugin_class(
-        config=config,
-    )
-    logger.info(
-        f"Starting plugin {plugin_config_pk} for job {job_id} with task {task_id}"
-    )
     try:
-        plugin.start(
-            job_id=job_id,
-            runtime_configuration=runtime_configuration,
-            task_id=task_id,
+        plugin_class: typing.Type[Plugin] = PythonModule.objects.get(
+            pk=python_module_pk
+        ).python_class
+        config = plugin_class.config_model.objects.get(pk=plugin_config_pk)
+        plugin = plugin_class(
+            config=config,
         )
-    except Exception as e:
-        logger.exception(e)
-        config.reports.filter(job__pk=job_id).update(
-            status=plugin.report_model.STATUSES.FAILED.value
+        logger.info(
+            f"Starting plugin {plugin_config_pk} for job {job_id} with task {task_id}"
         )
-    job = Job.objects.get(pk=job_id)
-    JobConsumer.serialize_and_send_job(job)
+        try:
+            plugin.start(
+                job_id=job_id,
+                runtime_configuration=runtime_configuration,
+                task_id=task_id,
+            )
+        except Exception as e:
+            logger.exception(e)
+            config.reports.filter(job__pk=job_id).update(
+                status=plugin.report_model.STATUSES.FAILED.value
+            )
+            # the report counters of the job are not updated by a queryset update
+            Job.objects.get(pk=job_id).refresh_reports_stats()
+        job = Job.objects.get(pk=job_id)
+        JobConsumer.serialize_and_send_job(job)
+    finally:
+        if job_stage:
+            # event executor: the last plugin of the stage dispatches the next ones,
+            # the stages of the dead workers are completed by check_stuck_analysis
+            JobStage.objects.task_completed(job_id, job_stage)
 
 
 @shared_task(base=FailureLoggedTask, name="create_caches", soft_time_limit=200)
@@ -151,6 +151,26 @@ class TestAnalyzablesViewSet(CustomViewSetTestCase):
         )
         self.assertEqual(result["results"][0]["name"], "test.com")
 
+    def test_list_search(self, *args, **kwargs):
+        self.client.force_authenticate(user=self.user)
+        for query, expected in [
+            ({"search": "TEST."}, [self.an.name]),
+            ({"search": self.an.sha256}, [self.an.name]),
+            ({"search": self.an.sha1.upper()}, [self.an.name]),
+            ({"search": "f9bc35a57b22f82c94dbcc420f71b903"}, [self.an2.name]),
+            ({"md5": self.an3.md5[:10]}, [self.an3.name]),
+            ({"md5": self.an3.md5}, [self.an3.name]),
+            ({"md5": self.an3.sha256}, [self.an3.name]),
+            ({"md5": "0" * 32}, []),
+        ]:
+            response = self.client.get(self.URL, query)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertCountEqual(
+                expected,
+                [analyzable["name"] for analyzable in response.json()["results"]],
+                query,
+            )
+
     def test_get(self, *args, **kwargs):
         # check generic is returned without the wrong data model
         self.client.force_authenticate(user=self.user)
@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from api_app.analyzers_manager.feeds import CIDRIndex, FeedStore
+
+
+class FeedStoreTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        FeedStore.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "feed.txt")
+
+    def tearDown(self):
+        super().tearDown()
+        FeedStore.clear()
+        self.directory.cleanup()
+
+    def _write(self, content: str, mtime_ns: int):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_lines(self):
+        self._write("1.2.3.4\n5.6.7.8\n", 1_000_000_000)
+        db = FeedStore.lines(self.path)
+        self.assertIn("1.2.3.4", db)
+        self.assertIn("5.6.7.8", db)
+        self.assertNotIn("8.8.8.8", db)
+
+    def test_parsed_once(self):
+        self._write("1.2.3.4\n", 1_000_000_000)
+        FeedStore.lines(self.path)
+        with patch("builtins.open") as mocked_open:
+            db = FeedStore.lines(self.path)
+            mocked_open.assert_not_called()
+        self.assertIn("1.2.3.4", db)
+
+    def test_reload_on_change(self):
+        self._write("1.2.3.4\n", 1_000_000_000)
+        self.assertIn("1.2.3.4", FeedStore.lines(self.path))
+        self._write("5.6.7.8\n", 2_000_000_000)
+        db = FeedStore.lines(self.path)
+        self.assertNotIn("1.2.3.4", db)
+        self.assertIn("5.6.7.8", db)
+
+    def test_invalidate(self):
+        self._write("1.2.3.4\n", 1_000_000_000)
+        FeedStore.lines(self.path)
+        # same mtime and size: only an explicit invalidation triggers a reload
+        self._write("5.6.7.8\n", 1_000_000_000)
+        self.assertIn("1.2.3.4", FeedStore.lines(self.path))
+        FeedStore.invalidate(self.path)
+        self.assertIn("5.6.7.8", FeedStore.lines(self.path))
+
+    def test_json_index(self):
+        self._write(
+            json.dumps(
+                [
+                    {"value": "1.2.3.4", "user": "a"},
+                    {"value": "5.6.7.8", "user": "b"},
+                    {"value": "1.2.3.4", "user": "c"},
+                ]
+            ),
+            1_000_000_000,
+        )
+        db = FeedStore.json_index(self.path, "value")
+        self.assertEqual([item["user"] for item in db["1.2.3.4"]], ["a", "c"])
+        self.assertEqual(len(db["5.6.7.8"]), 1)
+        self.assertNotIn("8.8.8.8", db)
+
+    def test_json_index_missing_field(self):
+        self._write(json.dumps([{"other": "1.2.3.4"}]), 1_000_000_000)
+        with self.assertRaises(KeyError):
+            FeedStore.json_index(self.path, "value")
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            FeedStore.lines(self.path)
+
+    def test_cidr_index_persisted(self):
+        self._write("# comment\n1.2.3.0/24\n5.6.7.8\n2001:db8::/32\n", 1_000_000_000)
+        index = FeedStore.cidr_index(self.path)
+        self.assertIn("1.2.3.4", index)
+        self.assertTrue(os.path.exists(f"{self.path}.idx"))
+        FeedStore.clear()
+        with patch("api_app.analyzers_manager.feeds.CIDRIndex.build") as mocked_build:
+            index = FeedStore.cidr_index(self.path)
+            mocked_build.assert_not_called()
+        self.assertIn("2001:db8::1", index)
+        self.assertIn("5.6.7.8", index)
+        self.assertNotIn("5.6.7.9", index)
+
+
+class CIDRIndexTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = CIDRIndex.build(
+            enumerate(
+                [
+                    "10.0.0.0/8",
+                    "10.1.0.0/16",
+                    "192.168.1.1",
+                    "not a network",
+                    "2001:db8::/32",
+                    "0.0.0.0/0",
+                ]
+            )
+        )
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("10.1.2.3"), [0, 1, 5])
+        self.assertEqual(self.index.lookup("10.2.2.3"), [0, 5])
+        self.assertEqual(self.index.lookup("192.168.1.1"), [2, 5])
+        self.assertEqual(self.index.lookup("2001:db8::1"), [4])
+        self.assertEqual(self.index.lookup("2001:db9::1"), [])
+        with self.assertRaises(ValueError):
+            self.index.lookup("not an ip")
+
+    def test_lookup_many(self):
+        self.assertEqual(
+            self.index.lookup_many(["10.1.2.3", "2001:db9::1"]),
+            {"10.1.2.3": [0, 1, 5], "2001:db9::1": []},
+        )
+
+    def test_dump_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.idx")
+            self.index.dump(path)
+            index = CIDRIndex.load(path)
+        self.assertEqual(len(index), len(self.index))
+        for ip in ["10.1.2.3", "192.168.1.1", "2001:db8::1", "8.8.8.8"]:
+            self.assertEqual(index.lookup(ip), self.index.lookup(ip))
+
+    def test_load_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.idx")
+            with open(path, "wb") as f:
+                f.write(CIDRIndex.MAGIC + b"\x00\x00")
+            with self.assertRaises(ValueError):
+                CIDRIndex.load(path)
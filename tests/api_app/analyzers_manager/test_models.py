@@ -92,6 +92,63 @@ class AnalyzerReportTestCase(CustomTestCase):
         job.delete()
         an1.delete()
 
+    def test_create_data_model_shared(self):
+        an1 = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        config = AnalyzerConfig.objects.first()
+        config.mapping_data_model = {"evaluation": "evaluation"}
+        config.save()
+        jobs, data_models = [], []
+        for evaluation in ["MALICIOUS", "MALICIOUS", "TRUSTED"]:
+            job = Job.objects.create(
+                user=self.user,
+                analyzable=an1,
+                status=Job.STATUSES.ANALYZERS_RUNNING.value,
+            )
+            ar: AnalyzerReport = AnalyzerReport.objects.create(
+                report={"evaluation": evaluation},
+                job=job,
+                config=config,
+                status=AnalyzerReport.STATUSES.SUCCESS.value,
+                task_id=str(uuid()),
+                parameters={},
+            )
+            jobs.append(job)
+            data_models.append(ar.create_data_model())
+        self.assertEqual(data_models[0].pk, data_models[1].pk)
+        self.assertNotEqual(data_models[0].pk, data_models[2].pk)
+        self.assertEqual(data_models[2].evaluation, "trusted")
+        self.assertEqual(
+            2,
+            DomainDataModel.objects.filter(
+                pk__in=[data_model.pk for data_model in data_models]
+            ).count(),
+        )
+        # other users do not share the data models
+        job = Job.objects.create(
+            user=self.superuser,
+            analyzable=an1,
+            status=Job.STATUSES.ANALYZERS_RUNNING.value,
+        )
+        ar = AnalyzerReport.objects.create(
+            report={"evaluation": "MALICIOUS"},
+            job=job,
+            config=config,
+            status=AnalyzerReport.STATUSES.SUCCESS.value,
+            task_id=str(uuid()),
+            parameters={},
+        )
+        jobs.append(job)
+        data_models.append(ar.create_data_model())
+        self.assertNotEqual(data_models[0].pk, data_models[3].pk)
+        for data_model in data_models:
+            data_model.delete()
+        for job in jobs:
+            job.delete()
+        an1.delete()
+
     def test_get_value(self):
         an1 = Analyzable.objects.create(
             name="test.com",
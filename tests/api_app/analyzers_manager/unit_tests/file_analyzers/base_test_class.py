@@ -160,6 +160,7 @@ class BaseFileAnalyzerTest(TestCase):
                     analyzer._job.analyzable.sha256 = hashlib.sha256(
                         file_bytes
                     ).hexdigest()
+                    analyzer._job.analyzable.sha1 = hashlib.sha1(file_bytes).hexdigest()
                     analyzer._job_id = ""
                     analyzer._job.tlp = "clear"
                     analyzer.report = MagicMock()
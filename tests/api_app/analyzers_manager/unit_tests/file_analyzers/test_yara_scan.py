@@ -1,6 +1,16 @@
+import tempfile
+from pathlib import PosixPath
+from unittest import TestCase
 from unittest.mock import patch
 
-from api_app.analyzers_manager.file_analyzers.yara_scan import YaraScan
+import yara
+
+from api_app.analyzers_manager.file_analyzers.yara_scan import (
+    YaraRepo,
+    YaraRulesCache,
+    YaraScan,
+    rules_cache,
+)
 
 from .base_test_class import BaseFileAnalyzerTest
 
@@ -33,3 +43,81 @@ class TestYaraScan(BaseFileAnalyzerTest):
                 ],
             )
         ]
+
+
+class TestYaraRulesCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in ["a", "b", "c"]:
+            path = PosixPath(self.directory.name) / f"{name}.yas"
+            path.write_bytes(b"x" * 10)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get(self):
+        cache = YaraRulesCache(max_size=20)
+        a = cache.get(self.paths[0], "1", object)
+        self.assertIs(a, cache.get(self.paths[0], "1", object))
+        # a new digest replaces the previous rules of the same file
+        a2 = cache.get(self.paths[0], "2", object)
+        self.assertIsNot(a, a2)
+        self.assertEqual(10, cache.size)
+        cache.get(self.paths[1], "1", object)
+        cache.get(self.paths[0], "2", object)
+        # the least recently used is evicted
+        cache.get(self.paths[2], "1", object)
+        self.assertEqual(20, cache.size)
+        self.assertIs(a2, cache.get(self.paths[0], "2", object))
+        self.assertEqual("loaded", cache.get(self.paths[1], "1", lambda: "loaded"))
+
+
+class TestYaraRepoCompile(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.repo = YaraRepo("", directory=PosixPath(self.directory.name))
+        (self.repo.directory / "valid.yar").write_text(
+            'rule valid { strings: $a = "intelowl" condition: $a }'
+        )
+        (self.repo.directory / "invalid.yar").write_text("rule invalid {")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        rules_cache.clear()
+
+    def test_compile_incremental(self):
+        self.repo.compile()
+        with patch("yara.compile", wraps=yara.compile) as compile_:
+            YaraRepo("", directory=self.repo.directory).compile()
+        compile_.assert_not_called()
+        (self.repo.directory / "other.yar").write_text(
+            'rule other { strings: $a = "other" condition: $a }'
+        )
+        with patch("yara.compile", wraps=yara.compile) as compile_:
+            rules = YaraRepo("", directory=self.repo.directory).compile()
+        # the new file is validated, then the directory is compiled
+        self.assertEqual(2, compile_.call_count)
+        self.assertEqual(
+            ["other", "valid"],
+            sorted(match.rule for match in rules[0].match(data=b"intelowl other")),
+        )
+
+    def test_compile_include(self):
+        (self.repo.directory / "including.yar").write_text(
+            'include "common.inc"\nrule including { condition: common }'
+        )
+        # the included file is missing
+        self.repo.compile()
+        (self.repo.directory / "common.inc").write_text(
+            'rule common { strings: $a = "common" condition: $a }'
+        )
+        with patch("yara.compile", wraps=yara.compile) as compile_:
+            rules = YaraRepo("", directory=self.repo.directory).compile()
+        # the including file is validated again, then the directory is compiled
+        self.assertEqual(2, compile_.call_count)
+        self.assertEqual(
+            ["common", "including"],
+            sorted(match.rule for match in rules[0].match(data=b"common")),
+        )
@@ -19,7 +19,7 @@ class FireHolIPListTestCase(BaseAnalyzerTest):
         # Simulates downloading an IP list with the target IP inside
         text_data = "# comment line\n" "0.0.0.0/8\n" "3.90.198.217\n" "5.0.0.0/8\n"
         return patch(
-            "requests.get",
+            "requests.Session.get",
             return_value=MockUpResponse(
                 json_data={},
                 status_code=200,
@@ -14,7 +14,9 @@ class TrancoTestCase(BaseAnalyzerTest):
     def get_mocked_response():
         mock_data = {"rank": 12345, "domain": "example.com", "date": "2025-07-18"}
 
-        return patch("requests.get", return_value=MockUpResponse(mock_data, 200))
+        return patch(
+            "requests.Session.get", return_value=MockUpResponse(mock_data, 200)
+        )
 
     @classmethod
     def get_extra_config(cls) -> dict:
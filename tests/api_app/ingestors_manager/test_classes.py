@@ -1,5 +1,11 @@
+import datetime
+import hashlib
+from unittest.mock import patch
+
 from api_app.ingestors_manager.classes import Ingestor
 from api_app.ingestors_manager.models import IngestorConfig
+from api_app.playbooks_manager.models import PlaybookConfig
+from api_app.serializers.job import ObservableAnalysisSerializer
 from tests import CustomTestCase
 
 
@@ -47,3 +53,99 @@ class IngestorTestCase(CustomTestCase):
                     )
                 finally:
                     signal.alarm(0)
+
+    def test_after_run_success_batches(self):
+        config = IngestorConfig.objects.first()
+        config.jobs_batch_size = 2
+        ingestor = config.python_module.python_class(config)
+        ingestor.report = config.generate_empty_report(
+            None, None, ingestor.report_model.STATUSES.RUNNING.value
+        )
+        batches = []
+        investigations = []
+
+        def create_jobs(value, *args, **kwargs):
+            batches.append(list(value))
+            investigations.append(kwargs["investigation"])
+            yield from []
+
+        def run():
+            yield b"sample"
+            yield "1.2.3.4"
+            yield b"sample2"
+
+        with patch.object(IngestorConfig, "create_jobs", side_effect=create_jobs):
+            ingestor.after_run_success(run())
+        self.assertEqual(batches, [[b"sample", "1.2.3.4"], [b"sample2"]])
+        ingestor.report.refresh_from_db()
+        self.assertEqual(
+            ingestor.report.status, ingestor.report_model.STATUSES.SUCCESS.value
+        )
+        self.assertEqual(
+            ingestor.report.report,
+            [
+                hashlib.sha256(b"sample").hexdigest(),
+                "1.2.3.4",
+                hashlib.sha256(b"sample2").hexdigest(),
+            ],
+        )
+        # the jobs of every batch belong to the same investigation
+        self.assertIsNotNone(investigations[0])
+        self.assertEqual(investigations[0], investigations[1])
+        investigations[0].refresh_from_db()
+        self.assertEqual(investigations[0].name, "Custom investigation: 3 jobs")
+        investigations[0].delete()
+        ingestor.report.delete()
+
+    def test_after_run_success_single_item(self):
+        config = IngestorConfig.objects.first()
+        ingestor = config.python_module.python_class(config)
+        ingestor.report = config.generate_empty_report(
+            None, None, ingestor.report_model.STATUSES.RUNNING.value
+        )
+        investigations = []
+
+        def create_jobs(value, *args, **kwargs):
+            investigations.append(kwargs["investigation"])
+            yield from []
+
+        with patch.object(IngestorConfig, "create_jobs", side_effect=create_jobs):
+            ingestor.after_run_success("1.2.3.4")
+        # a single job does not need an investigation
+        self.assertEqual(investigations, [None])
+        ingestor.report.delete()
+
+    def test_after_run_success_batches_delay(self):
+        config = IngestorConfig.objects.first()
+        config.jobs_batch_size = 2
+        config.delay = datetime.timedelta(seconds=10)
+        ingestor = config.python_module.python_class(config)
+        ingestor.report = config.generate_empty_report(
+            None, None, ingestor.report_model.STATUSES.RUNNING.value
+        )
+        delays = []
+
+        def create_jobs(value, tlp, user, investigation=None, **kwargs):
+            serializer = config._get_observable_serializer(value, tlp, user, **kwargs)
+            with patch.object(
+                ObservableAnalysisSerializer,
+                "run_validation",
+                side_effect=lambda item: item,
+            ):
+                delays.extend(
+                    item["delay"]
+                    for item in serializer.to_internal_value(serializer.initial_data)
+                )
+            yield from []
+
+        with patch.object(
+            IngestorConfig, "create_jobs", side_effect=create_jobs
+        ), patch.object(
+            ingestor,
+            "get_playbook_to_execute",
+            return_value=PlaybookConfig.objects.get(name="Dns"),
+        ):
+            ingestor.after_run_success(["google.com", "intelowl.com", "test.com"])
+        # the jobs of the second batch are not run together with the first ones
+        self.assertEqual(delays, [0, 10, 20])
+        ingestor.report.delete()
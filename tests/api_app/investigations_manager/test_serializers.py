@@ -73,3 +73,30 @@ class InvestigationTreeSerializerTestCase(CustomTestCase):
         job.delete()
         inv.delete()
         an1.delete()
+
+    def test_to_representation_num_queries(self):
+        an1 = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        job = Job.objects.create(analyzable=an1, user=self.user, status="killed")
+        j2 = job.add_child(analyzable=an1, user=self.user, status="killed")
+        j3 = job.add_child(analyzable=an1, user=self.user, status="killed")
+        j4 = j2.add_child(analyzable=an1, user=self.user, status="killed")
+        inv: Investigation = Investigation.objects.create(name="Test", owner=self.user)
+        inv.jobs.add(job)
+        # the investigation jobs and the whole tree
+        with self.assertNumQueries(2):
+            result = InvestigationTreeSerializer(instance=inv).data
+        root = result["jobs"][0]
+        self.assertEqual(root["pk"], job.pk)
+        self.assertEqual([j2.pk, j3.pk], [child["pk"] for child in root["children"]])
+        self.assertEqual(j4.pk, root["children"][0]["children"][0]["pk"])
+        self.assertNotIn("children", root["children"][1])
+        self.assertNotIn("pivot_config", root)
+        j4.delete()
+        j3.delete()
+        j2.delete()
+        job.delete()
+        inv.delete()
+        an1.delete()
@@ -6,7 +6,11 @@ from unittest.mock import patch
 from kombu import uuid
 
 from api_app.analyzables_manager.models import Analyzable
-from api_app.choices import Classification, PythonModuleBasePaths
+from api_app.analyzers_manager.models import AnalyzerConfig
+from api_app.analyzers_manager.observable_analyzers.dns.dns_resolvers.classic_dns_resolver import (  # noqa
+    ClassicDNSResolver,
+)
+from api_app.choices import TLP, Classification, PythonModuleBasePaths
 from api_app.classes import Plugin
 from api_app.connectors_manager.classes import Connector
 from api_app.connectors_manager.models import ConnectorConfig
@@ -84,3 +88,51 @@ class PluginTestCase(CustomTestCase):
             class_.python_module.module,
             "dns.dns_resolvers.classic_dns_resolver.ClassicDNSResolver",
         )
+
+
+class ObservableAnalyzerResultCacheTestCase(CustomTestCase):
+    def _start(self, config: AnalyzerConfig, name: str, tlp: str):
+        an, _ = Analyzable.objects.get_or_create(
+            name=name, classification=Classification.DOMAIN
+        )
+        job = Job.objects.create(user=self.user, analyzable=an, tlp=tlp)
+        job.analyzers_to_execute.set([config])
+        plugin = ClassicDNSResolver(config)
+        plugin.start(job.pk, {}, uuid())
+        return plugin.report
+
+    def test_result_cache(self):
+        config = AnalyzerConfig.objects.get(name="Classic_DNS")
+        config.result_cache_ttl = 60
+        stats = config.result_cache_stats
+        with patch.object(ClassicDNSResolver, "run", return_value={"test": 1}) as run:
+            for _ in range(2):
+                report = self._start(config, f"{uuid()}.com", TLP.CLEAR.value)
+                self.assertEqual(report.report, {"test": 1})
+            self.assertEqual(run.call_count, 2)
+            name = f"{uuid()}.com"
+            # the results of the jobs with TLP amber or red are not shared
+            self._start(config, name, TLP.RED.value)
+            self._start(config, name, TLP.CLEAR.value)
+            self.assertEqual(run.call_count, 4)
+            report = self._start(config, name, TLP.RED.value)
+            self.assertEqual(run.call_count, 4)
+            self.assertEqual(report.report, {"test": 1})
+            self.assertEqual(report.status, report.STATUSES.SUCCESS)
+        self.assertEqual(
+            config.result_cache_stats,
+            {"hits": stats["hits"] + 1, "misses": stats["misses"] + 4},
+        )
+
+    def test_result_cache_error(self):
+        config = AnalyzerConfig.objects.get(name="Classic_DNS")
+        config.result_cache_ttl = 60
+        with patch.object(ClassicDNSResolver, "run", return_value={"test": 1}), patch(
+            "api_app.analyzers_manager.classes.cache"
+        ) as cache:
+            cache.get.side_effect = ConnectionError("cache down")
+            cache.set.side_effect = ConnectionError("cache down")
+            report = self._start(config, f"{uuid()}.com", TLP.CLEAR.value)
+        # the cache does not change the outcome of the analysis
+        self.assertEqual(report.report, {"test": 1})
+        self.assertEqual(report.status, report.STATUSES.SUCCESS)
@@ -4,6 +4,12 @@
 from django.test import TestCase
 
 from api_app.choices import Classification
+from api_app.helpers import (
+    calculate_hashes,
+    calculate_md5,
+    calculate_sha1,
+    calculate_sha256,
+)
 
 
 class HelperTests(TestCase):
@@ -40,3 +46,15 @@ class HelperTests(TestCase):
         observable = "iammeia"
         result = Classification.calculate_observable(observable)
         self.assertEqual(result, Classification.GENERIC)
+
+    def test_calculate_hashes(self):
+        content = b"intelowl" * 1000
+        chunks = [content[:333], content[333:5000], content[5000:]]
+        self.assertEqual(
+            calculate_hashes(chunks),
+            {
+                "md5": calculate_md5(content),
+                "sha1": calculate_sha1(content),
+                "sha256": calculate_sha256(content),
+            },
+        )
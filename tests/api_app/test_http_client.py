@@ -0,0 +1,73 @@
+# This file is a part of IntelOwl https://github.com/intelowlproject/IntelOwl
+# See the file 'LICENSE' for copying permission.
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from api_app.http_client import HTTPClient, RateLimitExceeded, TokenBucket
+from tests.mock_utils import MockUpResponse
+
+
+@override_settings(HTTP_RATE_LIMIT_REDIS_URL="")
+class TokenBucketTestCase(SimpleTestCase):
+    def test_reserve(self):
+        bucket = TokenBucket(2, 10, burst=2)
+        with patch("api_app.http_client.time.monotonic", return_value=100):
+            self.assertEqual(bucket.reserve("key", max_wait=60), 0)
+            self.assertEqual(bucket.reserve("key", max_wait=60), 0)
+            # the burst is over: one token every 5 seconds
+            self.assertEqual(bucket.reserve("key", max_wait=60), 5)
+            self.assertEqual(bucket.reserve("key", max_wait=60), 10)
+            # every key has its own tokens
+            self.assertEqual(bucket.reserve("other", max_wait=60), 0)
+            # not reserved
+            self.assertEqual(bucket.reserve("key", max_wait=10), -15)
+            self.assertEqual(bucket.reserve("key", max_wait=60), 15)
+        with patch("api_app.http_client.time.monotonic", return_value=200):
+            self.assertEqual(bucket.reserve("key", max_wait=60), 0)
+
+    def test_acquire(self):
+        bucket = TokenBucket(1, 10)
+        with patch("api_app.http_client.time.sleep") as sleep:
+            self.assertEqual(bucket.acquire("key", max_wait=60), 0)
+            self.assertGreater(bucket.acquire("key", max_wait=60), 9)
+            sleep.assert_called_once()
+            with self.assertRaises(RateLimitExceeded):
+                bucket.acquire("key", max_wait=1)
+
+
+@override_settings(
+    HTTP_RATE_LIMIT_REDIS_URL="",
+    HTTP_RATE_LIMITS={"test": (1.0, 1.0)},
+    HTTP_RATE_LIMIT_MAX_WAIT=60,
+)
+class HTTPClientTestCase(SimpleTestCase):
+    def test_session(self):
+        self.assertIs(HTTPClient("test", "a").session, HTTPClient("test", "b").session)
+        self.assertIsNot(HTTPClient("test").session, HTTPClient("other").session)
+        self.assertNotEqual(
+            HTTPClient("test", "a").bucket_key, HTTPClient("test", "b").bucket_key
+        )
+        self.assertIsNone(HTTPClient("other").bucket)
+
+    def test_retry_429(self):
+        responses = [
+            MockUpResponse({}, 429, headers={"Retry-After": "2"}),
+            MockUpResponse({"ok": True}, 200),
+        ]
+        with patch("requests.Session.get", side_effect=responses), patch(
+            "api_app.http_client.time.sleep"
+        ) as sleep:
+            response = HTTPClient("test", "retry").get("https://test.com")
+        self.assertEqual(response.json(), {"ok": True})
+        sleep.assert_any_call(2.0)
+
+    def test_429_too_long(self):
+        with patch(
+            "requests.Session.get",
+            return_value=MockUpResponse({}, 429, headers={"Retry-After": "3600"}),
+        ) as get:
+            response = HTTPClient("test", "too_long").get("https://test.com")
+        self.assertEqual(response.status_code, 429)
+        get.assert_called_once()
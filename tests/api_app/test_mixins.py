@@ -2,6 +2,9 @@
 # See the file 'LICENSE' for copying permission.
 import pathlib
 from pathlib import PosixPath
+from unittest.mock import patch
+
+import requests
 
 from api_app.analyzers_manager.models import AnalyzerConfig
 from api_app.choices import Classification
@@ -186,3 +189,46 @@ class VirusTotalMixinTestCase(CustomTestCase):
         self.assertIn("relationships", params)
         self.assertListEqual(relationships_requested, expected_relationships)
         self.assertEqual(params["relationships"], ",".join(expected_relationships))
+
+    def test_vt_get_relationships(self):
+        analyzer = self.analyzer_file
+        analyzer._api_key_name = "123456"
+        analyzer.relationships_elements = 1
+        analyzer.relationships_to_request = [
+            "contacted_ips",
+            "contacted_domains",
+            "comments",
+            "votes",
+        ]
+        result = {
+            "data": {
+                "relationships": {
+                    "contacted_ips": {"data": [{"id": "1.2.3.4"}]},
+                    "contacted_domains": {"data": [{"id": "test.com"}]},
+                    "comments": {"data": []},
+                }
+            }
+        }
+
+        def get(url, **kwargs):
+            if "contacted_domains" in url:
+                raise requests.ConnectionError("test")
+            return MockUpResponse({"data": [url]}, 200)
+
+        with patch("requests.Session.get", side_effect=get):
+            analyzer._vt_get_relationships(
+                "hash",
+                ["contacted_ips", "contacted_domains", "comments"],
+                "files/hash",
+                result,
+            )
+        self.assertEqual(
+            result["contacted_ips"],
+            {"data": [f"{analyzer.url}files/hash/contacted_ips?limit=1"]},
+        )
+        # an error does not stop the other relationships
+        self.assertEqual(result["contacted_domains"], {"error": "test"})
+        self.assertNotIn("comments", result)
+        self.assertEqual(
+            result["votes"], {"error": "not supported, review configuration."}
+        )
@@ -2,22 +2,30 @@
 # See the file 'LICENSE' for copying permission.
 import datetime
 from json import loads
+from unittest.mock import patch
 
 from celery._state import get_current_app
 from celery.canvas import Signature
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.test import override_settings
+from django.utils.timezone import now
 from django_celery_beat.models import PeriodicTask
 from kombu import uuid
 
 from api_app.analyzables_manager.models import Analyzable
 from api_app.analyzers_manager.models import AnalyzerConfig, AnalyzerReport
 from api_app.choices import Classification, PythonModuleBasePaths
-from api_app.connectors_manager.models import ConnectorConfig
+from api_app.connectors_manager.models import ConnectorConfig, ConnectorReport
 from api_app.data_model_manager.models import DomainDataModel
+from api_app.helpers import count_queries
 from api_app.models import (
     AbstractConfig,
     Job,
+    JobRollup,
+    JobStage,
     OrganizationPluginConfiguration,
     Parameter,
     PluginConfig,
@@ -221,6 +229,89 @@ class AbstractConfigTestCase(CustomTestCase):
         pc.delete()
         muc.delete()
 
+    def test_get_configured_params_cached(self):
+        muc = VisualizerConfig.objects.create(
+            name="test",
+            description="test",
+            python_module=PythonModule.objects.get(
+                base_path=PythonModuleBasePaths.Visualizer.value, module="yara.Yara"
+            ),
+            disabled=False,
+        )
+        param = Parameter.objects.create(
+            python_module=muc.python_module,
+            name="test",
+            type="str",
+            is_secret=False,
+            required=False,
+        )
+        pc = PluginConfig.objects.create(
+            owner=self.user,
+            for_organization=False,
+            parameter=param,
+            value="first",
+            visualizer_config=muc,
+        )
+        params = {p["name"]: p for p in muc.get_configured_params(self.user, {})}
+        self.assertEqual(params["test"]["value"], "first")
+        self.assertFalse(params["test"]["is_secret"])
+        self.assertFalse(params["test"]["is_from_org"])
+
+        # the second resolution is served by the cache
+        with patch.object(
+            VisualizerConfig, "read_configured_params"
+        ) as read_configured_params:
+            params = {p["name"]: p for p in muc.get_configured_params(self.user, {})}
+            read_configured_params.assert_not_called()
+            self.assertEqual(params["test"]["value"], "first")
+            # a different runtime configuration is a different key
+            muc.get_configured_params(self.user, {"test": "runtime"})
+            read_configured_params.assert_called_once()
+
+        # the PluginConfig signal invalidates the cache
+        pc.value = "second"
+        pc.save()
+        params = {p["name"]: p for p in muc.get_configured_params(self.user, {})}
+        self.assertEqual(params["test"]["value"], "second")
+        pc.delete()
+        param.delete()
+        muc.delete()
+
+    def test_get_configured_params_secret_not_cached(self):
+        muc = VisualizerConfig.objects.create(
+            name="test",
+            description="test",
+            python_module=PythonModule.objects.get(
+                base_path=PythonModuleBasePaths.Visualizer.value, module="yara.Yara"
+            ),
+            disabled=False,
+        )
+        param = Parameter.objects.create(
+            python_module=muc.python_module,
+            name="test",
+            type="str",
+            is_secret=True,
+            required=False,
+        )
+        pc = PluginConfig.objects.create(
+            owner=self.user,
+            for_organization=False,
+            parameter=param,
+            value="secret",
+            visualizer_config=muc,
+        )
+        for _ in range(2):
+            params = {p["name"]: p for p in muc.get_configured_params(self.user, {})}
+            self.assertEqual(params["test"]["value"], "secret")
+            self.assertTrue(params["test"]["is_secret"])
+            cached = cache.get(muc._configured_params_cache_key(self.user, {}))
+            self.assertEqual(cached, [{**params["test"], "value": None}])
+        params = muc.get_configured_params(self.user, {}, secrets=False)
+        self.assertIsNone(params[0]["value"])
+        pc.delete()
+        param.delete()
+        muc.delete()
+
     def test_is_runnable(self):
         muc = VisualizerConfig.objects.create(
             name="test",
@@ -348,6 +439,145 @@ class AbstractConfigTestCase(CustomTestCase):
         job.delete()
         an.delete()
 
+    def test_get_signatures_bulk(self):
+        an = Analyzable.objects.create(name="8.8.8.8", classification=Classification.IP)
+        job = Job.objects.create(user=self.user, analyzable=an)
+        names = ["Classic_DNS", "TorProject", "FireHol_IPList", "Feodo_Tracker"]
+        job.analyzers_to_execute.set(AnalyzerConfig.objects.filter(name__in=names))
+
+        def get_signatures(configs):
+            queryset = AnalyzerConfig.objects.filter(name__in=configs)
+            # the first execution caches the parameters
+            list(queryset.annotate_runnable(self.user).get_signatures(job))
+            with count_queries() as queries:
+                signatures = list(
+                    queryset.annotate_runnable(self.user).get_signatures(job)
+                )
+            return signatures, queries.count
+
+        signatures, single_count = get_signatures(names[:1])
+        self.assertEqual(len(signatures), 1)
+        signatures, count = get_signatures(names)
+        self.assertEqual(len(signatures), len(names))
+        # the number of queries does not depend on the number of plugins
+        self.assertEqual(single_count, count)
+
+        reports = AnalyzerReport.objects.filter(job=job)
+        self.assertEqual(reports.count(), len(names))
+        self.assertCountEqual(
+            [str(report.task_id) for report in reports],
+            [signature.options["task_id"] for signature in signatures],
+        )
+        # the grouped resolution is the same of the single one
+        cache.clear()
+        for report in reports:
+            self.assertEqual(report.status, AnalyzerReport.STATUSES.PENDING.value)
+            self.assertEqual(
+                report.parameters,
+                report.config._get_params(self.user, {}),
+            )
+        job.delete()
+        an.delete()
+
+
+class JobRollupTestCase(CustomTestCase):
+    def test_job_status_changed(self):
+        an = Analyzable.objects.create(
+            name="test.com", classification=Classification.DOMAIN
+        )
+        job = Job.objects.create(
+            user=self.user, analyzable=an, status=Job.STATUSES.RUNNING.value
+        )
+        rollups = JobRollup.objects.filter(user=self.user)
+        self.assertFalse(rollups.exists())
+
+        job.status = Job.STATUSES.REPORTED_WITHOUT_FAILS.value
+        job.save(update_fields=["status"])
+        rollup = rollups.get()
+        self.assertEqual(rollup.count, 1)
+        self.assertEqual(
+            rollup.bucket,
+            job.received_request_time.replace(minute=0, second=0, microsecond=0),
+        )
+        self.assertEqual(rollup.classification, Classification.DOMAIN.value)
+        self.assertEqual(rollup.tlp, job.tlp)
+        # saving again does not count the job twice
+        job.save()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.count, 1)
+
+        # retried
+        job.status = Job.STATUSES.RUNNING.value
+        job.save(update_fields=["status"])
+        job.status = Job.STATUSES.FAILED.value
+        job.save(update_fields=["status"])
+        self.assertCountEqual(
+            rollups.values_list("status", "count"),
+            [
+                (Job.STATUSES.REPORTED_WITHOUT_FAILS.value, 0),
+                (Job.STATUSES.FAILED.value, 1),
+            ],
+        )
+
+        self.assertEqual(JobRollup.objects.backfill(since=job.received_request_time), 1)
+        self.assertCountEqual(
+            rollups.values_list("status", "count"),
+            [(Job.STATUSES.FAILED.value, 1)],
+        )
+
+        job.delete()
+        # the deleted jobs are removed with negative counters
+        self.assertCountEqual(
+            rollups.values_list("status").annotate(Sum("count")),
+            [(Job.STATUSES.FAILED.value, 0)],
+        )
+        an.delete()
+
+    def test_job_deleted_in_cascade(self):
+        an = Analyzable.objects.create(
+            name="test.com", classification=Classification.DOMAIN
+        )
+        Job.objects.create(
+            user=self.user, analyzable=an, status=Job.STATUSES.FAILED.value
+        )
+        rollups = JobRollup.objects.filter(user=self.user)
+        self.assertEqual(rollups.get().count, 1)
+        an.delete()
+        self.assertEqual(rollups.get().count, 0)
+
+    def test_aggregate_rows_since(self):
+        an = Analyzable.objects.create(
+            name="test.com", classification=Classification.DOMAIN
+        )
+        hour = now().replace(minute=0, second=0, microsecond=0)
+        for minute in [10, 40]:
+            job = Job.objects.create(
+                user=self.user,
+                analyzable=an,
+                status=Job.STATUSES.REPORTED_WITHOUT_FAILS.value,
+            )
+            Job.objects.filter(pk=job.pk).update(
+                received_request_time=hour
+                - datetime.timedelta(hours=1)
+                + datetime.timedelta(minutes=minute)
+            )
+        JobRollup.objects.backfill()
+
+        def count(since):
+            return sum(
+                row["count"]
+                for row in JobRollup.objects.aggregate_rows(
+                    "status", since, "hour", [self.user]
+                )
+            )
+
+        self.assertEqual(count(hour - datetime.timedelta(hours=1)), 2)
+        # the jobs received in the hour, but before the start, are not counted
+        self.assertEqual(count(hour - datetime.timedelta(minutes=30)), 1)
+        self.assertEqual(count(hour), 0)
+        Job.objects.filter(analyzable=an).delete()
+        an.delete()
+
 
 class PluginConfigTestCase(CustomTestCase):
     def test_clean_parameter(self):
@@ -499,6 +729,230 @@ class JobTestCase(CustomTestCase):
         an1.delete()
         job.delete()
 
+    def test_set_final_status_reports_stats(self):
+        an = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        job = Job.objects.create(
+            user=self.user,
+            analyzable=an,
+            status=Job.STATUSES.ANALYZERS_RUNNING.value,
+        )
+        reports = [
+            AnalyzerReport.objects.create(
+                job=job,
+                config=config,
+                status=AnalyzerReport.STATUSES.PENDING.value,
+                task_id=str(uuid()),
+                parameters={},
+            )
+            for config in AnalyzerConfig.objects.all()[:3]
+        ]
+        job.refresh_from_db()
+        self.assertEqual(
+            job.reports_stats, {"all": 3, "success": 0, "failed": 0, "killed": 0}
+        )
+        reports[0].status = AnalyzerReport.STATUSES.SUCCESS.value
+        reports[0].save(update_fields=["status"])
+        reports[1].status = AnalyzerReport.STATUSES.FAILED.value
+        reports[1].save()
+        # a report that is saved again is not counted twice
+        reports[1].save()
+        reloaded = AnalyzerReport.objects.get(pk=reports[2].pk)
+        reloaded.status = AnalyzerReport.STATUSES.SUCCESS.value
+        reloaded.save()
+        job.refresh_from_db()
+        stats = job._get_config_reports_stats()
+        self.assertEqual(
+            job.reports_stats, {"all": 3, "success": 2, "failed": 1, "killed": 0}
+        )
+        self.assertEqual(
+            job.reports_stats,
+            {key: value for key, value in stats.items() if key in job.reports_stats},
+        )
+        self.assertEqual(stats["pending"], 0)
+
+        with count_queries() as queries:
+            job.set_final_status()
+        # the report counters are read from the job:
+        # the job is updated and counted in the rollups
+        # (analyzable, rollup lookup and creation)
+        self.assertEqual(queries.count, 4)
+        self.assertEqual(job.status, Job.STATUSES.REPORTED_WITH_FAILS.value)
+
+        # a retried report leaves its final status
+        reports[1].status = AnalyzerReport.STATUSES.PENDING.value
+        reports[1].save()
+        job.refresh_from_db()
+        self.assertEqual(
+            job.reports_stats, {"all": 3, "success": 2, "failed": 0, "killed": 0}
+        )
+        job.delete()
+        an.delete()
+
+    def test_reports_stats_concurrent_save(self):
+        an = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        job = Job.objects.create(
+            user=self.user,
+            analyzable=an,
+            status=Job.STATUSES.ANALYZERS_RUNNING.value,
+        )
+        stale_job = Job.objects.get(pk=job.pk)
+        report = AnalyzerReport.objects.create(
+            job=job,
+            config=AnalyzerConfig.objects.first(),
+            status=AnalyzerReport.STATUSES.PENDING.value,
+            task_id=str(uuid()),
+            parameters={},
+        )
+        # the status is not loaded with the report
+        report = AnalyzerReport.objects.defer("status").get(pk=report.pk)
+        report.status = AnalyzerReport.STATUSES.SUCCESS.value
+        report.save()
+        # a job loaded before does not write back the old counters
+        stale_job.save()
+        job.refresh_from_db()
+        self.assertEqual(
+            job.reports_stats, {"all": 1, "success": 1, "failed": 0, "killed": 0}
+        )
+        job.delete()
+        an.delete()
+
+    def test_event_executor(self):
+        an = Analyzable.objects.create(name="8.8.8.8", classification=Classification.IP)
+        job = Job.objects.create(user=self.user, analyzable=an)
+        job.analyzers_to_execute.set(
+            AnalyzerConfig.objects.filter(name__in=["Classic_DNS", "TorProject"])
+        )
+        with patch("api_app.models.JobStage.dispatch") as dispatch:
+            job._run_pipeline(
+                job.analyzers_to_execute.all(),
+                PivotConfig.objects.none(),
+                job.connectors_to_execute.all(),
+                job.visualizers_to_execute.all(),
+                executor=Job.EXECUTOR_EVENT,
+            )
+            # only the analyzers do not depend on other stages
+            self.assertEqual(dispatch.call_count, 1)
+            stages = {stage.name: stage for stage in job.stages.all()}
+            self.assertCountEqual(stages, ["analyzers", "engine", "final_status"])
+            self.assertTrue(stages["analyzers"].dispatched)
+            self.assertEqual(stages["analyzers"].remaining, 2)
+            self.assertEqual(stages["engine"].dependencies, ["analyzers"])
+            self.assertCountEqual(
+                stages["final_status"].dependencies, ["analyzers", "engine"]
+            )
+            for task in stages["analyzers"].tasks:
+                self.assertEqual(task["kwargs"]["job_stage"], "analyzers")
+
+            self.assertEqual(JobStage.objects.task_completed(job.pk, "analyzers"), [])
+            self.assertEqual(
+                JobStage.objects.task_completed(job.pk, "analyzers"), ["engine"]
+            )
+            # a stage is never dispatched twice
+            self.assertEqual(JobStage.objects.dispatch_ready(job.pk), [])
+            self.assertEqual(
+                JobStage.objects.task_completed(job.pk, "engine"), ["final_status"]
+            )
+            self.assertEqual(dispatch.call_count, 3)
+        job.refresh_from_db()
+        self.assertEqual(job.reports_all, 2)
+        job.delete()
+        an.delete()
+
+    def test_event_executor_retry_connectors(self):
+        an = Analyzable.objects.create(name="8.8.8.8", classification=Classification.IP)
+        job = Job.objects.create(
+            user=self.user,
+            analyzable=an,
+            status=Job.STATUSES.REPORTED_WITH_FAILS.value,
+        )
+        AnalyzerReport.objects.create(
+            job=job,
+            config=AnalyzerConfig.objects.get(name="Classic_DNS"),
+            status=AnalyzerReport.STATUSES.SUCCESS.value,
+            task_id=str(uuid()),
+            parameters={},
+        )
+        ConnectorReport.objects.create(
+            job=job,
+            config=ConnectorConfig.objects.get(name="YETI"),
+            status=ConnectorReport.STATUSES.FAILED.value,
+            task_id=str(uuid()),
+            parameters={},
+        )
+        with override_settings(JOB_EXECUTOR=Job.EXECUTOR_EVENT), patch(
+            "api_app.models.JobStage.dispatch"
+        ):
+            job.retry()
+            stages = {stage.name: stage for stage in job.stages.all()}
+            # no analyzer has to be retried
+            self.assertNotIn("analyzers", stages)
+            for stage in stages.values():
+                self.assertGreater(stage.remaining, 0)
+            # every stage is dispatched once its tasks are completed
+            completed = set()
+            while True:
+                dispatched = set(
+                    job.stages.filter(dispatched=True).values_list("name", flat=True)
+                )
+                if dispatched == completed:
+                    break
+                for name in dispatched - completed:
+                    for _ in range(stages[name].remaining):
+                        JobStage.objects.task_completed(job.pk, name)
+                    completed.add(name)
+            self.assertCountEqual(completed, stages)
+            self.assertIn("final_status", completed)
+        job.delete()
+        an.delete()
+
+    def test_event_executor_complete_stale(self):
+        an = Analyzable.objects.create(name="8.8.8.8", classification=Classification.IP)
+        job = Job.objects.create(user=self.user, analyzable=an)
+        task_id = str(uuid())
+        AnalyzerReport.objects.create(
+            job=job,
+            config=AnalyzerConfig.objects.get(name="Classic_DNS"),
+            status=AnalyzerReport.STATUSES.RUNNING.value,
+            task_id=task_id,
+            parameters={},
+        )
+        job.refresh_reports_stats()
+        # the worker running the task died
+        JobStage.objects.create(
+            job=job,
+            name="analyzers",
+            tasks=[{"options": {"task_id": task_id}}],
+            remaining=1,
+            dispatched=True,
+            dispatched_at=now() - datetime.timedelta(minutes=30),
+        )
+        JobStage.objects.create(
+            job=job, name="final_status", dependencies=["analyzers"], remaining=1
+        )
+        with patch("api_app.models.JobStage.dispatch") as dispatch:
+            self.assertEqual(JobStage.objects.complete_stale(minutes_ago=40), [])
+            self.assertEqual(dispatch.call_count, 0)
+            completed = JobStage.objects.complete_stale(minutes_ago=25)
+            self.assertEqual([stage.name for stage in completed], ["analyzers"])
+            self.assertEqual(dispatch.call_count, 1)
+            # a completed stage is not completed again
+            self.assertEqual(JobStage.objects.complete_stale(minutes_ago=25), [])
+        self.assertEqual(
+            AnalyzerReport.objects.get(job=job).status,
+            AnalyzerReport.STATUSES.FAILED.value,
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.reports_failed, 1)
+        self.assertTrue(job.stages.get(name="final_status").dispatched)
+        job.delete()
+        an.delete()
+
     def test_pivots_to_execute(self):
         ac = AnalyzerConfig.objects.first()
         ac2 = AnalyzerConfig.objects.exclude(pk__in=[ac.pk]).first()
@@ -9,7 +9,7 @@ from rest_framework.exceptions import ValidationError
 from api_app.analyzables_manager.models import Analyzable
 from api_app.analyzers_manager.models import AnalyzerConfig
 from api_app.analyzers_manager.serializers import AnalyzerConfigSerializer
-from api_app.choices import Classification, PythonModuleBasePaths
+from api_app.choices import Classification, PythonModuleBasePaths, ScanMode
 from api_app.connectors_manager.models import ConnectorConfig
 from api_app.models import Job, Parameter, PluginConfig, PythonModule
 from api_app.playbooks_manager.models import PlaybookConfig
@@ -279,6 +279,50 @@ class AbstractJobCreateSerializerTestCase(CustomTestCase):
         j1.delete()
         an.delete()
 
+    def test_check_previous_jobs_many(self):
+        Job.objects.all().delete()
+        a1 = AnalyzerConfig.objects.order_by("?").first()
+        a2 = AnalyzerConfig.objects.order_by("?").exclude(pk=a1.pk).first()
+        an1 = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        an2 = Analyzable.objects.create(
+            name="test2.com",
+            classification=Classification.DOMAIN,
+        )
+        j1 = Job.objects.create(
+            analyzable=an1,
+            user=self.user,
+            status=Job.STATUSES.REPORTED_WITHOUT_FAILS,
+            received_request_time=now() - datetime.timedelta(hours=3),
+        )
+        j1.analyzers_requested.add(a1)
+        j2 = Job.objects.create(
+            analyzable=an1,
+            user=self.user,
+            status=Job.STATUSES.REPORTED_WITHOUT_FAILS,
+            received_request_time=now() - datetime.timedelta(hours=2),
+        )
+        j2.analyzers_requested.add(a1)
+
+        def data(analyzable, analyzers):
+            return {
+                "scan_mode": ScanMode.CHECK_PREVIOUS_ANALYSIS.value,
+                "scan_check_time": datetime.timedelta(days=1),
+                "analyzable": analyzable,
+                "analyzers_to_execute": analyzers,
+            }
+
+        previous_jobs = self.ajcs.check_previous_jobs_many(
+            [data(an1, [a1]), data(an2, [a1]), data(an1, [a1, a2])]
+        )
+        self.assertEqual([j2, None, None], previous_jobs)
+        j1.delete()
+        j2.delete()
+        an1.delete()
+        an2.delete()
+
     def test_set_default_value_from_playbook(self):
         data = {"playbook_requested": PlaybookConfig.objects.first()}
         self.ajcs.set_default_value_from_playbook(data)
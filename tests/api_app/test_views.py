@@ -7,7 +7,9 @@ from zoneinfo import ZoneInfo
 
 from django.contrib.auth import get_user_model
 from django.core.files import File
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from elasticsearch_dsl.query import Bool, Exists, Range, Term
 from rest_framework.reverse import reverse
@@ -258,6 +260,43 @@ class JobViewSetTests(CustomViewSetTestCase):
         self.assertIn("total_pages", content, msg=msg)
         self.assertIn("results", content, msg=msg)
 
+    def test_list_num_queries(self):
+        # the first request fills the caches that are not related to the jobs
+        self.client.get(self.jobs_list_uri)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.jobs_list_uri)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(5, response.json()["count"])
+        jobs = []
+        for analyzable in [self.analyzable, self.analyzable2, self.analyzable3]:
+            job = Job.objects.create(
+                user=self.superuser,
+                analyzable=analyzable,
+                playbook_to_execute=PlaybookConfig.objects.get(name="Dns"),
+                tlp=Job.TLP.CLEAR.value,
+            )
+            job.analyzers_to_execute.set(AnalyzerConfig.objects.all()[:2])
+            jobs.append(job)
+        job = Job.objects.create(
+            user=self.superuser, analyzable=self.analyzable, tlp=Job.TLP.CLEAR.value
+        )
+        job.analyzers_to_execute.set(AnalyzerConfig.objects.all()[:2])
+        jobs.append(job)
+        with CaptureQueriesContext(connection) as more_queries:
+            response = self.client.get(self.jobs_list_uri)
+        self.assertEqual(200, response.status_code)
+        content = response.json()
+        self.assertEqual(9, content["count"])
+        self.assertEqual(len(queries), len(more_queries))
+        for result in content["results"]:
+            job = Job.objects.get(pk=result["id"])
+            self.assertEqual(
+                list(job.pivots_to_execute.values_list("name", flat=True)),
+                result["pivots_to_execute"],
+            )
+        for job in jobs:
+            job.delete()
+
     def test_list_filter_observable(self):
         response = self.client.get(self.jobs_list_uri, {"is_sample": False})
         self.assertEqual(response.status_code, 200)
@@ -269,6 +308,21 @@ class JobViewSetTests(CustomViewSetTestCase):
             ["1.2.3.4", "test.com"],
         )
 
+    def test_list_filter_md5(self):
+        for md5 in [
+            self.analyzable.md5,
+            self.analyzable.md5[2:12].upper(),
+            self.analyzable.sha256,
+        ]:
+            response = self.client.get(self.jobs_list_uri, {"md5": md5})
+            self.assertEqual(response.status_code, 200)
+            response_data = response.json()
+            self.assertEqual(response_data["count"], 2, md5)
+            self.assertEqual(
+                {job["observable_name"] for job in response_data["results"]},
+                {self.analyzable.name},
+            )
+
     def test_list_filter_sample(self):
         response = self.client.get(self.jobs_list_uri, {"is_sample": True})
         self.assertEqual(response.status_code, 200)
@@ -478,7 +532,39 @@ class JobViewSetTests(CustomViewSetTestCase):
         self.assertEqual(
             resp.json(),
             {
-                "values": ["AMBER", "CLEAR", "GREEN"],
+                "values": ["GREEN", "AMBER", "CLEAR"],
+                "aggregation": [
+                    {"date": "2024-11-28T00:00:00Z", "CLEAR": 1, "GREEN": 3, "AMBER": 1}
+                ],
+            },
+        )
+
+    def test_agg_finished_jobs(self):
+        # the finished jobs are counted by the rollups, the others by the jobs
+        self.job2.status = Job.STATUSES.FAILED.value
+        self.job2.save(update_fields=["status"])
+        self.job3.status = Job.STATUSES.REPORTED_WITHOUT_FAILS.value
+        self.job3.save(update_fields=["status"])
+        resp = self.client.get(self.agg_status_uri)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json(),
+            [
+                {
+                    "date": "2024-11-28T00:00:00Z",
+                    "pending": 3,
+                    "failed": 1,
+                    "reported_with_fails": 0,
+                    "reported_without_fails": 1,
+                }
+            ],
+        )
+        resp = self.client.get(self.agg_top_tlp)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json(),
+            {
+                "values": ["GREEN", "AMBER", "CLEAR"],
                 "aggregation": [
                     {"date": "2024-11-28T00:00:00Z", "CLEAR": 1, "GREEN": 3, "AMBER": 1}
                 ],
@@ -0,0 +1,79 @@
+import re
+from unittest import TestCase
+
+from api_app.user_events_manager.matchers import (
+    DomainWildCardMatcher,
+    IPRangeMatcher,
+    parse_wildcard,
+)
+
+
+class ParseWildCardTestCase(TestCase):
+    def test_literals(self):
+        self.assertEqual(parse_wildcard(r".*\.test\.com$"), ("iendswith", ".test.com"))
+        # postgres searches the regex, so it is not anchored to the end
+        self.assertEqual(parse_wildcard(r".*\.test\.com"), ("icontains", ".test.com"))
+        self.assertEqual(
+            parse_wildcard(r"^www\.test\.com$"), ("iexact", "www.test.com")
+        )
+        self.assertEqual(parse_wildcard(r"^www\.test"), ("istartswith", "www.test"))
+        self.assertEqual(parse_wildcard(r"Test\.com.*"), ("icontains", "test.com"))
+        self.assertEqual(parse_wildcard("test-com"), ("icontains", "test-com"))
+
+    def test_regexes(self):
+        for query in [
+            r".*\.test.com",
+            r"^a\d+\.com$",
+            r"(www|mail)\.test\.com",
+            r"test\.*",
+            "test\\",
+        ]:
+            self.assertIsNone(parse_wildcard(query), query)
+
+
+class DomainWildCardMatcherTestCase(TestCase):
+    def test_match(self):
+        queries = {
+            1: r".*\.test\.com",
+            2: r"^www\.test\.com$",
+            3: r"^www\.",
+            4: "evil",
+            5: ".*",
+            6: r"(www|mail)\.test\.com",
+            7: r".*\.other\.com",
+        }
+        matcher = DomainWildCardMatcher(queries.items())
+        self.assertEqual(matcher.regexes, [6])
+        for name in [
+            "WWW.test.com",
+            "a.test.com",
+            "test.com",
+            "www.evil.org",
+            "mail.other.com",
+            "https://evil.test.com/path",
+        ]:
+            expected = {
+                pk
+                for pk, query in queries.items()
+                if pk not in matcher.regexes and re.search(query, name, re.IGNORECASE)
+            }
+            self.assertEqual(matcher.match(name), expected, name)
+
+
+class IPRangeMatcherTestCase(TestCase):
+    def test_match(self):
+        matcher = IPRangeMatcher(
+            [
+                (1, "1.2.3.0", "1.2.3.255"),
+                (2, "1.0.0.0", "1.255.255.255"),
+                (3, "1.2.3.5", "1.2.3.5"),
+                (4, "2.0.0.0", "2.0.0.10"),
+                (5, "::1", "::ffff"),
+            ]
+        )
+        self.assertEqual(matcher.match("1.2.3.5"), {1, 2, 3})
+        self.assertEqual(matcher.match("1.2.4.1"), {2})
+        self.assertEqual(matcher.match("2.0.0.11"), set())
+        self.assertEqual(matcher.match("0.0.0.1"), set())
+        self.assertEqual(matcher.match("::2"), {5})
+        self.assertEqual(matcher.match("not an ip"), set())
@@ -44,6 +44,50 @@ class TestUserAnalyzableEventQuerySet(CustomTestCase):
         ua.delete()
         an.delete()
 
+    def test_decay_inverse_exponential(self):
+        events = []
+        for name, reliability in [("test.com", 5), ("test2.com", 1)]:
+            an = Analyzable.objects.create(
+                name=name, classification=Classification.DOMAIN
+            )
+            ue = UserAnalyzableEventSerializer(
+                data={
+                    "analyzable": {"name": an.name},
+                    "decay_progression": 1,
+                    "decay_timedelta_days": 2,
+                    "data_model_content": {
+                        "evaluation": "malicious",
+                        "reliability": reliability,
+                    },
+                },
+                context={"request": MockUpRequest(self.user)},
+            )
+            ue.is_valid()
+            ua = ue.save()
+            ua.next_decay = now() - datetime.timedelta(days=1)
+            ua.save()
+            events.append((ua, an))
+        next_decay = events[0][0].next_decay
+        number = (
+            events[0][0]
+            .__class__.objects.filter(pk__in=[ua.pk for ua, _ in events])
+            .decay()
+        )
+        self.assertEqual(number, 2)
+        ua, an = events[0]
+        ua.refresh_from_db()
+        self.assertEqual(ua.data_model.reliability, 4)
+        self.assertEqual(ua.decay_times, 1)
+        self.assertEqual(ua.next_decay, next_decay + datetime.timedelta(days=2**2))
+        ua, an = events[1]
+        ua.refresh_from_db()
+        self.assertEqual(ua.data_model.reliability, 0)
+        self.assertEqual(ua.decay_times, 1)
+        self.assertIsNone(ua.next_decay)
+        for ua, an in events:
+            ua.delete()
+            an.delete()
+
 
 class TestUserDomainWildCardEventQuerySet(CustomTestCase):
 
@@ -70,6 +114,38 @@ class TestUserDomainWildCardEventQuerySet(CustomTestCase):
         ua.delete()
         an.delete()
 
+    def test_matches_literal(self):
+        an = Analyzable.objects.create(
+            name="a.test.com",
+            classification=Analyzable.CLASSIFICATIONS.DOMAIN,
+        )
+        ue = UserDomainWildCardEventSerializer(
+            data={
+                "query": r".*\.test\.com$",
+                "decay_progression": 0,
+                "decay_timedelta_days": 0,
+                "data_model_content": {"evaluation": "malicious", "reliability": 8},
+            },
+            context={"request": MockUpRequest(self.user)},
+        )
+        ue.is_valid()
+        ua = ue.save()
+        self.assertIn(an, ua.analyzables.all())
+        an2 = Analyzable.objects.create(
+            name="b.TEST.com",
+            classification=Analyzable.CLASSIFICATIONS.DOMAIN,
+        )
+        self.assertIn(ua, an2.user_domain_wildcard_events.all())
+        an3 = Analyzable.objects.create(
+            name="a.test.com.org",
+            classification=Analyzable.CLASSIFICATIONS.DOMAIN,
+        )
+        self.assertEqual(0, UserDomainWildCardEvent.objects.matches(an3).count())
+        ua.delete()
+        an.delete()
+        an2.delete()
+        an3.delete()
+
 
 class TestUserIPWildCardEventQuerySet(CustomTestCase):
 
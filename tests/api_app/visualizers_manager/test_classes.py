@@ -5,7 +5,7 @@
 from kombu import uuid
 
 from api_app.analyzables_manager.models import Analyzable
-from api_app.analyzers_manager.models import AnalyzerReport
+from api_app.analyzers_manager.models import AnalyzerConfig, AnalyzerReport
 from api_app.choices import Classification, PythonModuleBasePaths
 from api_app.models import Job, PythonModule
 from api_app.playbooks_manager.models import PlaybookConfig
@@ -529,6 +529,82 @@ class VisualizerTestCase(CustomTestCase):
         vc.delete()
         an.delete()
 
+    def test_analyzer_report_projection(self):
+        class MockUpVisualizer(Visualizer):
+            analyzer_reports_paths = {
+                "VirusTotal_v3_Get_Observable": [
+                    "data__attributes__last_analysis_stats__malicious",
+                    "link",
+                    "missing",
+                ],
+                "Classic_DNS": [""],
+                "Tranco": ["ranks"],
+            }
+
+            def run(self) -> dict:
+                return {}
+
+        an = Analyzable.objects.create(
+            name="test.com",
+            classification=Classification.DOMAIN,
+        )
+        job = Job.objects.create(
+            analyzable=an,
+            status="reported_without_fails",
+        )
+        vc = VisualizerConfig.objects.create(
+            name="test",
+            python_module=PythonModule.objects.get(
+                base_path=PythonModuleBasePaths.Visualizer.value, module="yara.Yara"
+            ),
+            description="test",
+        )
+        vt_report = AnalyzerReport.objects.create(
+            config=AnalyzerConfig.objects.get(name="VirusTotal_v3_Get_Observable"),
+            job=job,
+            task_id=uuid(),
+            parameters={},
+            report={
+                "data": {
+                    "attributes": {
+                        "last_analysis_stats": {"malicious": 3, "harmless": 60},
+                        "last_analysis_results": {"engine": {}},
+                    }
+                },
+                "link": "https://www.virustotal.com/gui/domain/test.com",
+            },
+        )
+        dns_report = AnalyzerReport.objects.create(
+            config=AnalyzerConfig.objects.get(name="Classic_DNS"),
+            job=job,
+            task_id=uuid(),
+            parameters={},
+            report={"resolutions": [{"data": "1.2.3.4"}]},
+        )
+        v = MockUpVisualizer(vc)
+        v.job_id = job.pk
+        self.assertEqual(v._job, job)
+        with self.assertNumQueries(1):
+            report = v.get_analyzer_report("VirusTotal_v3_Get_Observable")
+            self.assertEqual(
+                report.report,
+                {
+                    "data": {"attributes": {"last_analysis_stats": {"malicious": 3}}},
+                    "link": "https://www.virustotal.com/gui/domain/test.com",
+                },
+            )
+            self.assertEqual(
+                v.get_analyzer_report("Classic_DNS").report, dns_report.report
+            )
+            with self.assertRaises(AnalyzerReport.DoesNotExist):
+                v.get_analyzer_report("Tranco")
+        self.assertEqual(report.pk, vt_report.pk)
+        vt_report.delete()
+        dns_report.delete()
+        job.delete()
+        vc.delete()
+        an.delete()
+
     def test_subclasses(self):
         def handler(signum, frame):
             raise TimeoutError("end of time")
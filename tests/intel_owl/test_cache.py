@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from intel_owl.settings.cache import LocMemCacheExtended, TieredCache
+
+
+class LocMemCacheExtendedTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = LocMemCacheExtended(
+            "test", {"KEY_FUNCTION": "intel_owl.settings.cache.plain_key"}
+        )
+        self.cache.set("list_AnalyzerConfig_user", 1)
+        self.cache.set("list_AnalyzerConfig_user_1_10", 2)
+        self.cache.set("list_AnalyzerConfig_user2", 3)
+        self.cache.set("list_ConnectorConfig_user", 4)
+        self.cache.set("other_key", 5)
+
+    def tearDown(self):
+        super().tearDown()
+        self.cache.clear()
+
+    def test_get_where(self):
+        self.assertEqual(
+            self.cache.get_where("list_AnalyzerConfig_"),
+            {
+                "list_AnalyzerConfig_user": 1,
+                "list_AnalyzerConfig_user_1_10": 2,
+                "list_AnalyzerConfig_user2": 3,
+            },
+        )
+        self.assertEqual(
+            self.cache.get_where("list_AnalyzerConfig_user"),
+            {"list_AnalyzerConfig_user": 1, "list_AnalyzerConfig_user_1_10": 2},
+        )
+        self.assertEqual(self.cache.get_where("other"), {"other_key": 5})
+
+    def test_delete_where(self):
+        self.assertCountEqual(
+            self.cache.delete_where("list_AnalyzerConfig_user"),
+            ["list_AnalyzerConfig_user", "list_AnalyzerConfig_user_1_10"],
+        )
+        self.assertIsNone(self.cache.get("list_AnalyzerConfig_user_1_10"))
+        self.assertEqual(self.cache.get("list_AnalyzerConfig_user2"), 3)
+        self.assertEqual(
+            self.cache.get_where("list_AnalyzerConfig_"),
+            {"list_AnalyzerConfig_user2": 3},
+        )
+        # deleted keys are removed from the key sets when they are read
+        self.assertEqual(
+            self.cache._key_set_members("list_AnalyzerConfig_"),
+            {"list_AnalyzerConfig_user2"},
+        )
+
+
+class TieredCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = TieredCache(
+            "test",
+            {
+                "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+                "L1_TIMEOUT": 60,
+                "L2": {
+                    "BACKEND": "intel_owl.settings.cache.LocMemCacheExtended",
+                    "LOCATION": "test-l2",
+                    "KEY_FUNCTION": "intel_owl.settings.cache.plain_key",
+                },
+            },
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.cache.clear()
+
+    def test_get(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.cache.l1.get("key"), "value")
+        self.assertEqual(self.cache.l2.get("key"), "value")
+        self.cache.l1.clear()
+        self.assertEqual(self.cache.get("key"), "value")
+        # the value read from the l2 is copied in the l1
+        self.assertEqual(self.cache.l1.get("key"), "value")
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.get_many(["key", "missing"]), {"key": "value"})
+
+    def test_get_or_set(self):
+        self.assertEqual(self.cache.get_or_set("key", "value"), "value")
+        self.assertEqual(self.cache.get_or_set("key", "other"), "value")
+
+    def test_delete_where(self):
+        self.cache.set("serializer_AnalyzerConfig_Tor_user", 1)
+        self.cache.set("serializer_AnalyzerConfig_Tor_user2", 2)
+        self.assertEqual(
+            self.cache.delete_where("serializer_AnalyzerConfig_Tor_user"),
+            ["serializer_AnalyzerConfig_Tor_user"],
+        )
+        self.assertIsNone(self.cache.get("serializer_AnalyzerConfig_Tor_user"))
+        self.assertIsNone(self.cache.l1.get("serializer_AnalyzerConfig_Tor_user"))
+        self.assertEqual(self.cache.get("serializer_AnalyzerConfig_Tor_user2"), 2)
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from intel_owl.sample_cache import SampleCache
+
+
+class SampleCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SampleCache(self.directory.name, max_size=25)
+        self.fetches = []
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def _sample(self, content: bytes):
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        def fetch(f):
+            self.fetches.append(sha256)
+            # slow download, to let the other workers wait for it
+            time.sleep(0.05)
+            f.write(content)
+
+        return sha256, fetch
+
+    def test_acquire(self):
+        sha256, fetch = self._sample(b"sample")
+        path = self.cache.acquire(sha256, fetch)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"sample")
+        self.assertEqual(self.cache.acquire(sha256, fetch), path)
+        self.assertEqual(self.fetches, [sha256])
+        self.cache.release(sha256)
+        self.cache.release(sha256)
+
+    def test_parallel_acquire(self):
+        sha256, fetch = self._sample(b"sample")
+        paths = []
+        threads = [
+            threading.Thread(
+                target=lambda: paths.append(self.cache.acquire(sha256, fetch))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(self.fetches, [sha256])
+
+    def test_wrong_content(self):
+        sha256, _ = self._sample(b"sample")
+        with self.assertRaises(ValueError):
+            self.cache.acquire(sha256, lambda f: f.write(b"other"))
+        self.assertFalse(os.path.exists(self.cache.path(sha256)))
+
+    def test_evict(self):
+        first, fetch_first = self._sample(b"0123456789")
+        second, fetch_second = self._sample(b"abcdefghij")
+        third, fetch_third = self._sample(b"ABCDEFGHIJ")
+        self.cache.acquire(first, fetch_first)
+        self.cache.acquire(second, fetch_second)
+        self.cache.release(second)
+        # first is in use, so the least recently used that can be evicted is second
+        self.cache.acquire(third, fetch_third)
+        self.assertTrue(os.path.exists(self.cache.path(first)))
+        self.assertFalse(os.path.exists(self.cache.path(second)))
+        self.assertTrue(os.path.exists(self.cache.path(third)))
+        self.assertEqual(self.cache.size(), 20)
+        self.cache.release(first)
+        self.cache.release(third)
+        self.assertEqual(self.cache.evict(), [])
+        self.cache.max_size = 10
+        self.assertEqual(self.cache.evict(), [first])
@@ -15,7 +15,7 @@ from api_app.visualizers_manager.models import VisualizerConfig, VisualizerRepor
 from certego_saas.apps.organization.membership import Membership
 from certego_saas.apps.organization.organization import Organization
 from certego_saas.apps.user.models import User
-from intel_owl.tasks import send_plugin_report_to_elastic
+from intel_owl.tasks import run_plugin, send_plugin_report_to_elastic
 from tests import CustomTestCase
 
 _now = datetime.datetime(2024, 10, 29, 11, tzinfo=datetime.UTC)
@@ -452,3 +452,35 @@ class SendElasticTestCase(CustomTestCase):
                     },
                 ],
             )
+
+
+class RunPluginTestCase(CustomTestCase):
+    def test_failure_reports_stats(self):
+        an = Analyzable.objects.create(
+            name="dns.google.com", classification=Classification.DOMAIN
+        )
+        job = Job.objects.create(
+            user=self.user,
+            analyzable=an,
+            status=Job.STATUSES.ANALYZERS_RUNNING.value,
+        )
+        config = AnalyzerConfig.objects.get(name="Classic_DNS")
+        AnalyzerReport.objects.create(
+            job=job,
+            config=config,
+            status=AnalyzerReport.STATUSES.PENDING.value,
+            task_id=str(uuid()),
+            parameters={},
+        )
+        with patch(
+            "api_app.classes.Plugin.start", side_effect=RuntimeError("test")
+        ), patch("api_app.websocket.JobConsumer.serialize_and_send_job"):
+            run_plugin(job.pk, config.python_module_id, config.pk, {}, str(uuid()))
+        job.refresh_from_db()
+        self.assertEqual(
+            job.reports_stats, {"all": 1, "success": 0, "failed": 1, "killed": 0}
+        )
+        job.set_final_status()
+        self.assertEqual(job.status, Job.STATUSES.FAILED.value)
+        job.delete()
+        an.delete()
@@ -3,6 +3,7 @@
 import os
 
 from django.conf import settings
+from django.db.models import Sum
 from django.utils.timezone import now
 
 from api_app.analyzables_manager.models import Analyzable
@@ -19,7 +20,14 @@ from api_app.analyzers_manager.observable_analyzers import (
     tweetfeeds,
 )
 from api_app.choices import Classification, PythonModuleBasePaths
-from api_app.models import Job, Parameter, PluginConfig, PythonModule
+from api_app.models import (
+    Comment,
+    Job,
+    JobRollup,
+    Parameter,
+    PluginConfig,
+    PythonModule,
+)
 from intel_owl.tasks import check_stuck_analysis, remove_old_jobs
 
 from . import CustomTestCase, get_logger
@@ -83,6 +91,66 @@ class CronTests(CustomTestCase):
         _job.delete()
         an.delete()
 
+    def test_purge_jobs(self):
+        import datetime
+
+        an = Analyzable.objects.create(
+            name="8.8.8.8",
+            classification=Classification.IP,
+        )
+        an_commented = Analyzable.objects.create(
+            name="1.1.1.1",
+            classification=Classification.IP,
+        )
+        Comment.objects.create(user=self.user, analyzable=an_commented, content="test")
+        old = now() - datetime.timedelta(days=30)
+        for analyzable in [an, an, an, an_commented]:
+            Job.objects.create(
+                user=self.user,
+                status=Job.STATUSES.FAILED.value,
+                analyzable=analyzable,
+                received_request_time=old,
+                finished_analysis_time=old,
+            )
+        recent_job = Job.objects.create(
+            user=self.user,
+            status=Job.STATUSES.FAILED.value,
+            analyzable=an,
+            received_request_time=now(),
+            finished_analysis_time=now(),
+        )
+        self.assertEqual(
+            Job.objects.filter(
+                finished_analysis_time__lt=now() - datetime.timedelta(days=1)
+            ).purge(batch_size=1),
+            4,
+        )
+        self.assertCountEqual(
+            Job.objects.filter(analyzable__in=[an, an_commented]), [recent_job]
+        )
+        # still used by the recent job
+        self.assertTrue(Analyzable.objects.filter(pk=an.pk).exists())
+        # still used by the comment
+        self.assertTrue(Analyzable.objects.filter(pk=an_commented.pk).exists())
+
+        recent_job.finished_analysis_time = old
+        recent_job.save()
+        self.assertEqual(
+            Job.objects.filter(
+                finished_analysis_time__lt=now() - datetime.timedelta(days=1)
+            ).purge(),
+            1,
+        )
+        self.assertFalse(Analyzable.objects.filter(pk=an.pk).exists())
+        # the purged jobs are not counted in the dashboard anymore
+        self.assertEqual(
+            JobRollup.objects.filter(user=self.user).aggregate(Sum("count"))[
+                "count__sum"
+            ],
+            0,
+        )
+        an_commented.delete()
+
     @if_mock_connections(skip("not working without connection"))
     def test_maxmind_updater(self):
         maxmind.Maxmind.update()